@@ -0,0 +1,177 @@
+"""
+응답 캐시 헬퍼
+
+공공데이터 API 결과를 (엔드포인트, 파라미터) 키로 일정 시간 보관합니다.
+항목마다 단조 증가하는 data version을 부여해 HTTP ETag 계산과
+캐시 적중 여부 판단에 사용합니다.
+
+워커 간 공유 저장소(_shared.SHARED, MCP_WORKERS > 1)가 있으면 2차 캐시로 사용합니다.
+로컬 미스 시 공유 저장소를 조회하고, set 시 함께 기록합니다. 공유 저장소(SQLite) 호출은 이벤트 루프를
+막지 않도록 asyncio.to_thread로 실행하므로 peek/get/set은 코루틴입니다. 공유 항목은 version/created_at을
+그대로 가져오므로 어느 워커가 응답해도 ETag가 같습니다. extras(직렬화 바이트 등)는 워커별로 둡니다.
+
+환경 변수:
+  MCP_CACHE_TTL     - 캐시 유지 시간(초, 기본 600. 0이면 캐시 비활성)
+  MCP_CACHE_MAXSIZE - 캐시별 최대 항목 수 (기본 256)
+"""
+
+import asyncio
+import hashlib
+import itertools
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Hashable
+
+from _shared import LEASE_SECONDS, SHARED, SharedStore
+
+CACHE_TTL = float(os.getenv("MCP_CACHE_TTL", "600"))
+CACHE_MAXSIZE = int(os.getenv("MCP_CACHE_MAXSIZE", "256"))
+
+_versions = itertools.count(1)
+
+# single_flight 대기 워커의 공유 저장소 조회 간격 (초, 두 배씩 늘림)
+_POLL_MIN = 0.05
+_POLL_MAX = 1.0
+
+
+@dataclass
+class CacheEntry:
+    """캐시 항목. extras에는 같은 데이터에서 파생된 값(직렬화 바이트 등)을 보관"""
+    key: Hashable
+    value: Any
+    version: int
+    created_at: float
+    expires_at: float
+    extras: dict = field(default_factory=dict)
+
+    @property
+    def tag(self) -> str:
+        """캐시 키 + data version 기반 식별자 (ETag 재료)"""
+        raw = f"{self.key!r}|{self.version}|{self.created_at}"
+        return hashlib.sha1(raw.encode()).hexdigest()[:20]
+
+
+class TTLCache:
+    """만료 시간과 최대 크기(LRU)를 가진 단순 메모리 캐시 (+ 선택적 워커 간 공유 저장소)"""
+
+    def __init__(self, name: str, ttl: float = CACHE_TTL, maxsize: int = CACHE_MAXSIZE,
+                 shared: SharedStore | None = SHARED) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.shared = shared
+        self._data: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _shared_key(self, key: Hashable) -> str:
+        return repr(key)
+
+    def _store_local(self, entry: CacheEntry) -> None:
+        self._data[entry.key] = entry
+        self._data.move_to_end(entry.key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def _peek_shared(self, key: Hashable) -> CacheEntry | None:
+        if self.shared is None or not self.enabled:
+            return None
+        row = await asyncio.to_thread(self.shared.cache_get, self.name, self._shared_key(key))
+        if row is None:
+            return None
+        value, version, created_at, expires_at = row
+        entry = CacheEntry(key, value, version, created_at, expires_at)
+        self._store_local(entry)
+        self.shared_hits += 1
+        return entry
+
+    def peek_local(self, key: Hashable) -> CacheEntry | None:
+        """이 프로세스 메모리에 있는 유효한 항목만 조회 (공유 저장소는 보지 않음)"""
+        entry = self._data.get(key)
+        if entry is not None and entry.expires_at <= time.time():
+            self._data.pop(key, None)
+            entry = None
+        return entry
+
+    async def peek(self, key: Hashable) -> CacheEntry | None:
+        """통계에 반영하지 않고 유효한 항목 조회 (로컬 → 공유 저장소 순)"""
+        entry = self.peek_local(key)
+        if entry is None:
+            return await self._peek_shared(key)
+        return entry
+
+    async def get(self, key: Hashable) -> CacheEntry | None:
+        entry = await self.peek(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._data.move_to_end(key)
+        return entry
+
+    async def set(self, key: Hashable, value: Any) -> CacheEntry:
+        now = time.time()
+        entry = CacheEntry(key, value, next(_versions), now, now + self.ttl)
+        if not self.enabled:
+            return entry
+        self._store_local(entry)
+        if self.shared is not None:
+            await asyncio.to_thread(self.shared.cache_set, self.name, self._shared_key(key), value,
+                                    entry.version, entry.created_at, entry.expires_at)
+        return entry
+
+    @asynccontextmanager
+    async def single_flight(self, key: Hashable) -> AsyncIterator[CacheEntry | None]:
+        """
+        미스 직후 외부 API 호출을 감싸 여러 워커가 같은 키를 동시에 조회하지 않게 합니다.
+
+            async with CACHE.single_flight(key) as entry:
+                if entry is not None:       # 다른 워커가 그 사이 채운 값
+                    return entry.value
+                ... 외부 API 호출 후 await CACHE.set(key, value)
+
+        lease를 얻은 워커만 None을 받아 호출하고, 나머지는 공유 저장소에 값이 생길 때까지
+        읽기 조회(peek, lease_held)만으로 간격을 늘려 가며 기다립니다. lease 보유 워커가 실패하면
+        (set 없이 종료) lease가 풀리고, 그때 대기 중인 워커 하나가 lease를 얻어 이어받습니다.
+        공유 저장소가 없으면 바로 None을 줍니다. 저장소 호출은 모두 스레드에서 실행합니다.
+        """
+        if self.shared is None or not self.enabled:
+            yield None
+            return
+        lease = f"{self.name}|{self._shared_key(key)}"
+        deadline = time.monotonic() + LEASE_SECONDS
+        delay = _POLL_MIN
+        token = await asyncio.to_thread(self.shared.claim, lease)
+        while token is None:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _POLL_MAX)
+            entry = await self.peek(key)
+            if entry is not None:
+                yield entry
+                return
+            if time.monotonic() > deadline:
+                break
+            if not await asyncio.to_thread(self.shared.lease_held, lease):
+                token = await asyncio.to_thread(self.shared.claim, lease)
+        try:
+            # lease를 얻기 직전에 다른 워커가 값을 채우고 lease를 풀었을 수 있음
+            yield await self.peek(key)
+        finally:
+            if token is not None:
+                await asyncio.to_thread(self.shared.release, lease, token)
+
+    async def clear(self) -> None:
+        self._data.clear()
+        if self.shared is not None:
+            await asyncio.to_thread(self.shared.cache_clear, self.name)
+
+    def __len__(self) -> int:
+        return len(self._data)
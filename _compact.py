@@ -0,0 +1,142 @@
+"""
+MCP 실거래 도구의 간결한 결과 형식 (format / fields)
+
+num_of_rows=1000 결과를 item dict 그대로 돌려주면 에이전트 컨텍스트를 대부분 차지하므로
+파싱된 items에서 바로 다음 형식을 만듭니다. 캐시된 원본 결과와 items는 수정하지 않습니다.
+
+  - full:    기존 형식 (items: dict 목록). fields를 주면 그 필드만 남김
+  - table:   {"columns": [...], "rows": [[...], ...]} 열 이름을 한 번만 쓰는 표 형식.
+             fields가 없으면 amount_raw처럼 파싱 값과 중복되는 *_raw 열은 뺌 (_export와 같은 규칙)
+  - summary: items 없이 법정동 × 전용면적 구간(× 전월세 구분)별 건수·가격 통계만.
+             해제(취소)된 거래는 통계에서 빼고 canceled_count로 알림
+"""
+
+import statistics
+
+from _helpers import _summarize_prices
+
+RESULT_FORMATS = ("full", "table", "summary")
+
+# 전용면적 구간 경계 (㎡). 국토교통부 통계 구분: 40 이하, 40~60, 60~85, 85~102, 102~135, 135 초과
+AREA_BANDS = (40, 60, 85, 102, 135)
+
+
+def parse_fields(fields: str) -> list[str]:
+    """'amount,area_m2, floor' → ['amount', 'area_m2', 'floor'] (중복 제거, 순서 유지)"""
+    return list(dict.fromkeys(f.strip() for f in (fields or "").split(",") if f.strip()))
+
+
+def format_error(format: str, fields: str = "") -> str | None:
+    """외부 조회 전에 format/fields 값 검사. 문제가 없으면 None"""
+    if (format or "full").strip().lower() not in RESULT_FORMATS:
+        return f"format은 {list(RESULT_FORMATS)} 중 하나여야 합니다."
+    if fields and not parse_fields(fields):
+        return "fields는 쉼표로 구분한 필드 이름이어야 합니다. (예: 'amount,area_m2,floor')"
+    return None
+
+
+def _columns(items: list[dict]) -> list[str]:
+    columns: list[str] = []
+    for item in items:
+        for key in item:
+            if key not in columns and not key.endswith("_raw"):
+                columns.append(key)
+    return columns
+
+
+def _area(value) -> float | None:
+    try:
+        area = float(str(value).replace(",", "").strip())
+    except (TypeError, ValueError):
+        return None
+    return area if area > 0 else None
+
+
+def area_band(area: float | None) -> str:
+    """전용면적 → 구간 라벨 ('60~85', '~40', '135~'). 면적이 없으면 '미상'"""
+    if area is None:
+        return "미상"
+    low = 0
+    for high in AREA_BANDS:
+        if area <= high:
+            return f"{low}~{high}" if low else f"~{high}"
+        low = high
+    return f"{low}~"
+
+
+def summarize_groups(items: list[dict], price_field: str = "amount") -> tuple[list[dict], int]:
+    """
+    법정동 × 전용면적 구간(전월세는 × 전세/월세)별 가격 통계 → (groups, 해제 거래 수)
+
+    groups[]: dong, area_band_m2, (rent_type), {price_field}_만원(median/min/max/count),
+              per_m2_median_만원, (monthly_rent_만원)
+    """
+    groups: dict[tuple[str, int, str], dict] = {}
+    canceled = 0
+    for item in items:
+        if item.get("cancel_type") == "O":
+            canceled += 1
+            continue
+        price = item.get(price_field)
+        if not isinstance(price, int) or price <= 0:
+            continue
+        area = _area(item.get("area_m2"))
+        band_index = len(AREA_BANDS) + 1 if area is None else sum(area > b for b in AREA_BANDS)
+        key = (item.get("dong") or "", band_index, item.get("rent_type") or "")
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {"band": area_band(area), "prices": [], "per_m2": [], "monthly": []}
+        group["prices"].append(price)
+        if area is not None:
+            group["per_m2"].append(price / area)
+        monthly = item.get("monthly_rent")
+        if isinstance(monthly, int) and monthly > 0:
+            group["monthly"].append(monthly)
+
+    rows = []
+    for (dong, _, rent_type), g in sorted(groups.items()):
+        row: dict = {"dong": dong, "area_band_m2": g["band"]}
+        if rent_type:
+            row["rent_type"] = rent_type
+        row[f"{price_field}_만원"] = _summarize_prices(g["prices"])
+        if g["per_m2"]:
+            row["per_m2_median_만원"] = round(statistics.median(g["per_m2"]), 1)
+        if g["monthly"]:
+            row["monthly_rent_만원"] = _summarize_prices(g["monthly"])
+        rows.append(row)
+    return rows, canceled
+
+
+def compact_result(result: dict, format: str = "full", fields: str = "", price_field: str = "amount") -> dict:
+    """
+    run_molit_tool 결과 → format/fields에 맞춘 결과 (오류 결과는 그대로)
+
+    fields에 items에 없는 이름이 있으면 사용할 수 있는 필드 목록과 함께 오류를 반환합니다.
+    """
+    if "error" in result or "items" not in result:
+        return result
+    format = (format or "full").strip().lower()
+    items = result["items"]
+    out = {k: v for k, v in result.items() if k != "items"}
+
+    if format == "summary":
+        out["format"] = "summary"
+        out["groups"], out["canceled_count"] = summarize_groups(items, price_field)
+        return out
+
+    wanted = parse_fields(fields)
+    if wanted and items:
+        available = _columns(items) + [c for c in items[0] if c.endswith("_raw")]
+        unknown = [f for f in wanted if f not in available]
+        if unknown:
+            return {"error": f"알 수 없는 필드: {', '.join(unknown)}", "available_fields": available}
+
+    if format == "table":
+        columns = wanted or _columns(items)
+        out["format"] = "table"
+        out["columns"] = columns
+        out["rows"] = [[item.get(c) for c in columns] for item in items]
+        return out
+
+    out["items"] = [{f: item.get(f) for f in wanted} for item in items] if wanted else items
+    return out
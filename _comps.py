@@ -0,0 +1,251 @@
+"""
+유사 거래(comps) 검색 인덱스
+
+로컬 이력 저장소(_store.py)의 매매 실거래를 (유형, 시군구)별로 메모리에 올려
+(전용면적, 건축년도) 격자 버킷으로 색인하고, 대상 물건과 가장 비슷한 거래 k건을 찾습니다.
+
+유사도 거리 (작을수록 비슷함, 각 항은 아래 척도 1단위당 1):
+  면적 5㎡ · 건축년도 5년 · 층 5개층 · 경과 6개월
+  + 법정동이 다르면 1, 단지명이 다르면 2 (지정한 경우)
+
+검색은 대상 격자 칸에서 바깥쪽으로 한 겹씩 넓혀 가며, 다음 겹의 최소 거리가
+현재 k번째 거리보다 크면 멈춥니다. 저장소에 거래가 다시 적재되면
+(HistoryStore.upsert_trade_month) 추가·갱신·삭제된 거래(trade_key)만 인덱스에 반영하고,
+해제된 거래는 인덱스에서 뺍니다.
+
+파티션은 적재한 시점의 저장소 변경 번호(HistoryStore.trade_version)를 기억하고 조회 때마다 비교합니다.
+다른 프로세스(MCP_WORKERS > 1의 다른 워커)가 같은 DB에 거래를 적재해 번호가 달라졌으면 DB에서 다시 읽습니다.
+"""
+
+import heapq
+import statistics
+import threading
+from datetime import date
+from typing import Any
+
+from _store import HistoryStore, get_store
+from tools.complex import _norm
+
+AREA_CELL = 5.0       # 격자 칸 크기 (㎡)
+YEAR_CELL = 5         # 격자 칸 크기 (년)
+AREA_SCALE = 5.0
+YEAR_SCALE = 5.0
+FLOOR_SCALE = 5.0
+RECENCY_SCALE_DAYS = 182.5
+DONG_PENALTY = 1.0
+NAME_PENALTY = 2.0
+UNKNOWN_PENALTY = 1.0  # 대상 값은 있는데 거래 쪽 값이 비어 있을 때
+
+_NO_YEAR = -1
+
+
+def _ordinal(iso_date: str) -> int:
+    try:
+        return date.fromisoformat(iso_date[:10]).toordinal()
+    except ValueError:
+        return 0
+
+
+class _Partition:
+    """(유형, 시군구) 하나의 격자 인덱스. cells[(면적칸, 년도칸)][trade_key] = row"""
+
+    def __init__(self) -> None:
+        self.cells: dict[tuple[int, int], dict[str, tuple]] = {}
+        self.where: dict[str, tuple[int, int]] = {}
+        self.years_by_area: dict[int, set[int]] = {}
+        self.latest = 0
+        self.version = 0      # 반영한 저장소 변경 번호
+
+    @property
+    def count(self) -> int:
+        return len(self.where)
+
+    @staticmethod
+    def _cell(area: float, build_year: int | None) -> tuple[int, int]:
+        return int(area // AREA_CELL), (build_year // YEAR_CELL if build_year else _NO_YEAR)
+
+    def remove(self, key: str) -> None:
+        cell = self.where.pop(key, None)
+        if cell is None:
+            return
+        rows = self.cells[cell]
+        del rows[key]
+        if not rows:
+            del self.cells[cell]
+            years = self.years_by_area.get(cell[0])
+            if years is not None:
+                years.discard(cell[1])
+
+    def apply(self, upserted: list[dict], deleted: list[str]) -> None:
+        """저장소 변경분 반영 (갱신 행은 빼고 다시 넣음, 해제 거래는 빼기만 함)"""
+        for key in deleted:
+            self.remove(key)
+        for r in upserted:
+            key = r["trade_key"]
+            self.remove(key)
+            area = r.get("area_m2")
+            if r.get("cancel_type") or not area or not isinstance(r.get("amount"), int):
+                continue
+            deal_date = r.get("deal_date") or ""
+            day = _ordinal(deal_date)
+            row = (
+                r.get("name") or "", _norm(r.get("name") or ""), r.get("dong") or "", r.get("jibun") or "",
+                float(area), r.get("floor"), r.get("build_year"), r["amount"], deal_date, day,
+            )
+            cell = self._cell(row[4], row[6])
+            self.cells.setdefault(cell, {})[key] = row
+            self.where[key] = cell
+            self.years_by_area.setdefault(cell[0], set()).add(cell[1])
+            self.latest = max(self.latest, day)
+
+    def _ring(self, a0: int, y0: int | None, r: int):
+        """대상 칸에서 Chebyshev 거리 r인 칸들 (y0가 없으면 면적 축만 넓히고 년도 칸은 전부)"""
+        if y0 is None:
+            for a in ({a0 - r, a0 + r} if r else {a0}):
+                for y in self.years_by_area.get(a, ()):
+                    yield a, y
+            return
+        for a in range(a0 - r, a0 + r + 1):
+            if abs(a - a0) == r:
+                ys = range(y0 - r, y0 + r + 1)
+            else:
+                ys = (y0 - r, y0 + r) if r else (y0,)
+            for y in ys:
+                yield a, y
+            if a in self.years_by_area and _NO_YEAR in self.years_by_area[a] and abs(a - a0) == r:
+                yield a, _NO_YEAR
+
+    def nearest(self, area: float, k: int, *, floor: int | None, build_year: int | None, dong: str,
+                name_norm: str, min_day: int, as_of: int) -> list[tuple[float, tuple]]:
+        if not self.cells:
+            return []
+        a0 = int(area // AREA_CELL)
+        y0 = build_year // YEAR_CELL if build_year else None
+        areas = [cell[0] for cell in self.cells]
+        max_r = max(abs(max(areas) - a0), abs(min(areas) - a0))
+        if y0 is not None:
+            years = [cell[1] for cell in self.cells if cell[1] != _NO_YEAR] or [y0]
+            max_r = max(max_r, abs(max(years) - y0), abs(min(years) - y0))
+        # 거리 r 겹의 칸에 있는 거래는 최소 (r-1)칸만큼 떨어져 있음 → 거리 하한
+        cell_step = AREA_CELL / AREA_SCALE if y0 is None else min(AREA_CELL / AREA_SCALE, YEAR_CELL / YEAR_SCALE)
+
+        heap: list[tuple[float, int, tuple]] = []   # (-거리, 순번, row) 최대 힙
+        seq = 0
+        for r in range(max_r + 1):
+            if len(heap) >= k and (r - 1) * cell_step > -heap[0][0]:
+                break
+            for cell in self._ring(a0, y0, r):
+                rows = self.cells.get(cell)
+                if not rows:
+                    continue
+                for row in rows.values():
+                    if row[9] < min_day:
+                        continue
+                    d = abs(row[4] - area) / AREA_SCALE
+                    if build_year:
+                        d += abs(row[6] - build_year) / YEAR_SCALE if row[6] else UNKNOWN_PENALTY
+                    if floor is not None:
+                        d += abs(row[5] - floor) / FLOOR_SCALE if row[5] is not None else UNKNOWN_PENALTY
+                    d += max(0, as_of - row[9]) / RECENCY_SCALE_DAYS
+                    if dong and row[2] != dong:
+                        d += DONG_PENALTY
+                    if name_norm and row[1] != name_norm:
+                        d += NAME_PENALTY
+                    seq += 1
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-d, seq, row))
+                    elif d < -heap[0][0]:
+                        heapq.heapreplace(heap, (-d, seq, row))
+        return sorted((-neg, row) for neg, _, row in heap)
+
+
+class CompsIndex:
+    """HistoryStore의 trades 테이블 위에 올린 (유형, 시군구)별 격자 인덱스 (최초 조회 시 적재)"""
+
+    def __init__(self, store: HistoryStore) -> None:
+        self.store = store
+        self._partitions: dict[tuple[str, str], _Partition] = {}
+        self._lock = threading.Lock()
+        store.add_trade_listener(self._on_trades_changed)
+
+    def _on_trades_changed(
+        self, trade_type: str, region_code: str, upserted: list[dict], deleted: list[str], version: int,
+    ) -> None:
+        key = (trade_type, region_code)
+        with self._lock:
+            partition = self._partitions.get(key)
+            if partition is None:
+                return
+            if partition.version == version - 1:
+                partition.apply(upserted, deleted)
+                partition.version = version
+            else:
+                # 그 사이 다른 프로세스의 변경이 있었음 → 다음 조회 때 DB에서 다시 적재
+                del self._partitions[key]
+
+    def partition(self, trade_type: str, region_code: str) -> _Partition:
+        key = (trade_type, region_code)
+        with self._lock:
+            version = self.store.trade_version(trade_type, region_code)
+            partition = self._partitions.get(key)
+            if partition is None or partition.version != version:
+                # 번호를 먼저 읽고 행을 읽으므로, 그 사이 변경이 있어도 다음 조회에서 다시 적재됨
+                partition = _Partition()
+                partition.apply(self.store.trade_rows(trade_type, region_code), [])
+                partition.version = version
+                self._partitions[key] = partition
+            return partition
+
+    def search(
+        self,
+        trade_type: str,
+        region_code: str,
+        area_m2: float,
+        *,
+        k: int = 10,
+        floor: int | None = None,
+        build_year: int | None = None,
+        dong: str = "",
+        apt_name: str = "",
+        months: int = 36,
+    ) -> dict[str, Any]:
+        partition = self.partition(trade_type, region_code)
+        as_of = partition.latest or date.today().toordinal()
+        min_day = as_of - int(months * 30.44) if months > 0 else 0
+        with self._lock:
+            found = partition.nearest(
+                area_m2, k, floor=floor, build_year=build_year, dong=dong.strip(),
+                name_norm=_norm(apt_name), min_day=min_day, as_of=as_of,
+            )
+        comps = [
+            {
+                "name": row[0], "dong": row[2], "jibun": row[3], "area_m2": row[4], "floor": row[5],
+                "build_year": row[6], "amount": row[7], "deal_date": row[8],
+                "price_per_m2_만원": round(row[7] / row[4], 1), "distance": round(d, 3),
+            }
+            for d, row in found
+        ]
+        result: dict[str, Any] = {
+            "indexed_count": partition.count,
+            "as_of": date.fromordinal(as_of).isoformat(),
+            "returned_count": len(comps),
+            "comps": comps,
+        }
+        if comps:
+            result["summary_만원"] = {
+                "median_amount": statistics.median(c["amount"] for c in comps),
+                "median_price_per_m2": round(statistics.median(c["price_per_m2_만원"] for c in comps), 1),
+                "estimated_amount": round(statistics.median(c["price_per_m2_만원"] for c in comps) * area_m2),
+            }
+        return result
+
+
+_index: CompsIndex | None = None
+
+
+def get_comps_index() -> CompsIndex:
+    """프로세스 공용 인덱스 (get_store() 저장소 기준, 최초 사용 시 생성)"""
+    global _index
+    if _index is None:
+        _index = CompsIndex(get_store())
+    return _index
@@ -0,0 +1,149 @@
+"""
+요청 단위 마감 시각(deadline) 전파
+
+클라이언트가 이미 포기한 요청의 외부 조회를 끝까지 하지 않도록, 요청마다 마감 시각을 정해
+contextvar로 외부 호출(_helpers._fetch_*, tools.complex)까지 전달합니다.
+
+  - 웹 API(/api): X-Request-Timeout 헤더(초) → 없으면 MCP_REQUEST_TIMEOUT (web_middleware.DeadlineMiddleware)
+  - MCP 도구 호출: timeout_s 인자 → X-Request-Timeout 헤더(HTTP 전송) → MCP_REQUEST_TIMEOUT
+    (server.TracedFastMCP.call_tool)
+
+외부 호출 타임아웃은 고정값(_helpers 30초, 단지정보 15초)과 남은 시간 중 짧은 쪽이고, 마감이 지나면
+호출하지 않습니다. 여러 조회를 동시에 기다리는 곳은 gather()로 마감까지 끝난 결과만 모으고 나머지는
+취소하며, 중단이 있었던 요청의 응답에는 mark_partial()로 partial: true를 붙입니다.
+백그라운드 작업(_jobs, 공매 변경 감시)은 unbounded()로 요청의 마감을 물려받지 않습니다.
+"""
+
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Iterator
+
+import httpx
+
+DEFAULT_TIMEOUT = float(os.getenv("MCP_REQUEST_TIMEOUT", "60") or 0)   # 0이면 기본 마감 없음
+MAX_TIMEOUT = 600.0
+HEADER = "x-request-timeout"
+DEADLINE_ERROR = "요청 마감 시간 안에 끝나지 않아 중단했습니다."
+
+
+class _Scope:
+    """요청 하나의 마감 시각(time.monotonic 기준)과 중단 여부. 자식 태스크도 같은 객체를 공유"""
+
+    __slots__ = ("deadline", "cut")
+
+    def __init__(self, deadline: float | None) -> None:
+        self.deadline = deadline
+        self.cut = False
+
+
+_scope: ContextVar[_Scope | None] = ContextVar("deadline", default=None)
+
+
+def parse_timeout(value: Any) -> float | None:
+    """헤더/인자 값 → 초 (비었거나 0 이하·숫자가 아니면 None, 최대 MAX_TIMEOUT)"""
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not seconds > 0:   # NaN 포함
+        return None
+    return min(seconds, MAX_TIMEOUT)
+
+
+@contextmanager
+def deadline_scope(seconds: float | None = None) -> Iterator[_Scope]:
+    """
+    지금부터 seconds초 뒤(None이면 DEFAULT_TIMEOUT)를 마감으로 하는 요청 scope
+
+    이미 바깥 scope가 있으면(예: 웹 API 요청 안의 도구 호출) 더 이른 마감을 따르고 중단 기록도 공유합니다.
+    """
+    if seconds is None:
+        seconds = DEFAULT_TIMEOUT or None
+    deadline = time.monotonic() + seconds if seconds else None
+    outer = _scope.get()
+    if outer is not None and (deadline is None or (outer.deadline is not None and outer.deadline <= deadline)):
+        yield outer
+        return
+    scope = _Scope(deadline)
+    if outer is not None:
+        scope.cut = outer.cut
+    token = _scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _scope.reset(token)
+
+
+@contextmanager
+def unbounded() -> Iterator[None]:
+    """마감 없는 구간. 이 안에서 만든 태스크는 요청의 마감을 물려받지 않음"""
+    token = _scope.set(None)
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+def remaining() -> float | None:
+    """남은 시간 (초, 음수면 지남). 마감이 없으면 None"""
+    scope = _scope.get()
+    if scope is None or scope.deadline is None:
+        return None
+    return scope.deadline - time.monotonic()
+
+
+def expired() -> bool:
+    """마감이 지났으면 True (요청 scope에 중단을 기록)"""
+    left = remaining()
+    if left is None or left > 0:
+        return False
+    _scope.get().cut = True
+    return True
+
+
+def was_cut() -> bool:
+    """이번 요청에서 마감 때문에 건너뛰거나 취소한 조회가 있었는지"""
+    scope = _scope.get()
+    return scope is not None and scope.cut
+
+
+def mark_partial(result: dict) -> dict:
+    """중단된 조회가 있었으면 partial: true를 붙인 복사본 (캐시된 원본은 수정하지 않음)"""
+    if not was_cut() or "error" in result:
+        return result
+    return {**result, "partial": True}
+
+
+def upstream_timeout(ceiling: float) -> httpx.Timeout:
+    """외부 호출 타임아웃: 고정 상한과 남은 시간 중 짧은 쪽"""
+    left = remaining()
+    return httpx.Timeout(ceiling if left is None else max(0.001, min(ceiling, left)))
+
+
+async def gather(*aws: Awaitable, fallback: Any = None) -> list:
+    """
+    asyncio.gather와 같되 마감까지 끝나지 않은 작업은 취소하고 그 자리에 fallback을 넣음
+
+    마감이 없으면 asyncio.gather와 같습니다. 완료된 작업의 예외는 그대로 전파합니다.
+    """
+    left = remaining()
+    if left is None:
+        return list(await asyncio.gather(*aws))
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    if not tasks:
+        return []
+    try:
+        done, pending = await asyncio.wait(tasks, timeout=max(0.0, left))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    if pending:
+        _scope.get().cut = True
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    return [task.result() if task in done else fallback for task in tasks]
@@ -0,0 +1,186 @@
+"""
+실거래 내보내기 (CSV / Parquet)
+
+파서가 만든 item(dict) 페이지를 받아 바로 인코딩된 청크(bytes)로 변환합니다.
+JSON 문서를 거치지 않고 페이지 단위로 쓰므로 여러 해 분량의 내보내기도 고정된 메모리로 처리합니다.
+
+  - 숫자/날짜 컬럼은 타입을 맞춰 기록 (amount → 정수, area_m2 → 실수, deal_date → 날짜)
+  - *_raw 컬럼(원문 금액 문자열)은 중복이므로 제외
+  - parquet은 pyarrow 설치 시에만 지원 (페이지마다 row group 하나)
+"""
+
+import csv
+import datetime
+import io
+
+try:
+    import pyarrow as pa  # 선택 의존성: pip install pyarrow
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa = None
+    pq = None
+
+INT_COLUMNS = {
+    "amount", "deposit", "monthly_rent",
+    "floor", "floor_count", "total_floors", "build_year",
+}
+FLOAT_COLUMNS = {"area_m2", "land_area_m2"}
+DATE_COLUMNS = {"deal_date"}
+
+# format → (Content-Type, 확장자)
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+}
+if pa is not None:
+    EXPORT_FORMATS["parquet"] = ("application/vnd.apache.parquet", "parquet")
+
+
+def export_columns(items: list[dict]) -> list[str]:
+    """첫 페이지 item 키 순서 기준 컬럼 목록 (*_raw 제외)"""
+    columns: list[str] = []
+    for item in items:
+        for key in item:
+            if key not in columns and not key.endswith("_raw"):
+                columns.append(key)
+    return columns
+
+
+def _to_int(value) -> int | None:
+    if isinstance(value, int) or value is None:
+        return value
+    try:
+        return int(str(value).replace(",", "").strip())
+    except ValueError:
+        return None
+
+
+def _to_float(value) -> float | None:
+    try:
+        return float(str(value).replace(",", "").strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_date(value) -> datetime.date | None:
+    try:
+        return datetime.date.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def _converter(column: str):
+    if column in INT_COLUMNS:
+        return _to_int
+    if column in FLOAT_COLUMNS:
+        return _to_float
+    if column in DATE_COLUMNS:
+        return _to_date
+    return lambda v: None if v in (None, "") else str(v)
+
+
+class CsvChunkWriter:
+    """
+    페이지 단위 CSV 인코더
+
+    첫 청크에 UTF-8 BOM과 헤더를 붙입니다 (엑셀에서 한글이 깨지지 않도록).
+    값이 없는 칸은 빈 문자열로 기록합니다.
+    """
+
+    def __init__(self, columns: list[str]) -> None:
+        self.columns = columns
+        self._converters = [_converter(c) for c in columns]
+        self._started = False
+
+    def write(self, items: list[dict]) -> bytes:
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        if not self._started:
+            buf.write("\ufeff")
+            writer.writerow(self.columns)
+            self._started = True
+        for item in items:
+            row = []
+            for column, convert in zip(self.columns, self._converters):
+                value = convert(item.get(column))
+                row.append("" if value is None else value.isoformat() if isinstance(value, datetime.date) else value)
+            writer.writerow(row)
+        return buf.getvalue().encode("utf-8")
+
+    def close(self) -> bytes:
+        return b"" if self._started else self.write([])
+
+
+class _Drain:
+    """ParquetWriter 출력 버퍼. write()로 받은 바이트를 take()로 꺼내 바로 전송"""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._pos = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ParquetChunkWriter:
+    """
+    페이지 단위 Parquet 인코더 (pyarrow 필요)
+
+    Parquet은 앞에서부터 순차 기록되므로 row group을 쓸 때마다 생성된 바이트를
+    즉시 내보내고, close() 시 footer(메타데이터)를 반환합니다.
+    """
+
+    def __init__(self, columns: list[str]) -> None:
+        if pa is None:
+            raise RuntimeError("parquet 내보내기는 pyarrow가 필요합니다: pip install pyarrow")
+        self.columns = columns
+        self._converters = [_converter(c) for c in columns]
+        self.schema = pa.schema([(c, self._arrow_type(c)) for c in columns])
+        self._drain = _Drain()
+        self._writer = pq.ParquetWriter(pa.PythonFile(self._drain, mode="w"), self.schema, compression="zstd")
+
+    @staticmethod
+    def _arrow_type(column: str):
+        if column in INT_COLUMNS:
+            return pa.int64()
+        if column in FLOAT_COLUMNS:
+            return pa.float64()
+        if column in DATE_COLUMNS:
+            return pa.date32()
+        return pa.string()
+
+    def write(self, items: list[dict]) -> bytes:
+        if items:
+            arrays = {
+                column: [convert(item.get(column)) for item in items]
+                for column, convert in zip(self.columns, self._converters)
+            }
+            self._writer.write_table(pa.Table.from_pydict(arrays, schema=self.schema))
+        return self._drain.take()
+
+    def close(self) -> bytes:
+        self._writer.close()
+        return self._drain.take()
+
+
+def make_writer(fmt: str, columns: list[str]) -> CsvChunkWriter | ParquetChunkWriter:
+    if fmt == "parquet":
+        return ParquetChunkWriter(columns)
+    return CsvChunkWriter(columns)
@@ -0,0 +1,298 @@
+"""
+오프라인 지오코딩 + 공간 인덱스
+
+실거래(dong + jibun), 건축인허가(plat_plc), 온비드(ldtlAddr) 데이터에는 좌표가 없으므로
+사용자가 준비한 좌표 파일(법정동/지번별 위경도)을 읽어 외부 지오코더 없이 좌표를 찾고,
+geohash 격자 인덱스로 반경/사각형 범위 조회를 처리합니다.
+
+좌표 파일 (REALESTATE_GEOCODE_PATH, 기본: data/geocode.csv, UTF-8 CSV, 헤더 필수):
+  region_code,dong,jibun,lat,lon     # 예: 11680,대치동,316,37.4979,127.0633
+                                     #     jibun을 비우면 법정동 대표 좌표
+  또는
+  address,lat,lon                    # 예: 서울특별시 강남구 대치동 316,37.4979,127.0633
+
+좌표 찾기 순서: 지번(본번-부번) → 본번 → 법정동 대표 좌표(없으면 해당 동 좌표 평균)
+"""
+
+import csv
+import math
+import os
+import re
+import threading
+from functools import lru_cache
+
+from data.region_codes import region_code_from_address
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+GEOCODE_PATH = os.getenv("REALESTATE_GEOCODE_PATH", os.path.join(_BASE_DIR, "data", "geocode.csv"))
+
+EARTH_RADIUS_M = 6_371_008.8
+INDEX_PRECISION = 6        # geohash 6자리 ≈ 0.0055° × 0.011° (서울 기준 약 610m × 970m)
+MAX_SCAN_CELLS = 1024      # 범위가 이보다 많은 칸을 덮으면 칸 열거 대신 전체 칸 검사
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_JIBUN_RE = re.compile(r"^(산)?(\d+)(?:-(\d+))?(?:번지)?$")
+_DONG_SUFFIXES = ("동", "가", "리")
+
+
+# ── 거리 / geohash ───────────────────────────────────────────────────────────
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """두 좌표 사이 대권 거리 (m)"""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def geohash_encode(lat: float, lon: float, precision: int = INDEX_PRECISION) -> str:
+    lat_lo, lat_hi, lon_lo, lon_hi = -90.0, 90.0, -180.0, 180.0
+    chars = []
+    bits = ch = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if lon >= mid:
+                ch, lon_lo = ch * 2 + 1, mid
+            else:
+                ch, lon_hi = ch * 2, mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                ch, lat_lo = ch * 2 + 1, mid
+            else:
+                ch, lat_hi = ch * 2, mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[ch])
+            bits = ch = 0
+    return "".join(chars)
+
+
+def _cell_size(precision: int) -> tuple[float, float]:
+    """geohash 한 칸의 (위도, 경도) 크기 (도)"""
+    bits = precision * 5
+    return 180.0 / 2 ** (bits // 2), 360.0 / 2 ** ((bits + 1) // 2)
+
+
+def radius_bbox(lat: float, lon: float, radius_m: float) -> tuple[float, float, float, float]:
+    """반경을 감싸는 (min_lat, min_lon, max_lat, max_lon)"""
+    dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+    dlon = dlat / max(math.cos(math.radians(lat)), 1e-6)
+    return lat - dlat, lon - dlon, lat + dlat, lon + dlon
+
+
+class GeoHashIndex:
+    """geohash 칸 → [(lat, lon, payload)] 공간 인덱스"""
+
+    def __init__(self, precision: int = INDEX_PRECISION) -> None:
+        self.precision = precision
+        self.cells: dict[str, list[tuple[float, float, object]]] = {}
+        self.count = 0
+
+    def add(self, lat: float, lon: float, payload: object) -> None:
+        self.cells.setdefault(geohash_encode(lat, lon, self.precision), []).append((lat, lon, payload))
+        self.count += 1
+
+    def _cells_in(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float):
+        dlat, dlon = _cell_size(self.precision)
+        n_lat = int((max_lat - min_lat) / dlat) + 2
+        n_lon = int((max_lon - min_lon) / dlon) + 2
+        if n_lat * n_lon > MAX_SCAN_CELLS or n_lat * n_lon > len(self.cells):
+            return self.cells.values()
+        keys = {
+            geohash_encode(min(min_lat + i * dlat, max_lat), min(min_lon + j * dlon, max_lon), self.precision)
+            for i in range(n_lat) for j in range(n_lon)
+        }
+        return [self.cells[k] for k in keys if k in self.cells]
+
+    def in_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> list[tuple]:
+        """사각형 범위 안의 (lat, lon, payload)"""
+        return [
+            entry
+            for entries in self._cells_in(min_lat, min_lon, max_lat, max_lon)
+            for entry in entries
+            if min_lat <= entry[0] <= max_lat and min_lon <= entry[1] <= max_lon
+        ]
+
+    def within(self, lat: float, lon: float, radius_m: float) -> list[tuple[float, object]]:
+        """반경 안의 (거리 m, payload), 가까운 순"""
+        found = []
+        for entry_lat, entry_lon, payload in self.in_bbox(*radius_bbox(lat, lon, radius_m)):
+            d = haversine_m(lat, lon, entry_lat, entry_lon)
+            if d <= radius_m:
+                found.append((d, payload))
+        found.sort(key=lambda x: x[0])
+        return found
+
+
+# ── 주소 정규화 ──────────────────────────────────────────────────────────────
+
+def normalize_jibun(jibun: str) -> str:
+    """'0316-0002' / '316-2번지' / '산 12' → '316-2' / '316-2' / '산12' (해석 불가면 빈 문자열)"""
+    m = _JIBUN_RE.match("".join((jibun or "").split()))
+    if not m:
+        return ""
+    mountain, main, sub = m.groups()
+    text = f"{mountain or ''}{int(main)}"
+    if sub and int(sub):
+        text += f"-{int(sub)}"
+    return text
+
+
+def parse_address(address: str) -> tuple[str, str, str] | None:
+    """
+    지번 주소 → (시군구 코드, 법정동, 지번)
+
+    예: "서울특별시 강남구 대치동 316번지" → ("11680", "대치동", "316")
+        "서울특별시 강남구 대치동 316 은마아파트 1동 101호" → ("11680", "대치동", "316")
+    """
+    region_code = region_code_from_address(address)
+    if not region_code:
+        return None
+    tokens = address.split()
+    for i, token in enumerate(tokens[1:], 1):
+        if not token.endswith(_DONG_SUFFIXES) or token[:-1].isdigit():
+            continue
+        rest = tokens[i + 1:]
+        if rest and rest[0] == "산" and len(rest) > 1:
+            rest = ["산" + rest[1]] + rest[2:]
+        return region_code, token, normalize_jibun(rest[0]) if rest else ""
+    return None
+
+
+# ── 지오코더 ─────────────────────────────────────────────────────────────────
+
+class Geocoder:
+    """좌표 파일 기반 (시군구, 법정동, 지번) → (lat, lon, 정밀도) 조회. 조회 결과는 LRU 캐시"""
+
+    def __init__(self, path: str = GEOCODE_PATH) -> None:
+        self.path = path
+        self.points: dict[tuple[str, str, str], tuple[float, float]] = {}
+        self.loaded = False
+        self.error = ""
+        self.locate = lru_cache(maxsize=65536)(self._locate)
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            self.error = f"좌표 파일이 없습니다: {self.path} (REALESTATE_GEOCODE_PATH)"
+            return
+        sums: dict[tuple[str, str], list[float]] = {}
+        with open(self.path, encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                try:
+                    lat, lon = float(row["lat"]), float(row["lon"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if row.get("address"):
+                    parsed = parse_address(row["address"])
+                    if parsed is None:
+                        continue
+                    key = parsed
+                else:
+                    key = ((row.get("region_code") or "").strip()[:5], "".join((row.get("dong") or "").split()),
+                           normalize_jibun(row.get("jibun") or ""))
+                self.points[key] = (lat, lon)
+                acc = sums.setdefault(key[:2], [0.0, 0.0, 0])
+                acc[0] += lat
+                acc[1] += lon
+                acc[2] += 1
+        # 대표 좌표가 없는 법정동은 그 동 좌표 평균
+        for (region_code, dong), (lat_sum, lon_sum, n) in sums.items():
+            self.points.setdefault((region_code, dong, ""), (lat_sum / n, lon_sum / n))
+        self.loaded = True
+
+    def _locate(self, region_code: str, dong: str, jibun: str = "") -> tuple[float, float, str] | None:
+        dong = "".join((dong or "").split())
+        jibun = normalize_jibun(jibun)
+        candidates = []
+        if jibun:
+            candidates.append((jibun, "jibun"))
+            if "-" in jibun:
+                candidates.append((jibun.split("-", 1)[0], "bun"))
+        candidates.append(("", "dong"))
+        for key, precision in candidates:
+            point = self.points.get((region_code, dong, key))
+            if point is not None:
+                return point[0], point[1], precision
+        return None
+
+    def locate_address(self, address: str) -> tuple[float, float, str] | None:
+        parsed = parse_address(address)
+        return self.locate(*parsed) if parsed else None
+
+
+_geocoder: Geocoder | None = None
+_geocoder_lock = threading.Lock()
+
+
+def get_geocoder() -> Geocoder:
+    """프로세스 공용 지오코더 (최초 사용 시 좌표 파일 적재)"""
+    global _geocoder
+    with _geocoder_lock:
+        if _geocoder is None:
+            _geocoder = Geocoder()
+        return _geocoder
+
+
+# ── 로컬 이력 저장소 공간 인덱스 ──────────────────────────────────────────────
+
+class StoreGeoIndex:
+    """
+    HistoryStore의 매매 실거래(유형별)와 입찰결과를 좌표로 색인 (최초 조회 시 적재)
+
+    조회 때마다 저장소 쪽 버전을 비교해 바뀌었으면 다시 만듭니다. 실거래는 유형별 변경 번호
+    (HistoryStore.trade_version), 입찰결과는 (건수, 마지막 적재 시각)이라 다른 워커가 적재한 변경도 반영됩니다.
+    """
+
+    def __init__(self, store, geocoder: Geocoder) -> None:
+        self.store = store
+        self.geocoder = geocoder
+        self._trades: dict[str, tuple[int, GeoHashIndex, int]] = {}
+        self._auctions: tuple[tuple, GeoHashIndex, int] | None = None
+        self._lock = threading.Lock()
+
+    def trades(self, trade_type: str) -> tuple[GeoHashIndex, int]:
+        """(인덱스, 좌표를 못 찾은 건수)"""
+        with self._lock:
+            version = self.store.trade_version(trade_type)
+            cached = self._trades.get(trade_type)
+            if cached is None or cached[0] != version:
+                index, missing = GeoHashIndex(), 0
+                for row in self.store.trade_rows(trade_type, ""):
+                    point = self.geocoder.locate(row["region_code"], row["dong"] or "", row["jibun"] or "")
+                    if point is None:
+                        missing += 1
+                        continue
+                    index.add(point[0], point[1], (row, point[2]))
+                cached = self._trades[trade_type] = (version, index, missing)
+            return cached[1], cached[2]
+
+    def auctions(self) -> tuple[GeoHashIndex, int]:
+        with self._lock:
+            version = self.store.auction_version()
+            if self._auctions is None or self._auctions[0] != version:
+                index, missing = GeoHashIndex(), 0
+                for row in self.store.auction_rows():
+                    point = self.geocoder.locate_address(row["location"] or "")
+                    if point is None:
+                        missing += 1
+                        continue
+                    index.add(point[0], point[1], (row, point[2]))
+                self._auctions = (version, index, missing)
+            return self._auctions[1], self._auctions[2]
+
+
+_store_index: StoreGeoIndex | None = None
+
+
+def get_store_geo_index() -> StoreGeoIndex:
+    """프로세스 공용 저장소 공간 인덱스 (get_store() 기준)"""
+    global _store_index
+    if _store_index is None:
+        from _store import get_store
+        _store_index = StoreGeoIndex(get_store(), get_geocoder())
+    return _store_index
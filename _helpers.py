@@ -4,8 +4,10 @@
 국토교통부 공공데이터 API (data.go.kr) 기반
 """
 
+import asyncio
 import os
 import statistics
+import time
 from datetime import datetime
 from typing import Any
 from urllib.parse import quote
@@ -13,6 +15,12 @@ from urllib.parse import quote
 import httpx
 from dotenv import load_dotenv
 
+from _cache import TTLCache
+from _deadline import DEADLINE_ERROR, expired, upstream_timeout
+from _metrics import UpstreamCall, observe_parse, record_result_code, register_cache
+from _shared import UPSTREAM_LIMITER
+from _tracing import span
+
 load_dotenv()
 
 # ── API 키 ──────────────────────────────────────────────────────────────────
@@ -20,7 +28,9 @@ API_KEY = os.getenv("DATA_GO_KR_API_KEY", "")
 ONBID_API_KEY = os.getenv("ONBID_API_KEY", "") or API_KEY
 
 # ── 국토교통부 실거래가 API 엔드포인트 ────────────────────────────────────────
-BASE = "http://apis.data.go.kr"
+# DATA_GO_KR_BASE_URL: 로컬 가짜 서버(bench.fake_server) 등으로 호출 대상을 바꿀 때 사용
+BASE_URL_OVERRIDE = os.getenv("DATA_GO_KR_BASE_URL", "").rstrip("/")
+BASE = BASE_URL_OVERRIDE or "http://apis.data.go.kr"
 
 # 아파트
 APT_TRADE_URL = f"{BASE}/1613000/RTMSDataSvcAptTradeDev/getRTMSDataSvcAptTradeDev"
@@ -54,8 +64,47 @@ ARCH_PMS_PLATPLC_URL  = f"{ARCH_PMS_BASE}/getApPlatPlcInfo"      # 대지위치
 ARCH_PMS_HSTP_URL     = f"{ARCH_PMS_BASE}/getApHsTpInfo"         # 주택유형
 
 
+# URL → 상수 이름 (메트릭 endpoint 라벨: APT_TRADE, ARCH_PMS_BASIS, ONBID_BID_RESULT ...)
+_ENDPOINT_NAMES = {
+    value: name[: -len("_URL")]
+    for name, value in list(globals().items())
+    if name.endswith("_URL") and isinstance(value, str)
+}
+
+
+def endpoint_name(url: str) -> str:
+    return _ENDPOINT_NAMES.get(url) or url.rstrip("/").rsplit("/", 1)[-1]
+
+
 # ── HTTP 클라이언트 ──────────────────────────────────────────────────────────
-_TIMEOUT = httpx.Timeout(30.0)
+# 외부 호출 타임아웃 상한 (초). 요청 마감이 더 가까우면 남은 시간까지만 기다림 (_deadline)
+_TIMEOUT = 30.0
+
+# 프로세스 공용 클라이언트: 호출마다 새로 연결하지 않고 keep-alive 연결을 재사용
+# (데몬/HTTP 모드에서는 세션·요청끼리 연결 풀을 공유). 연결은 이벤트 루프에 묶이므로 루프별로 하나
+_client: httpx.AsyncClient | None = None
+_client_loop = None
+
+
+def http_client() -> httpx.AsyncClient:
+    """외부 API 호출용 공용 AsyncClient (타임아웃은 호출마다 지정)"""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            timeout=_TIMEOUT,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_http_client() -> None:
+    """앱 종료 시 공용 클라이언트의 연결 정리 (server.create_http_app lifespan)"""
+    global _client
+    if _client is not None and _client_loop is asyncio.get_running_loop():
+        await _client.aclose()
+    _client = None
 
 
 def _build_url(base_url: str, service_key: str, params: dict) -> str:
@@ -73,16 +122,24 @@ async def _fetch_xml(url: str, params: dict) -> str | None:
     """XML 응답 비동기 조회 (serviceKey는 params에 포함)"""
     service_key = params.pop("serviceKey", API_KEY)
     full_url = _build_url(url, service_key, params)
-    async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
+    endpoint = endpoint_name(url)
+    if expired() or not await UPSTREAM_LIMITER.acquire(endpoint):
+        return None
+    client = http_client()
+    with span("fetch", endpoint=endpoint), UpstreamCall(endpoint) as call:
         try:
-            resp = await client.get(full_url)
+            resp = await client.get(full_url, timeout=upstream_timeout(_TIMEOUT))
+            call.response(resp.status_code, len(resp.content))
             resp.raise_for_status()
             return resp.text
-        except httpx.TimeoutException:
+        except httpx.TimeoutException as e:
+            call.error(e)
             return None
-        except httpx.HTTPStatusError:
+        except httpx.HTTPStatusError as e:
+            call.error(e)
             return None
-        except Exception:
+        except Exception as e:
+            call.error(e)
             return None
 
 
@@ -90,19 +147,47 @@ async def _fetch_json(url: str, params: dict) -> dict | None:
     """JSON 응답 비동기 조회 (serviceKey는 params에 포함)"""
     service_key = params.pop("serviceKey", ONBID_API_KEY)
     full_url = _build_url(url, service_key, params)
-    async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
+    endpoint = endpoint_name(url)
+    if expired() or not await UPSTREAM_LIMITER.acquire(endpoint):
+        return None
+    client = http_client()
+    with UpstreamCall(endpoint) as call:
         try:
-            resp = await client.get(full_url)
+            with span("fetch", endpoint=endpoint):
+                resp = await client.get(full_url, timeout=upstream_timeout(_TIMEOUT))
+            call.response(resp.status_code, len(resp.content))
             resp.raise_for_status()
-            return resp.json()
-        except httpx.TimeoutException:
+            started = time.perf_counter()
+            with span("parse.json", endpoint=endpoint, bytes=len(resp.content)):
+                data = resp.json()
+            observe_parse("json", endpoint, time.perf_counter() - started)
+            return data
+        except httpx.TimeoutException as e:
+            call.error(e)
             return None
-        except httpx.HTTPStatusError:
+        except httpx.HTTPStatusError as e:
+            call.error(e)
             return None
-        except Exception:
+        except Exception as e:
+            call.error(e)
             return None
 
 
+# ── 응답 캐시 ────────────────────────────────────────────────────────────────
+MOLIT_CACHE = TTLCache("molit")
+ARCH_PMS_CACHE = TTLCache("arch_pms")
+register_cache(MOLIT_CACHE)
+register_cache(ARCH_PMS_CACHE)
+
+
+def molit_cache_key(url: str, region_code: str, year_month: str, num_of_rows: int) -> tuple:
+    return (url, region_code, year_month, int(num_of_rows))
+
+
+def arch_pms_cache_key(url: str, sigungu_cd: str, bjdong_cd: str, **params) -> tuple:
+    return (url, sigungu_cd, bjdong_cd, *sorted(params.items()))
+
+
 # ── XML 파싱 헬퍼 ────────────────────────────────────────────────────────────
 def _txt(element, tag: str, default: str = "") -> str:
     """XML 태그에서 텍스트 추출"""
@@ -146,51 +231,61 @@ def _summarize_prices(prices: list[int]) -> dict:
 
 
 # ── 공통 API 호출 플로우 ─────────────────────────────────────────────────────
-async def run_molit_tool(
+# data.go.kr 결과 코드 중 일시 오류: 01 APPLICATION_ERROR, 04 HTTP_ERROR, 05 SERVICE_TIMEOUT,
+# 22 LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS (일일 호출 한도)
+_TRANSIENT_RESULT_CODES = frozenset({"01", "04", "05", "22"})
+
+
+async def fetch_molit_page(
     url: str,
     region_code: str,
     year_month: str,
     num_of_rows: int,
+    page_no: int,
     parser_fn,
     label: str,
 ) -> dict:
     """
-    국토교통부 실거래가 API 공통 호출 및 파싱 플로우
+    국토교통부 실거래가 API 한 페이지 조회 + 파싱
 
-    Args:
-        url: API 엔드포인트 URL
-        region_code: 법정동 앞 5자리 코드
-        year_month: 거래년월 (YYYYMM)
-        num_of_rows: 최대 행 수
-        parser_fn: XML 파싱 함수 (xml_text -> list[dict])
-        label: 로그용 레이블
+    Returns:
+        {"total_count", "page_no", "items"} 또는 {"error", ...}
+        타임아웃·서버 오류·호출 한도 초과처럼 잠시 뒤 다시 시도하면 될 수 있는 오류에는 retryable: true
     """
-    if not API_KEY:
-        return {"error": "DATA_GO_KR_API_KEY 환경변수가 설정되지 않았습니다."}
-
     params = {
         "serviceKey": API_KEY,
         "LAWD_CD": region_code,
         "DEAL_YMD": year_month,
         "numOfRows": str(num_of_rows),
-        "pageNo": "1",
+        "pageNo": str(page_no),
     }
 
     xml_text = await _fetch_xml(url, params)
     if xml_text is None:
-        return {"error": f"{label} API 요청 실패 (타임아웃 또는 서버 오류)"}
+        if expired():
+            return {"error": f"{label} API 요청 중단: {DEADLINE_ERROR}"}
+        return {"error": f"{label} API 요청 실패 (타임아웃 또는 서버 오류)", "retryable": True}
 
+    endpoint = endpoint_name(url)
     try:
         import xml.etree.ElementTree as ET
-        root = ET.fromstring(xml_text)
+        started = time.perf_counter()
+        with span("parse.xml", endpoint=endpoint, bytes=len(xml_text)):
+            root = ET.fromstring(xml_text)
+        observe_parse("xml", endpoint, time.perf_counter() - started)
     except ET.ParseError as e:
+        record_result_code(endpoint, "parse_error")
         return {"error": f"XML 파싱 오류: {e}", "raw": xml_text[:500]}
 
     # 결과 코드 확인
     result_code = root.findtext(".//resultCode") or root.findtext("./header/resultCode") or ""
+    record_result_code(endpoint, result_code)
     if result_code not in ("", "00", "000", "0000"):
         result_msg = root.findtext(".//resultMsg") or "알 수 없는 오류"
-        return {"error": f"API 오류 {result_code}: {result_msg}"}
+        error: dict[str, Any] = {"error": f"API 오류 {result_code}: {result_msg}"}
+        if result_code in _TRANSIENT_RESULT_CODES:
+            error["retryable"] = True
+        return error
 
     # totalCount
     total_count_text = root.findtext(".//totalCount") or "0"
@@ -200,22 +295,103 @@ async def run_molit_tool(
         total_count = 0
 
     items_el = root.findall(".//item")
-    items = parser_fn(items_el)
-
-    result: dict[str, Any] = {
-        "total_count": total_count,
-        "returned_count": len(items),
-        "region_code": region_code,
-        "year_month": year_month,
-        "items": items,
-    }
+    with span("parse.items", endpoint=endpoint, rows=len(items_el)):
+        items = parser_fn(items_el)
+    return {"total_count": total_count, "page_no": page_no, "items": items}
+
+
+async def iter_molit_pages(
+    url: str,
+    region_code: str,
+    year_month: str,
+    parser_fn,
+    label: str,
+    *,
+    page_size: int = 1000,
+    max_rows: int = 0,
+):
+    """
+    한 달치 실거래를 페이지 단위로 순차 조회하며 파싱 결과를 바로 반환 (async generator)
+
+    전체 결과를 메모리에 모으지 않으므로 스트리밍 응답/내보내기에 사용합니다.
+    max_rows > 0이면 해당 건수까지만 조회합니다. 오류 시 {"error"} 한 번 반환 후 종료.
+    """
+    if not API_KEY:
+        yield {"error": "DATA_GO_KR_API_KEY 환경변수가 설정되지 않았습니다."}
+        return
+
+    page_no = 1
+    sent = 0
+    while True:
+        # 페이지 오프셋이 어긋나지 않도록 numOfRows는 고정하고 초과분은 잘라냄
+        page = await fetch_molit_page(url, region_code, year_month, page_size, page_no, parser_fn, label)
+        if "error" in page:
+            yield page
+            return
+        if max_rows > 0:
+            page["items"] = page["items"][: max_rows - sent]
+        sent += len(page["items"])
+        yield page
+        limit = page["total_count"] if max_rows <= 0 else min(page["total_count"], max_rows)
+        if not page["items"] or sent >= limit:
+            return
+        page_no += 1
 
-    # 가격 요약 추가
-    trade_amounts = [i["amount"] for i in items if isinstance(i.get("amount"), int)]
-    if trade_amounts:
-        result["price_summary_만원"] = _summarize_prices(trade_amounts)
 
-    return result
+async def run_molit_tool(
+    url: str,
+    region_code: str,
+    year_month: str,
+    num_of_rows: int,
+    parser_fn,
+    label: str,
+) -> dict:
+    """
+    국토교통부 실거래가 API 공통 호출 및 파싱 플로우
+
+    Args:
+        url: API 엔드포인트 URL
+        region_code: 법정동 앞 5자리 코드
+        year_month: 거래년월 (YYYYMM)
+        num_of_rows: 최대 행 수
+        parser_fn: XML 파싱 함수 (xml_text -> list[dict])
+        label: 로그용 레이블
+    """
+    if not API_KEY:
+        return {"error": "DATA_GO_KR_API_KEY 환경변수가 설정되지 않았습니다."}
+
+    # 캐시 적중 시 얕은 복사본 반환 (호출부에서 요약 키를 바꿔 넣으므로)
+    cache_key = molit_cache_key(url, region_code, year_month, num_of_rows)
+    cached = await MOLIT_CACHE.get(cache_key)
+    if cached is not None:
+        return dict(cached.value)
+
+    # 여러 워커가 같은 키를 동시에 놓친 경우 한 워커만 호출 (_cache.TTLCache.single_flight)
+    async with MOLIT_CACHE.single_flight(cache_key) as filled:
+        if filled is not None:
+            return dict(filled.value)
+
+        page = await fetch_molit_page(url, region_code, year_month, num_of_rows, 1, parser_fn, label)
+        if "error" in page:
+            return page
+        total_count, items = page["total_count"], page["items"]
+
+        result: dict[str, Any] = {
+            "total_count": total_count,
+            "returned_count": len(items),
+            "region_code": region_code,
+            "year_month": year_month,
+            "items": items,
+        }
+
+        # 가격 요약 추가
+        with span("summarize", rows=len(items)):
+            trade_amounts = [i["amount"] for i in items if isinstance(i.get("amount"), int)]
+            if trade_amounts:
+                result["price_summary_만원"] = _summarize_prices(trade_amounts)
+
+        await MOLIT_CACHE.set(cache_key, result)
+    return dict(result)
 
 
 def get_current_year_month() -> str:
@@ -223,6 +399,24 @@ def get_current_year_month() -> str:
     return datetime.now().strftime("%Y%m")
 
 
+def iter_year_months(start: str, end: str) -> list[str]:
+    """YYYYMM 시작~종료(포함) 월 목록. 형식 오류(월이 1~12 밖인 경우 포함)나 역순이면 빈 목록"""
+    try:
+        y, m = int(start[:4]), int(start[4:6])
+        end_y, end_m = int(end[:4]), int(end[4:6])
+    except (ValueError, TypeError):
+        return []
+    if not (1 <= m <= 12 and 1 <= end_m <= 12):
+        return []
+    months = []
+    while (y, m) <= (end_y, end_m):
+        months.append(f"{y:04d}{m:02d}")
+        m += 1
+        if m > 12:
+            y, m = y + 1, 1
+    return months
+
+
 # ── 건축인허가 API 공통 호출 플로우 ──────────────────────────────────────────
 async def run_arch_pms_tool(
     url: str,
@@ -257,48 +451,66 @@ async def run_arch_pms_tool(
     if not API_KEY:
         return {"error": "DATA_GO_KR_API_KEY 환경변수가 설정되지 않았습니다."}
 
-    params: dict[str, str] = {
-        "serviceKey": API_KEY,
-        "sigunguCd":  sigungu_cd,
-        "bjdongCd":   bjdong_cd,
-        "_type":      "json",
-        "numOfRows":  str(num_of_rows),
-        "pageNo":     str(page_no),
-    }
-    if bun:
-        params["bun"] = bun
-    if ji:
-        params["ji"] = ji
-    if start_date:
-        params["startDate"] = start_date
-    if end_date:
-        params["endDate"] = end_date
-
-    data = await _fetch_json(url, params)
-    if data is None:
-        return {"error": f"{label} API 요청 실패 (타임아웃 또는 서버 오류)"}
-
-    # 결과 코드 확인
-    header = data.get("response", {}).get("header", {})
-    result_code = str(header.get("resultCode", ""))
-    if result_code not in ("", "00", "000", "0000"):
-        return {"error": f"API 오류 {result_code}: {header.get('resultMsg', '알 수 없는 오류')}"}
-
-    body = data.get("response", {}).get("body", {})
-    total_count = int(body.get("totalCount", 0) or 0)
-
-    raw_items = body.get("items", {})
-    if isinstance(raw_items, dict):
-        raw_items = raw_items.get("item", []) or []
-    if isinstance(raw_items, dict):  # 단건인 경우 dict로 반환됨
-        raw_items = [raw_items]
-
-    items = parser_fn(raw_items)
-
-    return {
-        "total_count": total_count,
-        "returned_count": len(items),
-        "sigungu_cd": sigungu_cd,
-        "bjdong_cd": bjdong_cd,
-        "items": items,
-    }
+    cache_key = arch_pms_cache_key(
+        url, sigungu_cd, bjdong_cd, bun=bun, ji=ji, start_date=start_date,
+        end_date=end_date, num_of_rows=num_of_rows, page_no=page_no,
+    )
+    cached = await ARCH_PMS_CACHE.get(cache_key)
+    if cached is not None:
+        return dict(cached.value)
+
+    async with ARCH_PMS_CACHE.single_flight(cache_key) as filled:
+        if filled is not None:
+            return dict(filled.value)
+
+        params: dict[str, str] = {
+            "serviceKey": API_KEY,
+            "sigunguCd":  sigungu_cd,
+            "bjdongCd":   bjdong_cd,
+            "_type":      "json",
+            "numOfRows":  str(num_of_rows),
+            "pageNo":     str(page_no),
+        }
+        if bun:
+            params["bun"] = bun
+        if ji:
+            params["ji"] = ji
+        if start_date:
+            params["startDate"] = start_date
+        if end_date:
+            params["endDate"] = end_date
+
+        data = await _fetch_json(url, params)
+        if data is None:
+            if expired():
+                return {"error": f"{label} API 요청 중단: {DEADLINE_ERROR}"}
+            return {"error": f"{label} API 요청 실패 (타임아웃 또는 서버 오류)"}
+
+        # 결과 코드 확인
+        header = data.get("response", {}).get("header", {})
+        result_code = str(header.get("resultCode", ""))
+        record_result_code(endpoint_name(url), result_code)
+        if result_code not in ("", "00", "000", "0000"):
+            return {"error": f"API 오류 {result_code}: {header.get('resultMsg', '알 수 없는 오류')}"}
+
+        body = data.get("response", {}).get("body", {})
+        total_count = int(body.get("totalCount", 0) or 0)
+
+        raw_items = body.get("items", {})
+        if isinstance(raw_items, dict):
+            raw_items = raw_items.get("item", []) or []
+        if isinstance(raw_items, dict):  # 단건인 경우 dict로 반환됨
+            raw_items = [raw_items]
+
+        with span("parse.items", endpoint=endpoint_name(url), rows=len(raw_items)):
+            items = parser_fn(raw_items)
+
+        result = {
+            "total_count": total_count,
+            "returned_count": len(items),
+            "sigungu_cd": sigungu_cd,
+            "bjdong_cd": bjdong_cd,
+            "items": items,
+        }
+        await ARCH_PMS_CACHE.set(cache_key, result)
+    return dict(result)
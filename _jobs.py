@@ -0,0 +1,582 @@
+"""
+장기 실행 리포트 작업 큐 (디스크 저장)
+
+전국·다년 분석은 (시군구 × 월) 조회가 수백~수천 건이라 MCP/HTTP 요청 제한 시간을 넘깁니다.
+작업 명세(spec)를 제출하면 작업 ID를 바로 돌려주고, 서버 안의 제한된 수의 백그라운드 워커가
+(시군구, 월) 단위로 run_molit_tool을 호출해 단위별 결과를 SQLite 파일에 기록합니다.
+
+  - 진행률/부분 결과: 완료된 단위까지의 집계를 언제든 조회 가능. 프로세스마다 작업별 집계를 메모리에 두고
+                    조회할 때 그 뒤에 기록된 단위만 읽어 반영
+  - 일시 오류 재시도: 타임아웃·서버 오류·호출 한도 초과(retryable) 단위는 바로 다시 시도하고, 그래도 실패하면
+                    기록하지 않고 두었다가 작업의 나머지 단위가 끝난 뒤 간격을 두고 다시 조회.
+                    마지막 회차까지 실패한 단위만 오류로 기록
+  - 재시작 복구   : 실행 중이던 작업은 lease(MCP_JOB_LEASE 초)가 끝나면 다른(또는 재시작한) 워커가
+                    이어받고, 이미 기록된 단위는 다시 조회하지 않음
+  - 여러 HTTP 워커(MCP_WORKERS)가 같은 DB를 열어도 BEGIN IMMEDIATE로 작업을 한 워커만 가져감
+  - JobStore 메서드는 동기(SQLite)이므로 이벤트 루프에서는 asyncio.to_thread로 호출합니다.
+    submit_job / job_status / job_result / cancel_job / recent_jobs는 이를 감싼 코루틴입니다.
+
+spec:
+  {"kind": "trades" | "rent", "type": "apt", "regions": ["11680", "서울", "전국", ...],
+   "start_month": "202301", "end_month": "202412"}
+  regions 항목은 시군구 5자리 코드, 시도명(해당 시도의 모든 시군구), "전국"을 받습니다.
+
+환경 변수:
+  MCP_JOBS_PATH        - 작업 DB 경로 (기본: .data/jobs.db)
+  MCP_JOB_WORKERS      - 동시에 실행할 작업 수 (기본 2)
+  MCP_JOB_CONCURRENCY  - 작업 하나의 동시 외부 조회 수 (기본 4)
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+from _deadline import unbounded
+from data.region_codes import REGION_CODES
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+JOBS_PATH = os.getenv("MCP_JOBS_PATH", os.path.join(_BASE_DIR, ".data", "jobs.db"))
+JOB_WORKERS = max(1, int(os.getenv("MCP_JOB_WORKERS", "2") or 2))
+JOB_CONCURRENCY = max(1, int(os.getenv("MCP_JOB_CONCURRENCY", "4") or 4))
+JOB_LEASE_SECONDS = float(os.getenv("MCP_JOB_LEASE", "60") or 60)
+
+JOB_KINDS = ("trades", "rent")
+MAX_UNITS = 20_000
+POLL_SECONDS = 5.0
+MONTH_ROWS = 1000
+UNIT_ATTEMPTS = 3         # 단위 하나의 연속 시도 횟수 (1초, 2초 간격)
+RETRY_PASSES = 3          # 일시 오류 단위를 다시 조회하는 회차 수 (첫 회차 포함)
+RETRY_PASS_DELAY = 30.0   # 회차 사이 대기 (초, 회차마다 늘림)
+REPORT_CACHE_SIZE = 16    # 프로세스가 메모리에 두는 작업별 집계 수
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id           TEXT PRIMARY KEY,
+    spec         TEXT NOT NULL,
+    status       TEXT NOT NULL,
+    total_units  INTEGER NOT NULL,
+    done_units   INTEGER NOT NULL DEFAULT 0,
+    error_units  INTEGER NOT NULL DEFAULT 0,
+    owner        TEXT,
+    lease_until  REAL,
+    created_at   REAL NOT NULL,
+    started_at   REAL,
+    finished_at  REAL,
+    error        TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_status ON jobs (status, created_at);
+
+CREATE TABLE IF NOT EXISTS job_units (
+    job_id       TEXT NOT NULL,
+    region_code  TEXT NOT NULL,
+    year_month   TEXT NOT NULL,
+    result       TEXT NOT NULL,
+    PRIMARY KEY (job_id, region_code, year_month)
+);
+"""
+
+# ── spec 검증 ────────────────────────────────────────────────────────────────
+
+def _region_names() -> dict[str, str]:
+    """코드 → 가장 긴 이름 ('11680' → '서울 강남구')"""
+    names: dict[str, str] = {}
+    for name, code in REGION_CODES.items():
+        if len(name) > len(names.get(code, "")):
+            names[code] = name
+    return names
+
+
+def _leaf_codes(prefix: str = "") -> list[str]:
+    """실거래 API 조회 단위 시군구 코드 (시도 코드 xx000과 구가 있는 시(41110 수원시 등) 제외)"""
+    codes = {c for c in REGION_CODES.values() if c.startswith(prefix) and not c.endswith("000")}
+    parents = {c for c in codes if c.endswith("0") and any(o != c and o[:4] == c[:4] for o in codes)}
+    return sorted(codes - parents)
+
+
+def expand_regions(regions: list[str]) -> tuple[list[str], str | None]:
+    """regions 항목(코드/시도명/'전국') → 시군구 코드 목록. 해석할 수 없는 항목이 있으면 (_, 오류)"""
+    codes: list[str] = []
+    for raw in regions:
+        item = str(raw).strip()
+        if item == "전국":
+            codes.extend(_leaf_codes())
+        elif item.isdigit() and len(item) == 5:
+            codes.extend(_leaf_codes(item[:2]) if item.endswith("000") else [item])
+        elif REGION_CODES.get(item, "").endswith("000"):
+            codes.extend(_leaf_codes(REGION_CODES[item][:2]))
+        elif item in REGION_CODES:
+            codes.append(REGION_CODES[item])
+        else:
+            return [], f"지역을 해석할 수 없습니다: {item} (시군구 코드, 시도명, '전국')"
+    return list(dict.fromkeys(codes)), None
+
+
+def validate_spec(spec: Any) -> tuple[dict | None, str | None]:
+    """제출된 spec 정규화 → (spec, None) 또는 (None, 오류 메시지)"""
+    from _helpers import iter_year_months
+    from tools.rent import _RENT_CONFIGS
+    from tools.trade import _TRADE_CONFIGS
+
+    if not isinstance(spec, dict):
+        return None, "spec은 객체여야 합니다."
+    kind = spec.get("kind", "trades")
+    if kind not in JOB_KINDS:
+        return None, f"kind는 {list(JOB_KINDS)} 중 하나여야 합니다."
+    configs = _TRADE_CONFIGS if kind == "trades" else _RENT_CONFIGS
+    deal_type = spec.get("type", "apt")
+    if deal_type not in configs:
+        return None, f"type은 {list(configs.keys())} 중 하나여야 합니다."
+    regions = spec.get("regions")
+    if isinstance(regions, str):
+        regions = [r for r in regions.split(",") if r.strip()]
+    if not regions:
+        return None, "regions가 필요합니다 (시군구 코드, 시도명, '전국')."
+    codes, error = expand_regions(regions)
+    if error:
+        return None, error
+    months = iter_year_months(str(spec.get("start_month", "")), str(spec.get("end_month", "")))
+    if not months:
+        return None, "start_month/end_month는 YYYYMM 형식이며 start ≤ end 여야 합니다."
+    if len(codes) * len(months) > MAX_UNITS:
+        return None, f"조회 단위(시군구 × 월) {len(codes) * len(months)}건이 최대 {MAX_UNITS}건을 넘습니다."
+    return {
+        "kind": kind, "type": deal_type, "regions": codes,
+        "start_month": months[0], "end_month": months[-1],
+    }, None
+
+
+# ── 저장소 ───────────────────────────────────────────────────────────────────
+
+class JobStore:
+    """작업/단위 결과 SQLite(WAL) 저장소 (_shared.SharedStore와 같은 연결·잠금 방식)"""
+
+    def __init__(self, path: str = JOBS_PATH) -> None:
+        self.path = path
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def _transaction(self, fn):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    def submit(self, spec: dict, total_units: int) -> str:
+        job_id = uuid.uuid4().hex[:16]
+        self._transaction(lambda conn: conn.execute(
+            "INSERT INTO jobs (id, spec, status, total_units, created_at) VALUES (?, ?, 'queued', ?, ?)",
+            (job_id, json.dumps(spec, ensure_ascii=False), total_units, time.time()),
+        ))
+        return job_id
+
+    def claim(self) -> dict | None:
+        """대기 중이거나 lease가 끝난 실행 중 작업 하나를 가져옴 (오래된 순)"""
+        def take(conn):
+            now = time.time()
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' OR (status = 'running' AND lease_until < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', owner = ?, lease_until = ?, "
+                "started_at = COALESCE(started_at, ?) WHERE id = ?",
+                (self.owner, now + JOB_LEASE_SECONDS, now, row["id"]),
+            )
+            return dict(row)
+
+        return self._transaction(take)
+
+    def record_unit(self, job_id: str, region_code: str, year_month: str, result: dict) -> str:
+        """단위 결과 기록 + 진행률/lease 갱신. 현재 작업 상태 반환 (취소 감지용)"""
+        def write(conn):
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO job_units VALUES (?, ?, ?, ?)",
+                (job_id, region_code, year_month, json.dumps(result, ensure_ascii=False, separators=(",", ":"))),
+            )
+            if cur.rowcount:
+                conn.execute(
+                    "UPDATE jobs SET done_units = done_units + 1, error_units = error_units + ?, "
+                    "lease_until = ? WHERE id = ? AND owner = ?",
+                    (1 if "error" in result else 0, time.time() + JOB_LEASE_SECONDS, job_id, self.owner),
+                )
+            row = conn.execute("SELECT status, owner FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return row["status"] if row and row["owner"] == self.owner else "lost"
+
+        return self._transaction(write)
+
+    def renew(self, job_id: str) -> str:
+        """lease 연장. 현재 작업 상태 반환 (다른 워커가 가져갔으면 'lost')"""
+        def write(conn):
+            conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND owner = ? AND status = 'running'",
+                (time.time() + JOB_LEASE_SECONDS, job_id, self.owner),
+            )
+            row = conn.execute("SELECT status, owner FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return row["status"] if row and row["owner"] == self.owner else "lost"
+
+        return self._transaction(write)
+
+    def finish(self, job_id: str, status: str, error: str = "") -> None:
+        self._transaction(lambda conn: conn.execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, error = ?, lease_until = NULL "
+            "WHERE id = ? AND owner = ? AND status = 'running'",
+            (status, time.time(), error or None, job_id, self.owner),
+        ))
+
+    def cancel(self, job_id: str) -> bool:
+        def write(conn):
+            return conn.execute(
+                "UPDATE jobs SET status = 'canceled', finished_at = ? WHERE id = ? AND status IN ('queued', 'running')",
+                (time.time(), job_id),
+            ).rowcount == 1
+
+        return self._transaction(write)
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def recent(self, limit: int = 50) -> list[dict]:
+        with self._lock:
+            return [dict(r) for r in self._conn.execute(
+                "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,),
+            )]
+
+    def units(self, job_id: str, after: int = 0) -> list[tuple[int, str, str, dict]]:
+        """rowid가 after보다 큰(그 뒤에 기록된) 단위 결과 → [(rowid, 시군구, 월, 결과)] 기록 순.
+        job_units는 INSERT만 하므로 rowid가 기록 순서입니다."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT rowid, region_code, year_month, result FROM job_units "
+                "WHERE job_id = ? AND rowid > ? ORDER BY rowid",
+                (job_id, after),
+            ).fetchall()
+        return [(r[0], r[1], r[2], json.loads(r[3])) for r in rows]
+
+    def done_keys(self, job_id: str) -> set[tuple[str, str]]:
+        with self._lock:
+            return {
+                (r[0], r[1]) for r in self._conn.execute(
+                    "SELECT region_code, year_month FROM job_units WHERE job_id = ?", (job_id,),
+                )
+            }
+
+
+# ── 단위 실행 / 집계 ─────────────────────────────────────────────────────────
+
+async def _run_unit(spec: dict, region_code: str, year_month: str) -> dict:
+    """(시군구, 월) 1건 조회 → {"total_count", "values"} 또는 {"error", (retryable)}"""
+    from _helpers import run_molit_tool
+    from tools.rent import _RENT_CONFIGS
+    from tools.trade import _TRADE_CONFIGS
+
+    if spec["kind"] == "trades":
+        url, parser, label = _TRADE_CONFIGS[spec["type"]]
+    else:
+        url, parser, label = _RENT_CONFIGS[spec["type"]]
+    result = await run_molit_tool(url, region_code, year_month, MONTH_ROWS, parser, label)
+    if "error" in result:
+        return {"error": result["error"], **({"retryable": True} if result.get("retryable") else {})}
+    items = result["items"]
+    unit: dict[str, Any] = {"total_count": result["total_count"], "returned_count": len(items)}
+    if spec["kind"] == "trades":
+        unit["values"] = [i["amount"] for i in items if isinstance(i.get("amount"), int)]
+    else:
+        unit["values"] = [
+            i["deposit"] for i in items if i.get("rent_type") == "전세" and isinstance(i.get("deposit"), int)
+        ]
+        unit["monthly_count"] = sum(1 for i in items if i.get("rent_type") == "월세")
+    return unit
+
+
+class _Report:
+    """
+    작업 하나의 단위 결과 누적 집계
+
+    add()로 새 단위만 반영하고, report()는 그 사이 값이 바뀐 시군구의 요약만 다시 계산합니다.
+    """
+
+    def __init__(self, spec: dict) -> None:
+        self.spec = spec
+        self.last_rowid = 0
+        self.lock = threading.Lock()
+        self._regions: dict[str, dict] = {}
+        self._rows: dict[str, dict] = {}
+        self._dirty: set[str] = set()
+        self._errors: dict[str, dict[str, str]] = {}
+        self._truncated: list[str] = []
+
+    def add(self, units: list[tuple[int, str, str, dict]]) -> None:
+        from _helpers import _summarize_prices
+
+        for rowid, region_code, year_month, unit in units:
+            self.last_rowid = max(self.last_rowid, rowid)
+            if "error" in unit:
+                self._errors.setdefault(region_code, {})[year_month] = unit["error"]
+                continue
+            region = self._regions.setdefault(region_code, {"values": [], "months": {}, "total_count": 0})
+            region["values"].extend(unit["values"])
+            region["total_count"] += unit["total_count"]
+            if unit["total_count"] > unit["returned_count"]:
+                self._truncated.append(f"{region_code}:{year_month}")
+            if unit["values"]:
+                region["months"][year_month] = _summarize_prices(unit["values"])
+            self._dirty.add(region_code)
+
+    def report(self) -> dict:
+        """시군구별 표 (월별 건수/중앙값 포함). 부분 결과에도 그대로 사용"""
+        from _helpers import _summarize_prices
+
+        value_label = "amount_만원" if self.spec["kind"] == "trades" else "jeonse_deposit_만원"
+        if self._dirty:
+            names = _region_names()
+            for code in self._dirty:
+                r = self._regions[code]
+                self._rows[code] = {
+                    "region_code": code,
+                    "region_name": names.get(code, ""),
+                    "total_count": r["total_count"],
+                    value_label: _summarize_prices(r["values"]),
+                    "months": dict(sorted(r["months"].items())),
+                }
+            self._dirty.clear()
+        rows = sorted(self._rows.values(), key=lambda r: -(r[value_label].get("median") or 0))
+        report: dict[str, Any] = {"regions": rows}
+        if self._errors:
+            report["errors"] = {code: dict(sorted(m.items())) for code, m in sorted(self._errors.items())}
+        if self._truncated:
+            report["truncated_units"] = sorted(self._truncated)
+        return report
+
+    def refresh(self, store: "JobStore", job_id: str) -> dict:
+        """store에서 마지막으로 읽은 뒤 기록된 단위만 읽어 반영 → report(). 스레드에서 호출"""
+        with self.lock:
+            self.add(store.units(job_id, after=self.last_rowid))
+            return self.report()
+
+
+def build_report(spec: dict, units: list[tuple[str, str, dict]]) -> dict:
+    """단위 결과 [(시군구, 월, 결과)] → 시군구별 표 (한 번에 집계)"""
+    report = _Report(spec)
+    report.add([(0, region_code, year_month, unit) for region_code, year_month, unit in units])
+    return report.report()
+
+
+# ── 워커 풀 ──────────────────────────────────────────────────────────────────
+
+class JobRunner:
+    """
+    서버 이벤트 루프 안의 작업 워커 JOB_WORKERS개
+
+    start()는 여러 번 불러도 한 번만 시작합니다. stdio 모드에서는 작업 도구가 처음 호출될 때,
+    HTTP 모드에서는 앱 시작 시 시작해 이전 실행에서 남은 작업을 이어받습니다.
+    """
+
+    def __init__(self, store: JobStore) -> None:
+        self.store = store
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup: asyncio.Event | None = None
+
+    def start(self) -> None:
+        if self._tasks and not all(t.done() for t in self._tasks):
+            return
+        self._wakeup = asyncio.Event()
+        # 도구 호출 중에 시작돼도 그 요청의 마감(_deadline)을 물려받지 않게 함
+        with unbounded():
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(JOB_WORKERS)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _worker(self) -> None:
+        while True:
+            job = await asyncio.to_thread(self.store.claim)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await asyncio.to_thread(self.store.finish, job["id"], "failed", f"{type(e).__name__}: {e}")
+
+    async def _run(self, job: dict) -> None:
+        from _helpers import iter_year_months
+
+        spec = json.loads(job["spec"])
+        done = await asyncio.to_thread(self.store.done_keys, job["id"])
+        pending = [
+            (code, ym)
+            for code in spec["regions"]
+            for ym in iter_year_months(spec["start_month"], spec["end_month"])
+            if (code, ym) not in done
+        ]
+        semaphore = asyncio.Semaphore(JOB_CONCURRENCY)
+        stop = asyncio.Event()
+
+        async def one(code: str, ym: str, last_pass: bool) -> bool:
+            """단위 1건 실행·기록. 일시 오류로 다음 회차에 다시 조회할 단위면 True"""
+            for attempt in range(UNIT_ATTEMPTS):
+                async with semaphore:
+                    if stop.is_set():
+                        return False
+                    unit = await _run_unit(spec, code, ym)
+                if not unit.get("retryable"):
+                    break
+                if attempt < UNIT_ATTEMPTS - 1:
+                    await asyncio.sleep(2 ** attempt)
+            if unit.pop("retryable", False) and not last_pass:
+                return True
+            status = await asyncio.to_thread(self.store.record_unit, job["id"], code, ym, unit)
+            if status != "running":
+                stop.set()   # 취소되었거나 lease를 다른 워커가 가져감
+            return False
+
+        async def heartbeat() -> None:
+            # 외부 호출이 호출 제한 대기 등으로 오래 걸려도 lease가 끝나지 않게 주기적으로 연장
+            while not stop.is_set():
+                await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+                if await asyncio.to_thread(self.store.renew, job["id"]) != "running":
+                    stop.set()
+
+        beat = asyncio.create_task(heartbeat())
+        try:
+            for n in range(RETRY_PASSES):
+                last_pass = n == RETRY_PASSES - 1
+                deferred = await asyncio.gather(*(one(code, ym, last_pass) for code, ym in pending))
+                pending = [unit for unit, again in zip(pending, deferred) if again]
+                if not pending or stop.is_set():
+                    break
+                try:
+                    await asyncio.wait_for(stop.wait(), RETRY_PASS_DELAY * (n + 1))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            beat.cancel()
+        if not stop.is_set():
+            await asyncio.to_thread(self.store.finish, job["id"], "done")
+
+
+# ── 공용 인스턴스 / 조회 ─────────────────────────────────────────────────────
+
+_store: JobStore | None = None
+_runner: JobRunner | None = None
+
+
+def get_job_store() -> JobStore:
+    global _store
+    if _store is None:
+        _store = JobStore()
+    return _store
+
+
+def get_job_runner() -> JobRunner:
+    """프로세스 공용 워커 풀 (실행 중인 이벤트 루프에서 start() 호출)"""
+    global _runner
+    if _runner is None:
+        _runner = JobRunner(get_job_store())
+    return _runner
+
+
+_reports: "OrderedDict[str, _Report]" = OrderedDict()
+
+
+async def submit_job(spec: Any) -> dict:
+    """spec 검증 → 작업 등록 → {"job_id", ...} 또는 {"error"}"""
+    normalized, error = validate_spec(spec)
+    if error:
+        return {"error": error}
+    from _helpers import iter_year_months
+
+    total = len(normalized["regions"]) * len(iter_year_months(normalized["start_month"], normalized["end_month"]))
+    job_id = await asyncio.to_thread(get_job_store().submit, normalized, total)
+    runner = get_job_runner()
+    runner.start()
+    runner.notify()
+    return {"job_id": job_id, "status": "queued", "total_units": total, "spec": normalized}
+
+
+def _status(job: dict) -> dict:
+    spec = json.loads(job["spec"])
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "progress": {
+            "done_units": job["done_units"],
+            "total_units": job["total_units"],
+            "error_units": job["error_units"],
+            "pct": round(job["done_units"] / job["total_units"] * 100, 1) if job["total_units"] else 100.0,
+        },
+        "spec": {**spec, "regions": spec["regions"] if len(spec["regions"]) <= 20 else f"{len(spec['regions'])}개 시군구"},
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+        "error": job["error"],
+    }
+
+
+async def job_status(job_id: str) -> dict | None:
+    job = await asyncio.to_thread(get_job_store().get, job_id)
+    return _status(job) if job is not None else None
+
+
+async def recent_jobs(limit: int = 50) -> list[dict]:
+    """최근 작업 상태 목록 (최신순)"""
+    return [_status(job) for job in await asyncio.to_thread(get_job_store().recent, limit)]
+
+
+async def cancel_job(job_id: str) -> bool:
+    """대기 중이거나 실행 중인 작업 취소. 취소할 수 없는 상태(또는 없는 작업)면 False"""
+    return await asyncio.to_thread(get_job_store().cancel, job_id)
+
+
+async def job_result(job_id: str) -> dict | None:
+    """완료 전이면 지금까지 기록된 단위의 부분 결과 (partial=True)"""
+    store = get_job_store()
+    job = await asyncio.to_thread(store.get, job_id)
+    if job is None:
+        return None
+    status = _status(job)
+    report = _reports.get(job_id)
+    if report is None:
+        report = _reports[job_id] = _Report(json.loads(job["spec"]))
+        while len(_reports) > REPORT_CACHE_SIZE:
+            _reports.popitem(last=False)
+    _reports.move_to_end(job_id)
+    # 상태를 읽은 뒤 기록된 단위가 집계에 더 들어갈 수는 있어도 빠지지는 않음
+    return {**status, "partial": status["status"] != "done", **await asyncio.to_thread(report.refresh, store, job_id)}
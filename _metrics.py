@@ -0,0 +1,304 @@
+"""
+Prometheus 메트릭 (외부 의존성 없음)
+
+공공데이터 API 호출/파싱/캐시/HTTP 처리 상태를 프로세스 메모리에 누적하고
+GET /metrics 에서 Prometheus text exposition format(0.0.4)으로 내보냅니다.
+
+  - upstream_request_duration_seconds{endpoint}      외부 API 응답 시간 히스토그램
+  - upstream_responses_total{endpoint, status}       HTTP 상태 코드별 응답 수
+  - upstream_errors_total{endpoint, exception}       예외 유형별 실패 수 (타임아웃 등)
+  - upstream_result_codes_total{endpoint, code}      응답 본문 resultCode별 수
+  - upstream_response_bytes_total{endpoint}          수신 바이트
+  - upstream_in_flight{endpoint}                     진행 중 요청 수
+  - upstream_throttled_total{endpoint, reason}       호출 제한(_shared)으로 대기/거부된 수
+  - upstream_quota_used{endpoint}                    오늘 외부 API 호출 수 (MCP_DAILY_QUOTA 설정 시)
+  - parse_duration_seconds{format, endpoint}         XML/JSON 파싱 시간 히스토그램
+  - cache_hits_total / cache_misses_total / cache_hit_ratio / cache_entries {cache}
+  - http_requests_total{path, status}, http_requests_in_flight
+  - http_admission_rejected_total{traffic, reason}   동시 처리 제한으로 거부한 요청 (429/503)
+  - http_admission_queued{traffic}                   처리 슬롯을 기다리는 요청 수
+
+endpoint 라벨은 _helpers의 URL 상수 이름(APT_TRADE, ARCH_PMS_BASIS, ONBID_BID_RESULT ...)입니다.
+"""
+
+import bisect
+import threading
+import time
+from typing import Callable, Iterable
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 공공데이터 API 응답 시간 분포에 맞춘 버킷 (초)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PARSE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Collected(_Metric):
+    """렌더링 시점에 collect()로 값을 읽는 메트릭 (캐시 통계처럼 다른 객체가 값을 보관하는 경우)"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str], kind: str,
+                 collect: Callable[[], dict[tuple, float]]) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self._collect = collect
+
+    def _samples(self) -> list[str]:
+        items = sorted(self._collect().items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Iterable[float] = LATENCY_BUCKETS, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # key → [bucket별 개수..., +Inf 개수, 합계]
+        self._values: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = []
+        for key, counts in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), counts[:-1]):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_format_value(counts[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {_format_value(cumulative)}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+# ── 외부 API 호출 ─────────────────────────────────────────────────────────────
+
+UPSTREAM_LATENCY = REGISTRY.register(Histogram(
+    "upstream_request_duration_seconds", "외부 API 요청 소요 시간", ("endpoint",),
+))
+UPSTREAM_RESPONSES = REGISTRY.register(Counter(
+    "upstream_responses_total", "외부 API HTTP 상태 코드별 응답 수", ("endpoint", "status"),
+))
+UPSTREAM_ERRORS = REGISTRY.register(Counter(
+    "upstream_errors_total", "외부 API 예외 유형별 실패 수", ("endpoint", "exception"),
+))
+UPSTREAM_RESULT_CODES = REGISTRY.register(Counter(
+    "upstream_result_codes_total", "외부 API 응답 본문 resultCode별 수", ("endpoint", "code"),
+))
+UPSTREAM_BYTES = REGISTRY.register(Counter(
+    "upstream_response_bytes_total", "외부 API 수신 바이트", ("endpoint",),
+))
+UPSTREAM_IN_FLIGHT = REGISTRY.register(Gauge(
+    "upstream_in_flight", "진행 중인 외부 API 요청 수", ("endpoint",),
+))
+UPSTREAM_THROTTLED = REGISTRY.register(Counter(
+    "upstream_throttled_total", "호출 제한으로 대기(rate)/거부(quota)된 외부 API 호출 수", ("endpoint", "reason"),
+))
+PARSE_LATENCY = REGISTRY.register(Histogram(
+    "parse_duration_seconds", "응답 본문 파싱 시간", ("format", "endpoint"), buckets=PARSE_BUCKETS,
+))
+
+
+class UpstreamCall:
+    """
+    외부 API 호출 1건 계측 (with 블록)
+
+        with UpstreamCall("APT_TRADE") as call:
+            resp = await client.get(url)
+            call.response(resp.status_code, len(resp.content))
+
+    블록 안에서 처리한 예외는 call.error(e)로 기록합니다.
+    """
+
+    def __init__(self, endpoint: str) -> None:
+        self.endpoint = endpoint
+        self._start = 0.0
+
+    def __enter__(self) -> "UpstreamCall":
+        UPSTREAM_IN_FLIGHT.inc(endpoint=self.endpoint)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        UPSTREAM_LATENCY.observe(time.perf_counter() - self._start, endpoint=self.endpoint)
+        UPSTREAM_IN_FLIGHT.dec(endpoint=self.endpoint)
+        if exc is not None:
+            self.error(exc)
+        return False
+
+    def response(self, status: int, nbytes: int) -> None:
+        UPSTREAM_RESPONSES.inc(endpoint=self.endpoint, status=status)
+        UPSTREAM_BYTES.inc(nbytes, endpoint=self.endpoint)
+
+    def error(self, exc: BaseException) -> None:
+        UPSTREAM_ERRORS.inc(endpoint=self.endpoint, exception=type(exc).__name__)
+
+
+def observe_parse(fmt: str, endpoint: str, seconds: float) -> None:
+    PARSE_LATENCY.observe(seconds, format=fmt, endpoint=endpoint)
+
+
+def record_result_code(endpoint: str, code: str) -> None:
+    UPSTREAM_RESULT_CODES.inc(endpoint=endpoint, code=code or "none")
+
+
+# ── 캐시 ──────────────────────────────────────────────────────────────────────
+
+_caches: list = []
+
+
+def register_cache(cache) -> None:
+    """TTLCache 인스턴스를 메트릭 수집 대상에 추가 (렌더링 시점에 값을 읽음)"""
+    _caches.append(cache)
+
+
+def _cache_values(attr: Callable) -> Callable[[], dict[tuple, float]]:
+    return lambda: {(c.name,): attr(c) for c in _caches}
+
+
+def _hit_ratio(cache) -> float:
+    total = cache.hits + cache.misses
+    return cache.hits / total if total else 0.0
+
+
+REGISTRY.register(Collected(
+    "cache_hits_total", "캐시 적중 수", ("cache",), "counter", _cache_values(lambda c: c.hits),
+))
+REGISTRY.register(Collected(
+    "cache_misses_total", "캐시 미스 수", ("cache",), "counter", _cache_values(lambda c: c.misses),
+))
+REGISTRY.register(Collected(
+    "cache_hit_ratio", "캐시 적중률 (프로세스 시작 이후)", ("cache",), "gauge", _cache_values(_hit_ratio),
+))
+REGISTRY.register(Collected(
+    "cache_entries", "캐시 항목 수", ("cache",), "gauge", _cache_values(len),
+))
+
+
+# ── HTTP 앱 ───────────────────────────────────────────────────────────────────
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP 요청 수", ("path", "status"),
+))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+    "http_requests_in_flight", "처리 중인 HTTP 요청 수",
+))
+ADMISSION_REJECTED = REGISTRY.register(Counter(
+    "http_admission_rejected_total", "동시 처리 제한으로 거부한 요청 수", ("traffic", "reason"),
+))
+ADMISSION_QUEUED = REGISTRY.register(Gauge(
+    "http_admission_queued", "처리 슬롯을 기다리는 요청 수", ("traffic",),
+))
+
+
+def render() -> str:
+    return REGISTRY.render()
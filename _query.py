@@ -0,0 +1,216 @@
+"""
+실거래 결과 서버 측 필터/정렬/페이지 처리
+
+/api/trades, /api/rent 가 캐시된 파싱 결과에 대해 조건을 평가하고
+클라이언트가 표시할 페이지만 돌려주도록 합니다.
+
+  - 숫자 컬럼(면적/가격/층/건축년도)은 캐시 항목당 한 번만 추출해 보관
+  - 정렬 키별 인덱스 순서도 캐시 항목에 미리 계산해 재사용
+  - cursor는 (data version, 오프셋)을 인코딩한 불투명 문자열.
+    캐시가 갱신되어 version이 바뀌면 만료된 cursor로 거부합니다.
+
+쿼리 파라미터:
+  dong, area_min, area_max, price_min, price_max(만원), floor_min, floor_max,
+  year_min, year_max, sort(amount|area|floor|build_year|deal_date, '-' 접두사=내림차순),
+  limit(기본 50, 최대 1000), cursor,
+  lat, lon, radius_m (반경 필터, 좌표는 _geo 오프라인 지오코딩: 시군구 + 법정동 + 지번)
+"""
+
+import base64
+import json
+from dataclasses import dataclass, field
+
+from _cache import CacheEntry
+from _geo import get_geocoder, haversine_m
+
+FILTER_PARAMS = (
+    "dong", "area_min", "area_max", "price_min", "price_max",
+    "floor_min", "floor_max", "year_min", "year_max", "sort", "limit", "cursor",
+    "lat", "lon", "radius_m",
+)
+SORT_KEYS = ("amount", "area", "floor", "build_year", "deal_date")
+_RANGE_COLUMNS = {"area": "area", "price": "amount", "floor": "floor", "year": "build_year"}
+
+
+@dataclass
+class ItemQuery:
+    dong: str = ""
+    ranges: dict[str, tuple[float | None, float | None]] = field(default_factory=dict)
+    sort: str = ""
+    descending: bool = False
+    limit: int = 50
+    cursor: str = ""
+    near: tuple[float, float, float] | None = None   # (lat, lon, radius_m)
+
+
+def has_query(params) -> bool:
+    return any(params.get(k) for k in FILTER_PARAMS)
+
+
+def parse_item_query(params) -> tuple[ItemQuery | None, str | None]:
+    """쿼리 파라미터 → ItemQuery. 형식 오류 시 (None, 오류 메시지)"""
+    query = ItemQuery(dong=params.get("dong", "").strip(), cursor=params.get("cursor", "").strip())
+    for prefix, column in _RANGE_COLUMNS.items():
+        bounds = []
+        for suffix in ("min", "max"):
+            raw = params.get(f"{prefix}_{suffix}", "").strip()
+            if not raw:
+                bounds.append(None)
+                continue
+            try:
+                bounds.append(float(raw))
+            except ValueError:
+                return None, f"{prefix}_{suffix}는 숫자여야 합니다."
+        if bounds != [None, None]:
+            query.ranges[column] = (bounds[0], bounds[1])
+
+    sort = params.get("sort", "").strip()
+    if sort:
+        query.descending = sort.startswith("-")
+        query.sort = sort.lstrip("-")
+        if query.sort not in SORT_KEYS:
+            return None, f"sort는 {list(SORT_KEYS)} 중 하나여야 합니다 (내림차순은 '-' 접두사)."
+    try:
+        query.limit = max(1, min(int(params.get("limit", "50")), 1000))
+    except ValueError:
+        return None, "limit은 정수여야 합니다."
+
+    near = [params.get(k, "").strip() for k in ("lat", "lon", "radius_m")]
+    if any(near):
+        try:
+            lat, lon, radius_m = (float(v) for v in near)
+        except ValueError:
+            return None, "lat, lon, radius_m은 함께 지정하는 숫자여야 합니다."
+        if radius_m <= 0:
+            return None, "radius_m은 0보다 커야 합니다."
+        query.near = (lat, lon, radius_m)
+    return query, None
+
+
+def _to_number(value) -> float | None:
+    try:
+        return float(str(value).replace(",", "").strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _columns(items: list[dict], price_field: str) -> dict[str, list]:
+    """필터/정렬용 컬럼 추출 (items와 같은 순서)"""
+    return {
+        "dong": [i.get("dong", "") for i in items],
+        "area": [_to_number(i.get("area_m2") or i.get("land_area_m2")) for i in items],
+        "amount": [i.get(price_field) if isinstance(i.get(price_field), int) else None for i in items],
+        "floor": [_to_number(i.get("floor") or i.get("floor_count")) for i in items],
+        "build_year": [_to_number(i.get("build_year")) for i in items],
+        "deal_date": [i.get("deal_date") or None for i in items],
+    }
+
+
+def _order(columns: dict[str, list], key: str, descending: bool) -> list[int]:
+    """정렬 키 기준 인덱스 순서 (값이 없는 항목은 항상 뒤로)"""
+    values = columns[key]
+    present = [i for i, v in enumerate(values) if v is not None]
+    missing = [i for i, v in enumerate(values) if v is None]
+    present.sort(key=values.__getitem__, reverse=descending)
+    return present + missing
+
+
+def _encode_cursor(version: int, offset: int) -> str:
+    raw = json.dumps({"v": version, "o": offset}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[int, int] | None:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return int(data["v"]), int(data["o"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def run_item_query(
+    result: dict,
+    query: ItemQuery,
+    price_field: str,
+    entry: CacheEntry | None = None,
+) -> tuple[dict | None, list[dict], str | None]:
+    """
+    run_molit_tool 결과에 query 적용
+
+    entry가 주어지면 컬럼/정렬 순서를 entry.extras에 보관해 다음 요청에서 재사용합니다.
+
+    Returns:
+        (페이지 응답 dict, 조건에 맞는 전체 항목, 오류 메시지)
+    """
+    items = result.get("items", [])
+    version = entry.version if entry is not None else 0
+    extras = entry.extras if entry is not None else {}
+
+    col_key = ("query_columns", price_field)
+    columns = extras.get(col_key)
+    if columns is None:
+        columns = _columns(items, price_field)
+        extras[col_key] = columns
+
+    offset = 0
+    if query.cursor:
+        decoded = _decode_cursor(query.cursor)
+        if decoded is None:
+            return None, [], "cursor 형식이 올바르지 않습니다."
+        if decoded[0] != version:
+            return None, [], "데이터가 갱신되어 cursor가 만료되었습니다. cursor 없이 다시 조회하세요."
+        offset = decoded[1]
+
+    if query.sort:
+        order_key = ("query_order", price_field, query.sort, query.descending)
+        order = extras.get(order_key)
+        if order is None:
+            order = _order(columns, query.sort, query.descending)
+            extras[order_key] = order
+    else:
+        order = range(len(items))
+
+    coords: list = []
+    if query.near:
+        geocoder = get_geocoder()
+        if not geocoder.loaded:
+            return None, [], geocoder.error
+        coords = extras.get("query_coords")
+        if coords is None:
+            region_code = result.get("region_code") or ""
+            coords = [geocoder.locate(region_code, i.get("dong") or "", i.get("jibun") or "") for i in items]
+            extras["query_coords"] = coords
+
+    dongs = columns["dong"]
+    ranges = [(columns[col], lo, hi) for col, (lo, hi) in query.ranges.items()]
+    matched: list[int] = []
+    for idx in order:
+        if query.dong and query.dong not in dongs[idx]:
+            continue
+        if query.near:
+            point = coords[idx]
+            if point is None or haversine_m(query.near[0], query.near[1], point[0], point[1]) > query.near[2]:
+                continue
+        ok = True
+        for values, lo, hi in ranges:
+            v = values[idx]
+            if v is None or (lo is not None and v < lo) or (hi is not None and v > hi):
+                ok = False
+                break
+        if ok:
+            matched.append(idx)
+
+    page_idx = matched[offset: offset + query.limit]
+    next_offset = offset + len(page_idx)
+    page = {
+        "total_count": result.get("total_count", len(items)),
+        "cached_count": len(items),
+        "matched_count": len(matched),
+        "returned_count": len(page_idx),
+        "region_code": result.get("region_code"),
+        "year_month": result.get("year_month"),
+        "items": [items[i] for i in page_idx],
+        "next_cursor": _encode_cursor(version, next_offset) if next_offset < len(matched) else None,
+    }
+    return page, [items[i] for i in matched], None
@@ -0,0 +1,54 @@
+"""
+JSON 직렬화 선택
+
+orjson이 설치되어 있으면 orjson, 없으면 표준 json(ensure_ascii=False)을 사용합니다.
+두 경로 모두 UTF-8 bytes를 반환하므로 HTTP 응답 본문과 캐시에 그대로 쓸 수 있습니다.
+
+환경 변수:
+  MCP_JSON_SERIALIZER - auto(기본) | orjson | json
+"""
+
+import json
+import os
+from typing import Any, Callable
+
+try:
+    import orjson  # 선택 의존성: pip install orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def _dumps_json(obj: Any) -> bytes:
+    return json.dumps(
+        obj, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _dumps_orjson(obj: Any) -> bytes:
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+
+SERIALIZERS: dict[str, Callable[[Any], bytes]] = {"json": _dumps_json}
+if orjson is not None:
+    SERIALIZERS["orjson"] = _dumps_orjson
+
+
+def _select(name: str) -> str:
+    name = name.lower()
+    if name == "auto" or name not in SERIALIZERS:
+        return "orjson" if "orjson" in SERIALIZERS else "json"
+    return name
+
+
+SERIALIZER = _select(os.getenv("MCP_JSON_SERIALIZER", "auto"))
+_dumps = SERIALIZERS[SERIALIZER]
+
+
+def dumps(obj: Any) -> bytes:
+    """선택된 직렬화기로 obj를 UTF-8 JSON bytes로 변환"""
+    return _dumps(obj)
+
+
+def loads(data: bytes | str) -> Any:
+    """JSON bytes/str → 객체 (orjson이 있으면 orjson). 잘못된 JSON이면 ValueError"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
@@ -0,0 +1,324 @@
+"""
+워커 간 공유 상태 (SQLite WAL)
+
+MCP_WORKERS > 1 로 HTTP 서버를 여러 프로세스로 실행하면 프로세스 메모리 캐시는 워커마다 따로라서
+같은 요청이 워커 수만큼 외부 API로 나가고, 호출 횟수 집계도 워커별로 나뉩니다.
+이 모듈은 SQLite 파일 하나(WAL 모드)를 모든 워커가 함께 열어 다음을 공유합니다.
+
+  - 응답 캐시 2차 저장소 : TTLCache 로컬 미스 시 조회, set 시 기록 (값은 _serialize JSON.
+                          JSON으로 표현할 수 없는 값은 공유하지 않음)
+  - 동시 조회 억제(lease) : 같은 키를 여러 워커가 동시에 놓치면 한 워커만 외부 API 호출
+  - 외부 API 호출 제한    : 모든 워커 합산 초당 호출 수(토큰 버킷), 엔드포인트별 일일 호출 수
+
+공유 저장소가 없으면(단일 프로세스) 호출 제한은 프로세스 메모리에서 같은 방식으로 계산합니다.
+SharedStore 메서드는 동기(BEGIN IMMEDIATE 잠금 대기 포함)이므로 이벤트 루프에서는 asyncio.to_thread로 호출합니다.
+
+환경 변수:
+  MCP_WORKERS       - HTTP 모드 워커 프로세스 수 (기본 1)
+  MCP_SHARED_CACHE  - 공유 DB 경로 (기본: 워커가 2개 이상이면 .data/shared_cache.db, 아니면 사용 안 함.
+                      'off'로 강제 비활성)
+  MCP_UPSTREAM_RPS  - 외부 API 초당 호출 상한, 모든 워커 합산 (기본 0 = 제한 없음)
+  MCP_DAILY_QUOTA   - 엔드포인트별 일일 호출 상한 (기본 0 = 제한 없음.
+                      data.go.kr 개발계정은 보통 API별 1일 10,000건)
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any
+
+from _metrics import REGISTRY, Collected, UPSTREAM_THROTTLED
+from _serialize import dumps, loads
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+WORKERS = max(1, int(os.getenv("MCP_WORKERS", "1") or 1))
+UPSTREAM_RPS = float(os.getenv("MCP_UPSTREAM_RPS", "0") or 0)
+DAILY_QUOTA = int(os.getenv("MCP_DAILY_QUOTA", "0") or 0)
+
+_default_path = os.path.join(_BASE_DIR, ".data", "shared_cache.db") if WORKERS > 1 else ""
+SHARED_PATH = os.getenv("MCP_SHARED_CACHE", _default_path)
+if SHARED_PATH.lower() in ("off", "0", "none"):
+    SHARED_PATH = ""
+
+# lease 유지 시간: 외부 API 타임아웃(30초)보다 길게 잡아 호출 중인 워커의 lease가 먼저 풀리지 않게 함
+LEASE_SECONDS = 35.0
+_PURGE_EVERY = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    name        TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    value       BLOB NOT NULL,
+    version     INTEGER NOT NULL,
+    created_at  REAL NOT NULL,
+    expires_at  REAL NOT NULL,
+    PRIMARY KEY (name, key)
+);
+CREATE INDEX IF NOT EXISTS ix_cache_expires ON cache (expires_at);
+
+CREATE TABLE IF NOT EXISTS leases (
+    key         TEXT PRIMARY KEY,
+    owner       TEXT NOT NULL,
+    expires_at  REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS buckets (
+    name        TEXT PRIMARY KEY,
+    tokens      REAL NOT NULL,
+    updated_at  REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS quota (
+    day         TEXT NOT NULL,
+    endpoint    TEXT NOT NULL,
+    count       INTEGER NOT NULL,
+    PRIMARY KEY (day, endpoint)
+);
+"""
+
+
+def _today() -> str:
+    return datetime.now().strftime("%Y%m%d")
+
+
+def _refill(tokens: float, updated_at: float, now: float, rate: float) -> float:
+    """토큰 버킷 보충. 버스트는 1초 분량까지"""
+    return min(max(rate, 1.0), tokens + (now - updated_at) * rate)
+
+
+class SharedStore:
+    """
+    여러 프로세스가 함께 여는 SQLite(WAL) 저장소
+
+    프로세스 안에서는 스레드 간 연결 하나를 잠금으로 공유하고(_store.HistoryStore와 같은 방식),
+    프로세스 간 쓰기 충돌은 BEGIN IMMEDIATE + busy_timeout으로 직렬화합니다.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10, isolation_level=None)
+        self._lock = threading.Lock()
+        self._sets = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _transaction(self, fn):
+        """BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡고 fn(conn) 실행"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    # ── 응답 캐시 ───────────────────────────────────────────────────────────
+
+    def cache_get(self, name: str, key: str) -> tuple[Any, int, float, float] | None:
+        """(value, version, created_at, expires_at). 없거나 만료면 None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, version, created_at, expires_at FROM cache "
+                "WHERE name = ? AND key = ? AND expires_at > ?",
+                (name, key, time.time()),
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return loads(row[0]), row[1], row[2], row[3]
+        except ValueError:   # 예전 형식(pickle) 등 읽을 수 없는 값은 미스로 처리
+            return None
+
+    def cache_set(self, name: str, key: str, value: Any, version: int, created_at: float, expires_at: float) -> None:
+        try:
+            blob = dumps(value)
+        except (TypeError, ValueError):
+            return
+
+        def write(conn):
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (name, key, value, version, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (name, key, blob, version, created_at, expires_at),
+            )
+            conn.execute("DELETE FROM leases WHERE key = ?", (f"{name}|{key}",))
+            self._sets += 1
+            if self._sets % _PURGE_EVERY == 0:
+                conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+
+        self._transaction(write)
+
+    def cache_clear(self, name: str) -> None:
+        self._transaction(lambda conn: conn.execute("DELETE FROM cache WHERE name = ?", (name,)))
+
+    # ── lease (동시 조회 억제) ─────────────────────────────────────────────
+
+    def claim(self, key: str, seconds: float = LEASE_SECONDS) -> str | None:
+        """
+        key의 lease 획득 시도. 성공하면 release()에 넘길 토큰, 유효한 lease가 이미 있으면 None
+
+        토큰은 호출마다 새로 만들므로 같은 워커 안의 동시 요청끼리도 한 건만 lease를 얻습니다.
+        """
+        token = f"{self.owner}-{uuid.uuid4().hex[:8]}"
+
+        def take(conn):
+            now = time.time()
+            cur = conn.execute(
+                "INSERT INTO leases (key, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE leases.expires_at <= ?",
+                (key, token, now + seconds, now),
+            )
+            return token if cur.rowcount == 1 else None
+
+        return self._transaction(take)
+
+    def lease_held(self, key: str) -> bool:
+        """key에 유효한 lease가 있는지 (읽기만 하므로 쓰기 잠금을 잡지 않음)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM leases WHERE key = ? AND expires_at > ?", (key, time.time()),
+            ).fetchone()
+        return row is not None
+
+    def release(self, key: str, token: str) -> None:
+        self._transaction(lambda conn: conn.execute(
+            "DELETE FROM leases WHERE key = ? AND owner = ?", (key, token),
+        ))
+
+    # ── 호출 제한 ───────────────────────────────────────────────────────────
+
+    def reserve_token(self, name: str, rate: float) -> float:
+        """토큰 1개 예약. 대기해야 할 초 반환 (토큰이 음수가 되도록 미리 빼 두어 순서대로 대기)"""
+        def take(conn):
+            now = time.time()
+            row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE name = ?", (name,)).fetchone()
+            tokens = _refill(row[0], row[1], now, rate) if row else max(rate, 1.0)
+            tokens -= 1
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                (name, tokens, now),
+            )
+            return max(0.0, -tokens / rate)
+
+        return self._transaction(take)
+
+    def count_call(self, endpoint: str, limit: int) -> bool:
+        """오늘 호출 수 1 증가. 상한을 넘으면 증가하지 않고 False"""
+        day = _today()
+
+        def bump(conn):
+            row = conn.execute(
+                "SELECT count FROM quota WHERE day = ? AND endpoint = ?", (day, endpoint),
+            ).fetchone()
+            if row and row[0] >= limit:
+                return False
+            conn.execute(
+                "INSERT INTO quota (day, endpoint, count) VALUES (?, ?, 1) "
+                "ON CONFLICT(day, endpoint) DO UPDATE SET count = count + 1",
+                (day, endpoint),
+            )
+            return True
+
+        return self._transaction(bump)
+
+    def quota_counts(self, day: str | None = None) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT endpoint, count FROM quota WHERE day = ?", (day or _today(),),
+            ).fetchall()
+        return dict(rows)
+
+
+SHARED: SharedStore | None = SharedStore(SHARED_PATH) if SHARED_PATH else None
+
+
+# ── 외부 API 호출 제한 ───────────────────────────────────────────────────────
+
+class UpstreamLimiter:
+    """
+    외부 API 호출 전 acquire(endpoint)로 허가를 받습니다.
+
+      - rps > 0   : 초당 호출 수를 넘으면 차례가 올 때까지 대기 (모든 엔드포인트 합산)
+      - quota > 0 : 엔드포인트별 오늘 호출 수가 상한에 도달하면 False (호출하지 말 것)
+
+    store가 있으면 카운터를 공유 DB에 두어 모든 워커가 같은 값을 봅니다.
+    """
+
+    def __init__(self, store: SharedStore | None = SHARED, rps: float = UPSTREAM_RPS,
+                 quota: int = DAILY_QUOTA) -> None:
+        self.store = store
+        self.rps = rps
+        self.quota = quota
+        self._lock = threading.Lock()
+        self._tokens = max(rps, 1.0)
+        self._updated_at = time.time()
+        self._counts: dict[tuple[str, str], int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.rps > 0 or self.quota > 0
+
+    def _reserve_local(self) -> float:
+        now = time.time()
+        with self._lock:
+            self._tokens = _refill(self._tokens, self._updated_at, now, self.rps) - 1
+            self._updated_at = now
+            return max(0.0, -self._tokens / self.rps)
+
+    def _count_local(self, endpoint: str) -> bool:
+        key = (_today(), endpoint)
+        with self._lock:
+            if self._counts.get(key, 0) >= self.quota:
+                return False
+            self._counts[key] = self._counts.get(key, 0) + 1
+            return True
+
+    def counts(self) -> dict[str, int]:
+        """엔드포인트별 오늘 호출 수"""
+        if self.store is not None:
+            return self.store.quota_counts()
+        day = _today()
+        with self._lock:
+            return {endpoint: n for (d, endpoint), n in self._counts.items() if d == day}
+
+    async def acquire(self, endpoint: str) -> bool:
+        if not self.enabled:
+            return True
+        if self.quota > 0:
+            allowed = (await asyncio.to_thread(self.store.count_call, endpoint, self.quota)
+                       if self.store is not None else self._count_local(endpoint))
+            if not allowed:
+                UPSTREAM_THROTTLED.inc(endpoint=endpoint, reason="quota")
+                return False
+        if self.rps > 0:
+            wait = (await asyncio.to_thread(self.store.reserve_token, "upstream", self.rps)
+                    if self.store is not None else self._reserve_local())
+            if wait > 0:
+                UPSTREAM_THROTTLED.inc(endpoint=endpoint, reason="rate")
+                await asyncio.sleep(wait)
+        return True
+
+
+UPSTREAM_LIMITER = UpstreamLimiter()
+
+REGISTRY.register(Collected(
+    "upstream_quota_used", "엔드포인트별 오늘 외부 API 호출 수 (MCP_DAILY_QUOTA 집계, 워커 합산)",
+    ("endpoint",), "gauge",
+    lambda: {(endpoint,): n for endpoint, n in UPSTREAM_LIMITER.counts().items()} if UPSTREAM_LIMITER.quota else {},
+))
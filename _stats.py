@@ -0,0 +1,184 @@
+"""
+스트리밍 통계 헬퍼
+
+페이지 단위로 도착하는 값을 한 번씩만 보고 갱신하는 통계 누적기입니다.
+전체 값을 메모리에 보관하지 않으므로 수만 건 이상의 결과도 고정된
+메모리 안에서 평균/최댓값/분위수를 계산할 수 있습니다.
+
+  - TDigest: 분위수 근사 (merging t-digest, k1 스케일 함수)
+  - StreamingStats: 건수/평균/최솟값/최댓값 + TDigest 분위수
+"""
+
+import math
+from typing import Iterable
+
+
+# ── t-digest ─────────────────────────────────────────────────────────────────
+
+class TDigest:
+    """
+    Merging t-digest 분위수 근사
+
+    값은 버퍼에 모았다가 일정 크기마다 centroid 목록과 병합합니다.
+    compression(δ)이 클수록 정확도가 높고 centroid 수(메모리)가 늘어납니다.
+    centroid 수는 대략 δ 이하로 유지됩니다.
+    """
+
+    def __init__(self, compression: float = 100.0, buffer_size: int = 500) -> None:
+        self.compression = compression
+        self._buffer_size = buffer_size
+        self._means: list[float] = []
+        self._weights: list[float] = []
+        self._buffer: list[float] = []
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self._buffer.append(float(value))
+        self.count += 1
+        if len(self._buffer) >= self._buffer_size:
+            self._compress()
+
+    def update(self, values: Iterable[float]) -> None:
+        for v in values:
+            self.add(v)
+
+    def merge(self, other: "TDigest") -> None:
+        """다른 digest의 centroid를 병합 (워커별 부분 집계 합산용)"""
+        other._compress()
+        self._compress()
+        self._means.extend(other._means)
+        self._weights.extend(other._weights)
+        self.count += other.count
+        self._compress(force=True)
+
+    def _k(self, q: float) -> float:
+        # k1 스케일 함수: 양 끝(0, 1) 근처 centroid를 작게 유지해 꼬리 분위수 정확도 확보
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _compress(self, force: bool = False) -> None:
+        if not self._buffer and not force:
+            return
+        points = sorted(
+            list(zip(self._means, self._weights)) + [(v, 1.0) for v in self._buffer]
+        )
+        self._buffer = []
+        if not points:
+            return
+
+        total = sum(w for _, w in points)
+        means: list[float] = []
+        weights: list[float] = []
+        cur_mean, cur_weight = points[0]
+        cumulative = 0.0
+        k_lower = self._k(0.0)
+
+        for mean, weight in points[1:]:
+            q = (cumulative + cur_weight + weight) / total
+            if self._k(q) - k_lower <= 1.0:
+                cur_mean += (mean - cur_mean) * weight / (cur_weight + weight)
+                cur_weight += weight
+            else:
+                means.append(cur_mean)
+                weights.append(cur_weight)
+                cumulative += cur_weight
+                k_lower = self._k(cumulative / total)
+                cur_mean, cur_weight = mean, weight
+        means.append(cur_mean)
+        weights.append(cur_weight)
+
+        self._means = means
+        self._weights = weights
+
+    def quantile(self, q: float) -> float | None:
+        """q(0~1) 분위수 근사값. 값이 없으면 None"""
+        self._compress()
+        if not self._means:
+            return None
+        if len(self._means) == 1:
+            return self._means[0]
+
+        q = min(max(q, 0.0), 1.0)
+        total = sum(self._weights)
+        target = q * total
+
+        # 각 centroid의 중심(누적 가중치 중앙)을 기준으로 선형 보간
+        cumulative = 0.0
+        prev_center = None
+        prev_mean = None
+        for mean, weight in zip(self._means, self._weights):
+            center = cumulative + weight / 2
+            if target <= center:
+                if prev_center is None:
+                    return mean
+                ratio = (target - prev_center) / (center - prev_center)
+                return prev_mean + (mean - prev_mean) * ratio
+            prev_center, prev_mean = center, mean
+            cumulative += weight
+        return self._means[-1]
+
+    @property
+    def centroid_count(self) -> int:
+        self._compress()
+        return len(self._means)
+
+
+# ── 누적 통계 ─────────────────────────────────────────────────────────────────
+
+DEFAULT_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+class StreamingStats:
+    """건수/평균/최솟값/최댓값 + t-digest 분위수를 한 번의 순회로 누적"""
+
+    def __init__(self, compression: float = 100.0) -> None:
+        self.count = 0
+        self._mean = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+        self.digest = TDigest(compression)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self._mean += (value - self._mean) / self.count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.digest.add(value)
+
+    def update(self, values: Iterable[float]) -> None:
+        for v in values:
+            self.add(v)
+
+    @property
+    def mean(self) -> float | None:
+        return self._mean if self.count else None
+
+    def summary(
+        self,
+        quantiles: Iterable[float] = DEFAULT_QUANTILES,
+        ndigits: int = 1,
+    ) -> dict:
+        """{count, mean, min, max, p10, p25, p50, ...} 요약. 값이 없으면 빈 dict"""
+        if not self.count:
+            return {}
+        result: dict = {
+            "count": self.count,
+            "mean": round(self._mean, ndigits),
+            "min": self.min,
+            "max": self.max,
+        }
+        for q in quantiles:
+            value = self.digest.quantile(q)
+            result[f"p{round(q * 100):g}"] = round(value, ndigits) if value is not None else None
+        return result
+
+    def price_summary(self) -> dict:
+        """_helpers._summarize_prices와 같은 {median, min, max, count} 형식 (median은 t-digest 근사)"""
+        if not self.count:
+            return {}
+        median = self.digest.quantile(0.5)
+        return {
+            "median": round(median) if median is not None else None,
+            "min": self.min,
+            "max": self.max,
+            "count": self.count,
+        }
@@ -0,0 +1,445 @@
+"""
+로컬 이력 저장소 (SQLite)
+
+온비드 입찰결과와 국토교통부 매매 실거래를 로컬 DB에 적재해
+두 API를 매번 실시간 호출하지 않고 인덱스 조회로 교차 분석합니다.
+
+테이블:
+  auction_results : 온비드 입찰결과 (시군구/용도/입찰일 인덱스)
+  trades          : 매매 실거래 (유형+시군구+거래일, 유형+시군구+면적 인덱스, trade_key 고유 인덱스)
+  trade_months    : (유형, 시군구, 년월) 단위 적재 이력
+  trade_versions  : (유형, 시군구)별 변경 번호. 거래 행이 바뀔 때마다 1 증가 (다른 프로세스의 변경 감지용)
+
+저장 위치: REALESTATE_DB_PATH 환경변수 (기본: 프로젝트 루트 .data/realestate.db)
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Iterable
+
+from data.region_codes import region_code_from_address
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.getenv("REALESTATE_DB_PATH", os.path.join(_BASE_DIR, ".data", "realestate.db"))
+
+# 온비드 용도명 → 실거래 유형 (web_api._TRADE_CONFIGS 키)
+_USE_TYPE_TO_TRADE_TYPE = (
+    ("아파트", "apt"),
+    ("오피스텔", "offi"),
+    ("연립", "villa"),
+    ("다세대", "villa"),
+    ("빌라", "villa"),
+    ("단독", "house"),
+    ("다가구", "house"),
+    ("상가", "commercial"),
+    ("근린", "commercial"),
+    ("업무", "commercial"),
+    ("건물", "commercial"),
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS auction_results (
+    item_no         TEXT PRIMARY KEY,
+    item_name       TEXT,
+    location        TEXT,
+    sigungu_code    TEXT,
+    use_type        TEXT,
+    trade_type      TEXT,
+    area_m2         REAL,
+    appraised_value INTEGER,
+    minimum_bid     INTEGER,
+    winning_bid     INTEGER,
+    bid_date        TEXT,
+    bid_status      TEXT,
+    agency          TEXT,
+    synced_at       REAL
+);
+CREATE INDEX IF NOT EXISTS ix_auction_region_type ON auction_results (sigungu_code, trade_type, bid_date);
+CREATE INDEX IF NOT EXISTS ix_auction_use_type ON auction_results (use_type, bid_date);
+
+CREATE TABLE IF NOT EXISTS trades (
+    trade_type   TEXT NOT NULL,
+    region_code  TEXT NOT NULL,
+    year_month   TEXT NOT NULL,
+    name         TEXT,
+    dong         TEXT,
+    jibun        TEXT,
+    area_m2      REAL,
+    floor        INTEGER,
+    build_year   INTEGER,
+    amount       INTEGER,
+    deal_date    TEXT,
+    trade_key    TEXT,
+    cancel_type  TEXT,
+    cancel_date  TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_trades_region_date ON trades (trade_type, region_code, deal_date);
+CREATE INDEX IF NOT EXISTS ix_trades_region_area ON trades (trade_type, region_code, area_m2);
+CREATE INDEX IF NOT EXISTS ix_trades_month ON trades (trade_type, region_code, year_month);
+
+CREATE TABLE IF NOT EXISTS trade_months (
+    trade_type   TEXT NOT NULL,
+    region_code  TEXT NOT NULL,
+    year_month   TEXT NOT NULL,
+    row_count    INTEGER,
+    total_count  INTEGER,
+    synced_at    REAL,
+    PRIMARY KEY (trade_type, region_code, year_month)
+);
+
+CREATE TABLE IF NOT EXISTS trade_versions (
+    trade_type   TEXT NOT NULL,
+    region_code  TEXT NOT NULL,
+    version      INTEGER NOT NULL,
+    PRIMARY KEY (trade_type, region_code)
+);
+"""
+
+
+def _to_float(value) -> float | None:
+    try:
+        return float(str(value).replace(",", "").strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value) -> int | None:
+    try:
+        return int(str(value).replace(",", "").strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _iso_date(value: str) -> str:
+    """'20240115', '2024-01-15 10:00' 등 → '2024-01-15'"""
+    digits = "".join(ch for ch in str(value or "") if ch.isdigit())[:8]
+    if len(digits) < 8:
+        return ""
+    return f"{digits[:4]}-{digits[4:6]}-{digits[6:8]}"
+
+
+# trades 테이블 컬럼 순서 (INSERT VALUES와 변경 비교에 사용)
+_TRADE_COLUMNS = (
+    "trade_type", "region_code", "year_month", "name", "dong", "jibun", "area_m2", "floor",
+    "build_year", "amount", "deal_date", "trade_key", "cancel_type", "cancel_date",
+)
+
+
+def trade_identity(
+    trade_type: str, region_code: str, name: str, jibun: str,
+    area_m2: float | None, floor: int | None, deal_date: str, amount: int | None,
+) -> str:
+    """
+    실거래 1건의 식별 키 (같은 거래면 다시 조회해도 같은 값)
+
+    해제여부/해제일은 키에 넣지 않습니다. 해제 신고는 같은 거래의 상태 변경이므로
+    키가 같은 행의 cancel_type/cancel_date가 바뀌는 것으로 반영됩니다.
+    """
+    parts = (
+        trade_type, region_code, "".join((name or "").split()), (jibun or "").strip(),
+        "" if area_m2 is None else f"{area_m2:.2f}", "" if floor is None else str(floor),
+        deal_date or "", "" if amount is None else str(amount),
+    )
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:20]
+
+
+def _keyed(rows: Iterable[tuple]) -> dict[str, tuple]:
+    """
+    trade_key 열을 채운 행 {key: row}. 식별 값이 모두 같은 거래가 여러 건이면 2번째부터 '#n'을 붙임
+
+    '#n' 순번이 API 응답 순서에 따라 바뀌지 않도록 행 값 순서로 정렬한 뒤 붙입니다.
+    """
+    keyed: dict[str, tuple] = {}
+    seen: dict[str, int] = {}
+    for row in sorted(rows, key=lambda r: tuple("" if v is None else str(v) for v in r)):
+        key = trade_identity(row[0], row[1], row[3], row[5], row[6], row[7], row[10], row[9])
+        seen[key] = n = seen.get(key, 0) + 1
+        if n > 1:
+            key = f"{key}#{n}"
+        keyed[key] = row[:11] + (key,) + row[12:]
+    return keyed
+
+
+def trade_type_for_use(use_type: str) -> str | None:
+    """온비드 용도명을 실거래 유형(apt/offi/villa/house/commercial)으로 매핑"""
+    for keyword, trade_type in _USE_TYPE_TO_TRADE_TYPE:
+        if keyword in (use_type or ""):
+            return trade_type
+    return None
+
+
+class HistoryStore:
+    """SQLite 기반 로컬 이력 저장소 (스레드 간 공유 연결 + 쓰기 잠금)"""
+
+    def __init__(self, path: str = DB_PATH) -> None:
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._trade_listeners: list[Callable[[str, str, list[dict], list[str], int], None]] = []
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+            self._migrate()
+
+    def _migrate(self) -> None:
+        """이전 버전 DB의 trades에 식별 키/해제 컬럼 추가 후 기존 행의 키를 채움"""
+        columns = {r["name"] for r in self._conn.execute("PRAGMA table_info(trades)")}
+        with self._conn:
+            for column, kind in (("trade_key", "TEXT"), ("cancel_type", "TEXT"), ("cancel_date", "TEXT")):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE trades ADD COLUMN {column} {kind}")
+            legacy = self._conn.execute(
+                f"SELECT rowid, {', '.join(_TRADE_COLUMNS)} FROM trades WHERE trade_key IS NULL "
+                "ORDER BY trade_type, region_code, year_month, rowid"
+            ).fetchall()
+            by_month: dict[tuple, list] = {}
+            for r in legacy:
+                by_month.setdefault((r[1], r[2], r[3]), []).append(r)
+            for rows in by_month.values():
+                keyed = _keyed(tuple(r)[1:] for r in rows)
+                self._conn.executemany(
+                    "UPDATE trades SET trade_key = ? WHERE rowid = ?",
+                    [(key, r[0]) for key, r in zip(keyed, rows)],
+                )
+            self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_trades_key ON trades (trade_key)")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ── 온비드 입찰결과 ─────────────────────────────────────────────────────
+
+    def upsert_auction_results(self, items: Iterable[dict]) -> int:
+        """_parse_onbid_bid_result 결과를 물건관리번호 기준으로 저장. 저장 건수 반환"""
+        now = time.time()
+        rows = [
+            (
+                it["item_no"],
+                it.get("item_name", ""),
+                it.get("location", ""),
+                region_code_from_address(it.get("location", "")),
+                it.get("use_type", ""),
+                trade_type_for_use(it.get("use_type", "")),
+                _to_float(it.get("area_m2")),
+                it.get("appraised_value"),
+                it.get("minimum_bid"),
+                it.get("winning_bid"),
+                _iso_date(it.get("bid_date", "")),
+                it.get("bid_status", ""),
+                it.get("agency", ""),
+                now,
+            )
+            for it in items
+            if it.get("item_no")
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO auction_results VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
+                rows,
+            )
+        return len(rows)
+
+    def auction_results(
+        self,
+        sigungu_code: str,
+        trade_type: str = "",
+        use_type: str = "",
+        date_from: str = "",
+        date_to: str = "",
+        limit: int = 100,
+    ) -> list[dict]:
+        """낙찰가가 있는 입찰결과를 시군구/유형/입찰일 조건으로 조회 (최근순)"""
+        sql = "SELECT * FROM auction_results WHERE sigungu_code = ? AND winning_bid > 0"
+        args: list = [sigungu_code]
+        if trade_type:
+            sql += " AND trade_type = ?"
+            args.append(trade_type)
+        if use_type:
+            sql += " AND use_type = ?"
+            args.append(use_type)
+        if date_from:
+            sql += " AND bid_date >= ?"
+            args.append(date_from)
+        if date_to:
+            sql += " AND bid_date <= ?"
+            args.append(date_to)
+        sql += " ORDER BY bid_date DESC LIMIT ?"
+        args.append(limit)
+        return [dict(r) for r in self._conn.execute(sql, args)]
+
+    def auction_rows(self) -> list[dict]:
+        """저장된 입찰결과 전체 (지오코딩 인덱스 적재용)"""
+        return [dict(r) for r in self._conn.execute("SELECT * FROM auction_results")]
+
+    def auction_version(self) -> tuple:
+        """입찰결과 변경 감지용 (건수, 마지막 적재 시각)"""
+        return tuple(self._conn.execute("SELECT COUNT(*), MAX(synced_at) FROM auction_results").fetchone())
+
+    # ── 매매 실거래 ──────────────────────────────────────────────────────────
+
+    def upsert_trade_month(
+        self,
+        trade_type: str,
+        region_code: str,
+        year_month: str,
+        items: list[dict],
+        total_count: int,
+    ) -> dict[str, int]:
+        """
+        (유형, 시군구, 년월) 한 달치 조회 결과를 trade_key 기준으로 반영
+
+        새 거래는 추가, 해제 신고 등으로 값이 바뀐 거래는 갱신, 조회 결과에서 빠진 거래는 삭제하고
+        그대로인 행은 건드리지 않습니다. 바뀐 행이 있으면 같은 트랜잭션에서 (유형, 시군구) 변경 번호를 올리고
+        listener에 변경분과 새 변경 번호를 전달합니다.
+        items가 한 달치 전체가 아니면(len(items) < total_count) 빠진 거래를 알 수 없으므로 삭제하지 않습니다.
+
+        Returns:
+            {"stored", "inserted", "updated", "deleted", "unchanged", "canceled"}
+        """
+        fresh = _keyed(
+            (
+                trade_type,
+                region_code,
+                year_month,
+                it.get("apt_name") or it.get("offi_name") or it.get("house_name")
+                or it.get("house_type") or it.get("use_type") or "",
+                it.get("dong", ""),
+                it.get("jibun", ""),
+                _to_float(it.get("area_m2")),
+                _to_int(it.get("floor") or it.get("floor_count")),
+                _to_int(it.get("build_year")),
+                it.get("amount"),
+                it.get("deal_date", ""),
+                None,
+                it.get("cancel_type", "") or "",
+                it.get("cancel_date", "") or "",
+            )
+            for it in items
+            if isinstance(it.get("amount"), int)
+        )
+        with self._lock, self._conn:
+            existing = {
+                r["trade_key"]: tuple(r) for r in self._conn.execute(
+                    f"SELECT {', '.join(_TRADE_COLUMNS)} FROM trades "
+                    "WHERE trade_type = ? AND region_code = ? AND year_month = ?",
+                    (trade_type, region_code, year_month),
+                )
+            }
+            changed = [row for key, row in fresh.items() if existing.get(key) != row]
+            complete = len(items) >= total_count
+            deleted = [key for key in existing if key not in fresh] if complete else []
+            if deleted:
+                self._conn.executemany("DELETE FROM trades WHERE trade_key = ?", [(k,) for k in deleted])
+            if changed:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO trades ({', '.join(_TRADE_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(_TRADE_COLUMNS))})",
+                    changed,
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO trade_months VALUES (?,?,?,?,?,?)",
+                (trade_type, region_code, year_month, len(fresh), total_count, time.time()),
+            )
+            version = 0
+            if changed or deleted:
+                self._conn.execute(
+                    "INSERT INTO trade_versions VALUES (?, ?, 1) "
+                    "ON CONFLICT(trade_type, region_code) DO UPDATE SET version = version + 1",
+                    (trade_type, region_code),
+                )
+                version = self._conn.execute(
+                    "SELECT version FROM trade_versions WHERE trade_type = ? AND region_code = ?",
+                    (trade_type, region_code),
+                ).fetchone()[0]
+        if changed or deleted:
+            upserted = [dict(zip(_TRADE_COLUMNS, row)) for row in changed]
+            for listener in self._trade_listeners:
+                listener(trade_type, region_code, upserted, deleted, version)
+        updated = sum(1 for row in changed if row[11] in existing)
+        return {
+            "stored": len(fresh),
+            "inserted": len(changed) - updated,
+            "updated": updated,
+            "deleted": len(deleted),
+            "unchanged": len(fresh) - len(changed),
+            "canceled": sum(1 for row in fresh.values() if row[12]),
+        }
+
+    def add_trade_listener(self, listener: Callable[[str, str, list[dict], list[str], int], None]) -> None:
+        """upsert_trade_month 후 listener(trade_type, region_code, 추가·갱신 행, 삭제 trade_key, 새 변경 번호) 호출"""
+        self._trade_listeners.append(listener)
+
+    def trade_version(self, trade_type: str, region_code: str = "") -> int:
+        """
+        거래 변경 번호. region_code를 주면 (유형, 시군구)의 번호, 비우면 유형 전체 번호의 합
+
+        번호는 줄지 않으므로 이전 값과 다르면 그 사이 (다른 프로세스 포함) 어딘가에서 거래가 바뀐 것입니다.
+        """
+        if region_code:
+            row = self._conn.execute(
+                "SELECT version FROM trade_versions WHERE trade_type = ? AND region_code = ?",
+                (trade_type, region_code),
+            ).fetchone()
+        else:
+            row = self._conn.execute(
+                "SELECT SUM(version) FROM trade_versions WHERE trade_type = ?", (trade_type,),
+            ).fetchone()
+        return (row[0] or 0) if row else 0
+
+    def trade_rows(
+        self, trade_type: str, region_code: str, year_month: str = "", include_canceled: bool = False,
+    ) -> list[dict]:
+        """저장된 매매 실거래 행 (region_code가 비면 전체 시군구, year_month를 주면 해당 월만, 기본은 해제 거래 제외)"""
+        sql = "SELECT * FROM trades WHERE trade_type = ?"
+        args: list = [trade_type]
+        if region_code:
+            sql += " AND region_code = ?"
+            args.append(region_code)
+        if year_month:
+            sql += " AND year_month = ?"
+            args.append(year_month)
+        if not include_canceled:
+            sql += " AND COALESCE(cancel_type, '') = ''"
+        return [dict(r) for r in self._conn.execute(sql, args)]
+
+    def synced_months(self, trade_type: str, region_code: str) -> list[dict]:
+        return [
+            dict(r) for r in self._conn.execute(
+                "SELECT year_month, row_count, total_count, synced_at FROM trade_months "
+                "WHERE trade_type = ? AND region_code = ? ORDER BY year_month",
+                (trade_type, region_code),
+            )
+        ]
+
+    def comparable_amounts(
+        self,
+        trade_type: str,
+        region_code: str,
+        area_min: float,
+        area_max: float,
+        date_from: str,
+        date_to: str,
+    ) -> list[int]:
+        """같은 유형·시군구·면적대·기간의 거래금액(만원) 목록 (해제 거래 제외)"""
+        return [
+            r[0] for r in self._conn.execute(
+                "SELECT amount FROM trades WHERE trade_type = ? AND region_code = ? "
+                "AND area_m2 BETWEEN ? AND ? AND deal_date BETWEEN ? AND ? AND COALESCE(cancel_type, '') = ''",
+                (trade_type, region_code, area_min, area_max, date_from, date_to),
+            )
+        ]
+
+
+_store: HistoryStore | None = None
+
+
+def get_store() -> HistoryStore:
+    """프로세스 공용 저장소 (최초 사용 시 생성)"""
+    global _store
+    if _store is None:
+        _store = HistoryStore()
+    return _store
@@ -0,0 +1,108 @@
+"""
+MCP 도구 등록 manifest (지연 로딩용)
+
+stdio 세션마다 server.py가 새로 실행되므로 tools/* 모듈 import와 도구 등록(시그니처 → pydantic
+모델/JSON 스키마 생성)이 매 세션 시작 비용이 됩니다. 이 모듈은 등록 결과(tools/list 응답)를
+tools/manifest.json에 미리 저장해 두고, 서버는 manifest로 tools/list에 답한 뒤 도구가 처음
+호출될 때 해당 모듈만 import해 등록합니다.
+
+manifest에는 도구 모듈 소스의 해시(digest)를 함께 저장하며, 소스가 바뀌어 해시가 다르면
+manifest를 쓰지 않고 기존처럼 모든 모듈을 즉시 등록합니다.
+
+갱신:
+  python -m _tool_manifest            # tools/manifest.json 다시 생성
+  python -m _tool_manifest --check    # 최신이 아니면 exit 1
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import sys
+from typing import Any
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_PATH = os.path.join(_BASE_DIR, "tools", "manifest.json")
+
+# (모듈, 등록 함수) — server.py의 등록 순서
+TOOL_MODULES: tuple[tuple[str, str], ...] = (
+    ("tools.trade", "register_trade_tools"),
+    ("tools.rent", "register_rent_tools"),
+    ("tools.onbid", "register_onbid_tools"),
+    ("tools.onbid_watch", "register_onbid_watch_tools"),
+    ("tools.auction_history", "register_auction_history_tools"),
+    ("tools.region", "register_region_tools"),
+    ("tools.building_permit", "register_building_permit_tools"),
+    ("tools.comps", "register_comps_tools"),
+    ("tools.jeonse", "register_jeonse_tools"),
+    ("tools.nearby", "register_nearby_tools"),
+    ("tools.jobs", "register_jobs_tools"),
+)
+
+
+def source_digest() -> str:
+    """도구 모듈 소스 해시 (도구 이름/설명/시그니처가 바뀌면 달라짐)"""
+    h = hashlib.sha1()
+    for module, register in TOOL_MODULES:
+        path = os.path.join(_BASE_DIR, *module.split(".")) + ".py"
+        h.update(f"{module}:{register}\n".encode())
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def register_module(mcp, module: str) -> None:
+    register = dict(TOOL_MODULES)[module]
+    getattr(importlib.import_module(module), register)(mcp)
+
+
+def register_all(mcp) -> None:
+    for module, _ in TOOL_MODULES:
+        register_module(mcp, module)
+
+
+def load_manifest(path: str = MANIFEST_PATH) -> dict[str, Any] | None:
+    """최신 manifest. 없거나 소스와 해시가 다르면 None"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("digest") != source_digest():
+        return None
+    return manifest
+
+
+def build_manifest() -> dict[str, Any]:
+    """모든 도구 모듈을 실제로 등록해 tools/list 응답을 모듈별로 기록"""
+    import asyncio
+    from mcp.server.fastmcp import FastMCP
+
+    tools = []
+    for module, _ in TOOL_MODULES:
+        scratch = FastMCP(name="manifest")
+        register_module(scratch, module)
+        for tool in asyncio.run(scratch.list_tools()):
+            data = tool.model_dump(mode="json", by_alias=True, exclude_none=True)
+            tools.append({"module": module, **data})
+    return {"digest": source_digest(), "tools": tools}
+
+
+def main() -> None:
+    sys.path.insert(0, _BASE_DIR)
+    manifest = build_manifest()
+    if "--check" in sys.argv[1:]:
+        current = load_manifest()
+        if current != manifest:
+            print(f"{MANIFEST_PATH}가 최신이 아닙니다. python -m _tool_manifest 로 갱신하세요.")
+            sys.exit(1)
+        print("manifest 최신")
+        return
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+        f.write("\n")
+    print(f"{MANIFEST_PATH}: 도구 {len(manifest['tools'])}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+요청 처리 단계 추적 (span)
+
+HTTP 요청/MCP 도구 호출 1건을 trace로 보고, 그 안의 처리 단계를 span으로 기록합니다.
+  fetch(외부 API) → parse.xml / parse.json → parse.items(_parse_*) → summarize → serialize
+
+  - MCP_TRACE_FILE    : 설정 시 trace마다 OpenTelemetry OTLP/JSON 한 줄을 파일에 추가
+  - MCP_SERVER_TIMING : 1이면 HTTP 응답에 단계별 소요 시간 Server-Timing 헤더 추가 (디버그용)
+
+둘 다 설정되지 않으면 trace를 만들지 않으며 span()은 아무 일도 하지 않습니다.
+"""
+
+import json
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+TRACE_FILE = os.getenv("MCP_TRACE_FILE", "")
+SERVER_TIMING = os.getenv("MCP_SERVER_TIMING", "").lower() in ("1", "true", "yes")
+ENABLED = bool(TRACE_FILE or SERVER_TIMING)
+SERVICE_NAME = "korea-realestate-mcp"
+
+
+@dataclass
+class Span:
+    name: str
+    span_id: str
+    parent_id: str
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str = ""
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6 if self.end_ns else 0.0
+
+
+@dataclass
+class Trace:
+    trace_id: str
+    root: Span
+    spans: list[Span] = field(default_factory=list)
+
+
+_trace: ContextVar[Trace | None] = ContextVar("trace", default=None)
+_span: ContextVar[Span | None] = ContextVar("span", default=None)
+_file_lock = threading.Lock()
+
+
+def current_trace() -> Trace | None:
+    return _trace.get()
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Span | None]:
+    """현재 trace 안에서 하위 단계 span 기록. trace가 없으면 아무것도 하지 않음"""
+    trace = _trace.get()
+    if trace is None:
+        yield None
+        return
+    parent = _span.get() or trace.root
+    s = Span(name, secrets.token_hex(8), parent.span_id, time.time_ns(), attributes=attributes)
+    trace.spans.append(s)
+    token = _span.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.error = type(e).__name__
+        raise
+    finally:
+        s.end_ns = time.time_ns()
+        _span.reset(token)
+
+
+@contextmanager
+def start_trace(name: str, **attributes) -> Iterator[Trace | None]:
+    """
+    trace 시작 (HTTP 요청/MCP 도구 호출 단위). 이미 trace 안이면 하위 span으로 기록
+
+    종료 시 MCP_TRACE_FILE이 설정되어 있으면 OTLP/JSON으로 내보냅니다.
+    """
+    if not ENABLED:
+        yield None
+        return
+    if _trace.get() is not None:
+        with span(name, **attributes):
+            yield _trace.get()
+        return
+
+    root = Span(name, secrets.token_hex(8), "", time.time_ns(), attributes=attributes)
+    trace = Trace(secrets.token_hex(16), root)
+    trace_token = _trace.set(trace)
+    span_token = _span.set(root)
+    try:
+        yield trace
+    except BaseException as e:
+        root.error = type(e).__name__
+        raise
+    finally:
+        root.end_ns = time.time_ns()
+        _span.reset(span_token)
+        _trace.reset(trace_token)
+        if TRACE_FILE:
+            export_trace(trace, TRACE_FILE)
+
+
+def server_timing(trace: Trace) -> str:
+    """
+    Server-Timing 헤더 값. 같은 이름의 span은 합산하며, 응답 시작 시점까지 끝난 span만 포함
+
+    예: fetch;dur=412.3, parse.xml;dur=8.1, parse.items;dur=5.2, serialize;dur=1.4, total;dur=430.2
+    """
+    totals: dict[str, float] = {}
+    for s in trace.spans:
+        if s.end_ns:
+            totals[s.name] = totals.get(s.name, 0.0) + s.duration_ms
+    parts = [f"{name};dur={ms:.1f}" for name, ms in totals.items()]
+    parts.append(f"total;dur={(time.time_ns() - trace.root.start_ns) / 1e6:.1f}")
+    return ", ".join(parts)
+
+
+# ── OTLP/JSON 내보내기 ───────────────────────────────────────────────────────
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(trace: Trace, s: Span, kind: int) -> dict:
+    data = {
+        "traceId": trace.trace_id,
+        "spanId": s.span_id,
+        "name": s.name,
+        "kind": kind,
+        "startTimeUnixNano": str(s.start_ns),
+        "endTimeUnixNano": str(s.end_ns or s.start_ns),
+        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+        "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+    }
+    if s.parent_id:
+        data["parentSpanId"] = s.parent_id
+    return data
+
+
+def to_otlp(trace: Trace) -> dict:
+    """OpenTelemetry OTLP/JSON (ExportTraceServiceRequest) 형식"""
+    spans = [_otlp_span(trace, trace.root, 2)] + [_otlp_span(trace, s, 1) for s in trace.spans]
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "realestate"}, "spans": spans}],
+        }]
+    }
+
+
+def export_trace(trace: Trace, path: str) -> None:
+    line = json.dumps(to_otlp(trace), ensure_ascii=False, separators=(",", ":"))
+    try:
+        with _file_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    except OSError:
+        pass
@@ -0,0 +1 @@
+# bench 패키지 (성능 측정 스크립트)
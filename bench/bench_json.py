@@ -0,0 +1,99 @@
+"""
+JSON 직렬화 벤치마크
+
+실제 /api/trades 응답과 같은 모양의 아파트 매매 payload(기본 1000건)를
+직렬화기별로 인코딩해 1회 평균 시간과 본문 크기를 비교합니다.
+
+  - starlette : starlette JSONResponse.render (json.dumps, ensure_ascii=False)
+  - json      : _serialize 표준 json 경로
+  - orjson    : _serialize orjson 경로 (설치 시)
+  - cached    : 캐시 적중 시 미리 직렬화된 bytes 재사용 (인코딩 생략)
+
+사용법:
+  python -m bench.bench_json [--rows 1000] [--repeat 50]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _serialize import SERIALIZERS  # noqa: E402
+
+_APT_NAMES = ["은마", "래미안대치팰리스", "대치아이파크", "도곡렉슬", "타워팰리스1", "개포자이프레지던스", "역삼푸르지오"]
+_DONGS = ["대치동", "도곡동", "개포동", "역삼동", "삼성동"]
+
+
+def make_trade_payload(rows: int = 1000, seed: int = 0) -> dict:
+    """run_molit_tool(아파트 매매) 결과와 같은 구조의 합성 payload"""
+    rnd = random.Random(seed)
+    items = []
+    for _ in range(rows):
+        amount = rnd.randrange(50000, 600000, 50)
+        items.append({
+            "apt_name": rnd.choice(_APT_NAMES),
+            "amount": amount,
+            "amount_raw": f"{amount:,}",
+            "area_m2": f"{rnd.choice([59.9, 76.79, 84.97, 114.8, 135.1]):.2f}",
+            "floor": str(rnd.randint(1, 35)),
+            "build_year": str(rnd.randint(1979, 2023)),
+            "dong": rnd.choice(_DONGS),
+            "jibun": f"{rnd.randint(1, 999)}",
+            "deal_date": f"2025-01-{rnd.randint(1, 28):02d}",
+            "deal_type": rnd.choice(["중개거래", "직거래"]),
+            "agent_location": "서울 강남구",
+        })
+    amounts = sorted(i["amount"] for i in items)
+    return {
+        "total_count": rows,
+        "returned_count": rows,
+        "region_code": "11680",
+        "year_month": "202501",
+        "items": items,
+        "price_summary_만원": {
+            "median": amounts[len(amounts) // 2],
+            "min": amounts[0],
+            "max": amounts[-1],
+            "count": rows,
+        },
+    }
+
+
+def run(rows: int, repeat: int) -> list[tuple[str, float, int]]:
+    payload = make_trade_payload(rows)
+    candidates = dict(SERIALIZERS)
+    try:
+        from starlette.responses import JSONResponse
+        candidates["starlette"] = JSONResponse(None).render
+    except ImportError:
+        pass
+    fastest = min(candidates, key=lambda n: timeit.timeit(lambda: candidates[n](payload), number=3))
+    cached_body = candidates[fastest](payload)
+    candidates["cached"] = lambda _payload: cached_body
+
+    results = []
+    for name, fn in candidates.items():
+        seconds = timeit.timeit(lambda: fn(payload), number=repeat) / repeat
+        results.append((name, seconds, len(fn(payload))))
+    return sorted(results, key=lambda r: r[1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    results = run(args.rows, args.repeat)
+    baseline = next((r[1] for r in results if r[0] == "starlette"), results[-1][1])
+    print(f"payload: 아파트 매매 {args.rows}건, repeat={args.repeat}")
+    print(f"{'serializer':<10} {'ms/encode':>10} {'bytes':>10} {'vs starlette':>13}")
+    for name, seconds, size in results:
+        print(f"{name:<10} {seconds * 1000:>10.3f} {size:>10,} {baseline / seconds:>12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+파서 마이크로벤치마크 + 성능 회귀 검사
+
+tools/trade.py, tools/rent.py, tools/building_permit.py, tools/onbid.py의 _parse_* 함수
+16개를 합성 코퍼스(bench.fixtures)로 측정합니다.
+
+  - 코퍼스: 스키마별 1k / 10k / 100k 건 (--sizes). 실거래 XML은 한글 태그(구 API) 변형도 측정
+  - items/sec : repeat회 중 최고 처리량 (코퍼스 생성/XML 파싱 시간은 제외, 파서 루프만)
+  - alloc     : tracemalloc 기준 1건당 할당 블록 수, 1k건당 최대 메모리(KiB)
+  - 기준값 비교: --check 시 bench/parser_baseline.json 대비 처리량이 threshold 이상 떨어지면 exit 1
+
+기계 성능 차이를 줄이기 위해 순수 파이썬 보정 루프의 처리량(calibration)을 함께 저장하고,
+비교할 때는 (items/sec ÷ calibration) 비율로 판단합니다.
+
+사용법:
+  python -m bench.bench_parsers [--sizes 1000,10000] [--only apt_trade,basis] [--repeat 3]
+  python -m bench.bench_parsers --save-baseline          # 기준값 갱신
+  python -m bench.bench_parsers --check --threshold 0.2   # 20% 넘게 느려지면 실패
+  python -m bench.bench_parsers --write-corpus /tmp/corpus --sizes 100000
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench import fixtures  # noqa: E402
+from tools.building_permit import _parse_basis, _parse_hstp, _parse_jijigu, _parse_pklot, _parse_platplc  # noqa: E402
+from tools.onbid import _parse_onbid_bid_result, _parse_onbid_thing_info  # noqa: E402
+from tools.rent import _parse_apt_rent, _parse_officetel_rent, _parse_single_house_rent, _parse_villa_rent  # noqa: E402
+from tools.trade import (  # noqa: E402
+    _parse_apt_trades,
+    _parse_commercial_trades,
+    _parse_officetel_trades,
+    _parse_single_house_trades,
+    _parse_villa_trades,
+)
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "parser_baseline.json")
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+# 이름 → (파서, 입력 종류, 스키마/오퍼레이션)
+PARSERS: dict[str, tuple[Callable, str, str]] = {
+    "apt_trade":        (_parse_apt_trades,          "xml",   "apt_trade"),
+    "offi_trade":       (_parse_officetel_trades,    "xml",   "offi_trade"),
+    "villa_trade":      (_parse_villa_trades,        "xml",   "villa_trade"),
+    "house_trade":      (_parse_single_house_trades, "xml",   "house_trade"),
+    "commercial_trade": (_parse_commercial_trades,   "xml",   "commercial_trade"),
+    "apt_rent":         (_parse_apt_rent,            "xml",   "apt_rent"),
+    "offi_rent":        (_parse_officetel_rent,      "xml",   "offi_rent"),
+    "villa_rent":       (_parse_villa_rent,          "xml",   "villa_rent"),
+    "house_rent":       (_parse_single_house_rent,   "xml",   "house_rent"),
+    "basis":            (_parse_basis,               "arch",  "getApBasisOulnInfo"),
+    "parking":          (_parse_pklot,               "arch",  "getApPklotInfo"),
+    "zone":             (_parse_jijigu,              "arch",  "getApJijiguInfo"),
+    "location":         (_parse_platplc,             "arch",  "getApPlatPlcInfo"),
+    "housing":          (_parse_hstp,                "arch",  "getApHsTpInfo"),
+    "onbid_bid_result": (_parse_onbid_bid_result,    "onbid", "getOnbidBidResultList"),
+    "onbid_thing_info": (_parse_onbid_thing_info,    "onbid", "getOnbidThingInfoList"),
+}
+
+
+# ── 코퍼스 ────────────────────────────────────────────────────────────────────
+
+def make_corpus(kind: str, schema: str, size: int, legacy: bool = False) -> Any:
+    """파서 입력 그대로의 코퍼스 (XML은 <item> Element 목록, JSON은 dict)"""
+    if kind == "xml":
+        return fixtures.molit_item_elements(schema, size, seed=size, legacy=legacy)
+    if kind == "arch":
+        return fixtures.arch_pms_items(schema, size, seed=size)
+    return fixtures.json_body(fixtures.onbid_items(schema, size, seed=size), size)
+
+
+def write_corpus(out_dir: str, sizes: list[int], names: list[str]) -> list[str]:
+    """원문 XML/JSON 코퍼스를 파일로 저장 (가짜 서버 --fixtures 등에서 재사용)"""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for name in names:
+        _, kind, schema = PARSERS[name]
+        for size in sizes:
+            for legacy in ((False, True) if kind == "xml" else (False,)):
+                suffix = "_legacy" if legacy else ""
+                if kind == "xml":
+                    data = fixtures.molit_xml(fixtures.molit_items(schema, size, seed=size, legacy=legacy), size)
+                    path = os.path.join(out_dir, f"{name}_{size}{suffix}.xml")
+                    with open(path, "w", encoding="utf-8") as f:
+                        f.write(data)
+                else:
+                    items = (fixtures.arch_pms_items(schema, size, seed=size) if kind == "arch"
+                             else fixtures.onbid_items(schema, size, seed=size))
+                    path = os.path.join(out_dir, f"{name}_{size}.json")
+                    with open(path, "wb") as f:
+                        f.write(fixtures.dumps(fixtures.json_body(items, size)))
+                paths.append(path)
+    return paths
+
+
+# ── 측정 ──────────────────────────────────────────────────────────────────────
+
+def calibrate(loops: int = 200_000) -> float:
+    """기계 속도 보정용 순수 파이썬 루프 처리량 (dict 생성/문자열 처리, 파서와 비슷한 작업)"""
+    best = 0.0
+    for _ in range(3):
+        started = time.perf_counter()
+        out = []
+        for i in range(loops):
+            s = str(i)
+            out.append({"a": s.strip(), "b": s.replace("1", ""), "c": int(s) if s else None})
+        best = max(best, loops / (time.perf_counter() - started))
+    return best
+
+
+def measure(parser: Callable, corpus: Any, size: int, repeat: int) -> dict:
+    gc.collect()
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = parser(corpus)
+        best = min(best, time.perf_counter() - started)
+        if len(result) != size:
+            raise AssertionError(f"{parser.__name__}: {len(result)}건 파싱 (기대 {size}건)")
+        del result
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = parser(corpus)
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    del result
+
+    return {
+        "items_per_sec": round(size / best),
+        "blocks_per_item": round(blocks / size, 1),
+        "peak_kib_per_1k": round(peak / 1024 / size * 1000, 1),
+    }
+
+
+def run(names: list[str], sizes: list[int], repeat: int) -> dict[str, dict]:
+    results: dict[str, dict] = {}
+    for name in names:
+        parser, kind, schema = PARSERS[name]
+        for size in sizes:
+            for legacy in ((False, True) if kind == "xml" else (False,)):
+                corpus = make_corpus(kind, schema, size, legacy)
+                key = f"{name}:{size}" + (":legacy" if legacy else "")
+                results[key] = measure(parser, corpus, size, repeat)
+                del corpus
+    return results
+
+
+def compare(results: dict[str, dict], calibration: float, baseline: dict, threshold: float) -> list[str]:
+    """기준값 대비 보정 처리량이 threshold 이상 떨어진 항목 목록"""
+    regressions = []
+    base_cal = baseline.get("calibration") or calibration
+    for key, r in results.items():
+        base = baseline.get("results", {}).get(key)
+        if not base:
+            continue
+        ratio = (r["items_per_sec"] / calibration) / (base["items_per_sec"] / base_cal)
+        r["vs_baseline"] = round(ratio, 3)
+        if ratio < 1 - threshold:
+            regressions.append(f"{key}: 기준 대비 {ratio:.0%} ({r['items_per_sec']:,} items/s)")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES))
+    parser.add_argument("--only", default="", help="쉼표 구분 파서 이름 (기본: 전체)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="기준값 대비 회귀 시 exit 1")
+    parser.add_argument("--threshold", type=float, default=0.2, help="허용 처리량 감소율 (기본 0.2 = 20%%)")
+    parser.add_argument("--write-corpus", default="", help="코퍼스 원문을 이 디렉터리에 저장하고 종료")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    names = [n.strip() for n in args.only.split(",") if n.strip()] or list(PARSERS)
+    unknown = [n for n in names if n not in PARSERS]
+    if unknown:
+        raise SystemExit(f"알 수 없는 파서: {unknown} (가능: {list(PARSERS)})")
+
+    if args.write_corpus:
+        for path in write_corpus(args.write_corpus, sizes, names):
+            print(path)
+        return
+
+    calibration = calibrate()
+    results = run(names, sizes, args.repeat)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    regressions = compare(results, calibration, baseline, args.threshold) if baseline else []
+
+    print(f"calibration: {calibration:,.0f} loops/s")
+    print(f"{'parser:size':<32} {'items/s':>12} {'blocks/item':>12} {'KiB/1k':>8} {'vs base':>8}")
+    for key, r in results.items():
+        vs = f"{r['vs_baseline']:.2f}" if "vs_baseline" in r else "-"
+        print(f"{key:<32} {r['items_per_sec']:>12,} {r['blocks_per_item']:>12} {r['peak_kib_per_1k']:>8} {vs:>8}")
+
+    if args.save_baseline:
+        merged = {**baseline.get("results", {}), **{k: {"items_per_sec": v["items_per_sec"]} for k, v in results.items()}}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"calibration": round(calibration), "results": merged}, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"기준값 저장: {args.baseline}")
+
+    if regressions:
+        print(f"\n성능 회귀 {len(regressions)}건 (허용 {args.threshold:.0%}):")
+        for line in regressions:
+            print(f"  - {line}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
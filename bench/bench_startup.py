@@ -0,0 +1,154 @@
+"""
+stdio MCP 세션 기동 시간 측정 + import 시간 예산 검사
+
+에이전트 세션마다 server.py가 새로 실행되므로 기동 시간이 곧 첫 응답 지연입니다.
+
+  - import 프로파일: python -X importtime -c "import server" 결과에서
+      server 전체 / 외부 패키지(mcp, dotenv ...) / 프로젝트 모듈(server, _*, tools.*, data.*) 자기 시간 합
+  - 첫 도구 응답 : server.py를 stdio로 띄우고 initialize → tools/list → tools/call
+                    (get_current_year_month_tool, 외부 API 호출 없음)까지 걸린 시간
+  - 예산 검사    : --check 시 프로젝트 모듈 import 시간이 --budget-ms를 넘거나,
+                    시작 시 도구 모듈(tools.*)이 import되면 exit 1
+
+mcp 패키지 자체 import(수백 ms)는 프로젝트에서 줄일 수 없으므로 예산에서 제외하고 따로 표시합니다.
+
+사용법:
+  python -m bench.bench_startup [--repeat 5] [--check] [--budget-ms 20]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET_MS = 20.0
+
+
+# ── import 프로파일 ───────────────────────────────────────────────────────────
+
+def _is_project(module: str) -> bool:
+    """저장소 루트의 모듈/패키지(server, _helpers, tools.*, data.* ...)인지"""
+    top = module.split(".", 1)[0]
+    return os.path.isfile(os.path.join(ROOT, f"{top}.py")) or os.path.isfile(os.path.join(ROOT, top, "__init__.py"))
+
+
+def import_profile() -> dict:
+    """-X importtime 결과 파싱 → {"server_ms", "project_ms", "modules": {name: (self_ms, cumulative_ms)}}"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import server"],
+        cwd=ROOT, capture_output=True, text=True, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+    modules: dict[str, tuple[float, float]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|").split("|"))
+        modules[name] = (int(self_us) / 1000, int(cumulative_us) / 1000)
+    project = {name: v for name, v in modules.items() if _is_project(name)}
+    return {
+        "server_ms": modules.get("server", (0.0, 0.0))[1],
+        "mcp_ms": modules.get("mcp", (0.0, 0.0))[1],
+        "project_ms": sum(self_ms for self_ms, _ in project.values()),
+        "project_modules": sorted(project),
+        "modules": modules,
+    }
+
+
+# ── 첫 도구 응답 ─────────────────────────────────────────────────────────────
+
+def _rpc(proc: subprocess.Popen, message: dict, wait_id: int | None = None) -> dict | None:
+    proc.stdin.write(json.dumps(message) + "\n")
+    proc.stdin.flush()
+    if wait_id is None:
+        return None
+    while True:
+        line = proc.stdout.readline()
+        if not line:
+            raise RuntimeError("server.py가 응답 없이 종료되었습니다.")
+        data = json.loads(line)
+        if data.get("id") == wait_id:
+            return data
+
+
+def first_tool_response() -> dict:
+    """프로세스 생성부터 initialize / tools/list / 첫 tools/call 응답까지 경과 시간 (ms)"""
+    env = {**os.environ, "MCP_TRANSPORT": "stdio", "PYTHONDONTWRITEBYTECODE": "1"}
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "server.py")], cwd=ROOT, env=env, text=True,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    try:
+        _rpc(proc, {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {
+            "protocolVersion": "2025-06-18", "capabilities": {},
+            "clientInfo": {"name": "bench_startup", "version": "0"},
+        }}, wait_id=1)
+        initialized = time.perf_counter()
+        _rpc(proc, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        tools = _rpc(proc, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"}, wait_id=2)
+        listed = time.perf_counter()
+        result = _rpc(proc, {"jsonrpc": "2.0", "id": 3, "method": "tools/call", "params": {
+            "name": "get_current_year_month_tool", "arguments": {},
+        }}, wait_id=3)
+        called = time.perf_counter()
+        if "error" in result or result["result"].get("isError"):
+            raise RuntimeError(f"tools/call 실패: {result}")
+    finally:
+        proc.stdin.close()
+        proc.terminate()
+        proc.wait()
+    return {
+        "initialize_ms": (initialized - started) * 1000,
+        "tools_list_ms": (listed - started) * 1000,
+        "first_call_ms": (called - started) * 1000,
+        "tool_count": len(tools["result"]["tools"]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="프로젝트 모듈 import 시간 예산 (기본 %(default)s ms)")
+    parser.add_argument("--check", action="store_true", help="예산 초과 시 exit 1")
+    parser.add_argument("--top", type=int, default=10, help="가장 느린 프로젝트 모듈 N개 표시")
+    args = parser.parse_args()
+
+    profiles = [import_profile() for _ in range(args.repeat)]
+    runs = [first_tool_response() for _ in range(args.repeat)]
+    median = statistics.median
+
+    project_ms = median(p["project_ms"] for p in profiles)
+    print(f"import server        : {median(p['server_ms'] for p in profiles):8.1f} ms")
+    print(f"  mcp 패키지         : {median(p['mcp_ms'] for p in profiles):8.1f} ms")
+    print(f"  프로젝트 모듈      : {project_ms:8.1f} ms  (예산 {args.budget_ms:.0f} ms)")
+    last = profiles[-1]
+    slowest = sorted(last["project_modules"], key=lambda m: last["modules"][m][0], reverse=True)[:args.top]
+    for name in slowest:
+        print(f"    {name:<24} {last['modules'][name][0]:8.2f} ms")
+    print(f"initialize 응답      : {median(r['initialize_ms'] for r in runs):8.1f} ms")
+    print(f"tools/list 응답      : {median(r['tools_list_ms'] for r in runs):8.1f} ms  (도구 {runs[-1]['tool_count']}개)")
+    print(f"첫 tools/call 응답   : {median(r['first_call_ms'] for r in runs):8.1f} ms")
+
+    failures = []
+    if project_ms > args.budget_ms:
+        failures.append(f"프로젝트 모듈 import {project_ms:.1f} ms > 예산 {args.budget_ms:.0f} ms")
+    eager = [m for m in last["project_modules"] if m.startswith("tools.")]
+    if eager:
+        failures.append(f"시작 시 도구 모듈 import됨 (manifest 갱신 필요?: python -m _tool_manifest): {eager}")
+    if failures:
+        print("\n예산 초과:")
+        for line in failures:
+            print(f"  - {line}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
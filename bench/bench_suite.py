@@ -0,0 +1,229 @@
+"""
+오프라인 벤치마크 모음 (가짜 data.go.kr 서버 사용)
+
+bench.fake_server를 로컬 스레드로 띄우고 DATA_GO_KR_BASE_URL을 그쪽으로 돌린 뒤
+주요 경로의 지연 시간/처리량을 측정합니다. 실제 API 할당량을 쓰지 않습니다.
+
+  - run_molit_tool          : 실거래 1페이지 조회 + 파싱 + 요약
+  - enrich_with_complex_info: 단지 목록 + 상세 병렬 조회 + 이름 매칭
+  - mcp_tool                : MCP 도구 호출 (get_apartment_trades, FastMCP call_tool 경유)
+  - http /api/*             : HTTP 앱(server.create_http_app)에 동시 요청 부하 생성
+
+사용법:
+  python -m bench.bench_suite [--only run_molit_tool,http] [--iterations 50]
+                              [--concurrency 16] [--requests 500] [--latency-ms 30]
+                              [--cache] [--json results.json]
+
+--cache를 주지 않으면 MCP_CACHE_TTL=0(캐시 비활성)으로 외부 호출 경로 전체를 측정합니다.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.fake_server import FakeConfig, create_app  # noqa: E402
+
+BENCHMARKS = ("run_molit_tool", "enrich_with_complex_info", "mcp_tool", "http")
+HTTP_PATHS = (
+    "/api/trades?type=apt&region_code=11680&year_month=202501&rows=100",
+    "/api/rent?type=apt&region_code=11680&year_month=202501&rows=100",
+    "/api/trades?type=apt&region_code=11680&year_month=202501&rows=500&sort=-amount&limit=20",
+    "/api/building?type=basis&sigungu_cd=11680&bjdong_cd=10300&rows=50",
+)
+
+
+# ── 서버 실행 ─────────────────────────────────────────────────────────────────
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve_in_thread(app, port: int):
+    """uvicorn을 데몬 스레드로 실행하고 기동 완료까지 대기"""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.time() + 10
+    while not server.started:
+        if time.time() > deadline:
+            raise RuntimeError(f"서버 기동 실패 (port {port})")
+        time.sleep(0.01)
+    return server
+
+
+# ── 측정 헬퍼 ─────────────────────────────────────────────────────────────────
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(name: str, latencies: list[float], elapsed: float, errors: int = 0) -> dict:
+    values = sorted(latencies)
+    return {
+        "name": name,
+        "count": len(values),
+        "errors": errors,
+        "ops_per_sec": round(len(values) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(values) * 1000, 2) if values else 0.0,
+        "p50_ms": round(_percentile(values, 0.50) * 1000, 2),
+        "p95_ms": round(_percentile(values, 0.95) * 1000, 2),
+        "p99_ms": round(_percentile(values, 0.99) * 1000, 2),
+    }
+
+
+async def _timed_sequential(name: str, iterations: int, fn) -> dict:
+    latencies, errors = [], 0
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        result = await fn(i)
+        latencies.append(time.perf_counter() - t0)
+        if isinstance(result, dict) and "error" in result:
+            errors += 1
+    return summarize(name, latencies, time.perf_counter() - started, errors)
+
+
+# ── 벤치마크 ──────────────────────────────────────────────────────────────────
+
+async def bench_run_molit_tool(iterations: int) -> dict:
+    from _helpers import APT_TRADE_URL, run_molit_tool
+    from tools.trade import _parse_apt_trades
+
+    async def call(i: int):
+        return await run_molit_tool(APT_TRADE_URL, "11680", "202501", 1000, _parse_apt_trades, "아파트 매매")
+
+    return await _timed_sequential("run_molit_tool (1000 rows)", iterations, call)
+
+
+async def bench_enrich(iterations: int) -> dict:
+    from tools.complex import enrich_with_complex_info
+    from bench.fixtures import _APT_NAMES
+
+    async def call(i: int):
+        complex_map, error = await enrich_with_complex_info("11680", list(_APT_NAMES))
+        return {"error": error} if error else complex_map
+
+    return await _timed_sequential("enrich_with_complex_info", iterations, call)
+
+
+async def bench_mcp_tool(iterations: int) -> dict:
+    import server
+
+    async def call(i: int):
+        return await server.mcp.call_tool(
+            "get_apartment_trades", {"region_code": "11680", "year_month": "202501", "num_of_rows": 100},
+        )
+
+    return await _timed_sequential("mcp get_apartment_trades", iterations, call)
+
+
+async def load_generate(base_url: str, paths: list[str], concurrency: int, total: int) -> dict:
+    """concurrency개 워커가 paths를 번갈아 총 total건 요청"""
+    import httpx
+
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker(client) -> None:
+        nonlocal errors
+        for i in counter:
+            t0 = time.perf_counter()
+            try:
+                resp = await client.get(paths[i % len(paths)], headers={"Accept-Encoding": "gzip"})
+                if resp.status_code >= 400 or b'"error"' in resp.content[:200]:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - t0)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*[worker(client) for _ in range(concurrency)])
+        elapsed = time.perf_counter() - started
+    return summarize(f"http /api/* (c={concurrency})", latencies, elapsed, errors)
+
+
+def bench_http(concurrency: int, total: int) -> dict:
+    import server
+
+    port = _free_port()
+    app_server = serve_in_thread(server.create_http_app(), port)
+    try:
+        return asyncio.run(load_generate(f"http://127.0.0.1:{port}", list(HTTP_PATHS), concurrency, total))
+    finally:
+        app_server.should_exit = True
+
+
+# ── 실행 ─────────────────────────────────────────────────────────────────────
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--only", default=",".join(BENCHMARKS))
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=30.0, help="가짜 서버 응답 지연")
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rows", type=int, default=1000, help="가짜 서버 월별 건수")
+    parser.add_argument("--cache", action="store_true", help="응답 캐시 사용 (기본: 비활성)")
+    parser.add_argument("--json", default="", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+    selected = [b.strip() for b in args.only.split(",") if b.strip()]
+
+    fake_port = _free_port()
+    fake = FakeConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                      error_rate=args.error_rate, rows=args.rows)
+    fake_server = serve_in_thread(create_app(fake), fake_port)
+
+    # 프로젝트 모듈은 환경 변수를 import 시점에 읽으므로 반드시 이 뒤에서 import
+    os.environ["DATA_GO_KR_BASE_URL"] = f"http://127.0.0.1:{fake_port}"
+    os.environ.setdefault("DATA_GO_KR_API_KEY", "bench")
+    if not args.cache:
+        os.environ["MCP_CACHE_TTL"] = "0"
+
+    results = []
+    try:
+        logging.getLogger("httpx").setLevel(logging.WARNING)   # 요청마다 찍히는 httpx 로그 억제
+        if "run_molit_tool" in selected:
+            results.append(asyncio.run(bench_run_molit_tool(args.iterations)))
+        if "enrich_with_complex_info" in selected:
+            results.append(asyncio.run(bench_enrich(args.iterations)))
+        if "mcp_tool" in selected:
+            results.append(asyncio.run(bench_mcp_tool(args.iterations)))
+        if "http" in selected:
+            results.append(bench_http(args.concurrency, args.requests))
+    finally:
+        fake_server.should_exit = True
+
+    print(f"fake server: latency={args.latency_ms}±{args.jitter_ms}ms, rows={args.rows}, "
+          f"cache={'on' if args.cache else 'off'}, upstream calls={sum(fake.stats.values())}")
+    print(f"{'benchmark':<32} {'count':>6} {'err':>4} {'ops/s':>8} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for r in results:
+        print(f"{r['name']:<32} {r['count']:>6} {r['errors']:>4} {r['ops_per_sec']:>8} "
+              f"{r['mean_ms']:>8} {r['p50_ms']:>8} {r['p95_ms']:>8} {r['p99_ms']:>8}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+로컬 가짜 data.go.kr 서버
+
+_helpers.py와 tools/complex.py가 호출하는 모든 엔드포인트를 흉내 냅니다.
+실제 API 할당량을 쓰지 않고 부하 테스트/벤치마크를 돌리기 위한 용도입니다.
+
+  - 국토교통부 실거래 9종 (XML, numOfRows/pageNo 페이지 처리)
+  - 건축인허가 5종, 온비드 2종, 단지 목록/상세 (JSON)
+  - --fixtures 디렉터리에 <오퍼레이션명>.xml|.json 이 있으면 그 내용을 그대로 재생
+    (record 하위 명령으로 실제 API 응답을 한 번 저장해 둘 수 있음)
+  - 지연(--latency-ms, --jitter-ms), HTTP 오류율(--error-rate), 응답 지연으로 인한
+    타임아웃(--hang-rate), 오류 resultCode(--result-code, --result-code-rate) 주입
+
+사용법:
+  python -m bench.fake_server --port 8900 --latency-ms 80 --jitter-ms 40 --error-rate 0.01
+  DATA_GO_KR_BASE_URL=http://127.0.0.1:8900 DATA_GO_KR_API_KEY=bench MCP_TRANSPORT=http python server.py
+
+  # 실제 응답 녹화 (DATA_GO_KR_API_KEY 필요)
+  python -m bench.fake_server record --out bench/fixtures_recorded --region 11680 --year-month 202501
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench import fixtures  # noqa: E402
+
+_ERROR_MESSAGES = {
+    "03": "NODATA_ERROR",
+    "22": "LIMITED NUMBER OF SERVICE REQUESTS EXCEEDS ERROR.",
+    "30": "SERVICE KEY IS NOT REGISTERED ERROR.",
+    "99": "UNKNOWN ERROR",
+}
+
+
+@dataclass
+class FakeConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0           # HTTP 500/503 응답 비율
+    hang_rate: float = 0.0            # hang_seconds 동안 응답하지 않는 비율 (클라이언트 타임아웃 유도)
+    hang_seconds: float = 35.0
+    result_code: str = "22"           # 주입할 오류 resultCode
+    result_code_rate: float = 0.0
+    rows: int = 500                   # 실거래 월별/건축인허가/온비드 전체 건수
+    complexes: int = 0                # 단지 목록 건수 (0이면 기본 단지명 목록)
+    seed: int = 0
+    fixtures_dir: str = ""
+    stats: Counter = field(default_factory=Counter)
+
+
+def _page_params(request: Request, default_rows: int = 10) -> tuple[int, int]:
+    p = request.query_params
+    try:
+        return max(1, int(p.get("numOfRows", default_rows))), max(1, int(p.get("pageNo", "1")))
+    except ValueError:
+        return default_rows, 1
+
+
+def _page_range(total: int, num_of_rows: int, page_no: int) -> tuple[int, int]:
+    start = (page_no - 1) * num_of_rows
+    return start, max(0, min(total, start + num_of_rows) - start)
+
+
+def _recorded(config: FakeConfig, operation: str) -> Response | None:
+    if not config.fixtures_dir:
+        return None
+    for ext, media_type in (("xml", "application/xml"), ("json", "application/json")):
+        path = os.path.join(config.fixtures_dir, f"{operation}.{ext}")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return Response(f.read(), media_type=media_type)
+    return None
+
+
+def _region_seed(config: FakeConfig, *parts: str) -> int:
+    return config.seed + sum(ord(c) for c in "".join(parts))
+
+
+def create_app(config: FakeConfig) -> Starlette:
+    rnd = random.Random(config.seed)
+
+    async def handle(request: Request) -> Response:
+        operation = request.path_params["path"].rstrip("/").rsplit("/", 1)[-1]
+        config.stats[operation] += 1
+        p = request.query_params
+
+        delay = config.latency_ms + (rnd.uniform(-1, 1) * config.jitter_ms if config.jitter_ms else 0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if config.hang_rate and rnd.random() < config.hang_rate:
+            config.stats["_hang"] += 1
+            await asyncio.sleep(config.hang_seconds)
+        if config.error_rate and rnd.random() < config.error_rate:
+            config.stats["_http_error"] += 1
+            return Response("Service Unavailable", status_code=rnd.choice([500, 503]))
+
+        recorded = _recorded(config, operation)
+        if recorded is not None:
+            return recorded
+
+        error_code = ""
+        if config.result_code_rate and rnd.random() < config.result_code_rate:
+            config.stats["_result_code"] += 1
+            error_code = config.result_code
+        num_of_rows, page_no = _page_params(request)
+
+        if operation in fixtures.MOLIT_OPERATIONS:
+            if error_code:
+                xml = fixtures.molit_xml([], 0, error_code, _ERROR_MESSAGES.get(error_code, "ERROR"))
+                return Response(xml, media_type="application/xml")
+            start, count = _page_range(config.rows, num_of_rows, page_no)
+            seed = _region_seed(config, p.get("LAWD_CD", ""), p.get("DEAL_YMD", ""), operation)
+            items = fixtures.molit_items(fixtures.MOLIT_OPERATIONS[operation], count, seed, offset=start)
+            xml = fixtures.molit_xml(items, config.rows, page_no=page_no, num_of_rows=num_of_rows)
+            return Response(xml, media_type="application/xml")
+
+        if error_code:
+            return JSONResponse(fixtures.json_body([], 0, error_code, _ERROR_MESSAGES.get(error_code, "ERROR")))
+
+        if operation in fixtures.ARCH_PMS_FIELDS:
+            start, count = _page_range(config.rows, num_of_rows, page_no)
+            seed = _region_seed(config, p.get("sigunguCd", ""), p.get("bjdongCd", ""), operation)
+            items = fixtures.arch_pms_items(operation, count, seed, offset=start)
+            return JSONResponse(fixtures.json_body(items, config.rows, page_no=page_no, num_of_rows=num_of_rows))
+
+        if operation in ("getOnbidBidResultList", "getOnbidThingInfoList"):
+            start, count = _page_range(config.rows, num_of_rows, page_no)
+            items = fixtures.onbid_items(operation, count, config.seed, offset=start)
+            return JSONResponse(fixtures.json_body(items, config.rows, page_no=page_no, num_of_rows=num_of_rows))
+
+        if operation == "getSigunguAptList3":
+            all_items = fixtures.complex_list_items(p.get("sigunguCode", "11680"), config.complexes)
+            start, count = _page_range(len(all_items), num_of_rows, page_no)
+            body = fixtures.json_body([], len(all_items))
+            body["response"]["body"]["items"] = all_items[start:start + count]
+            return JSONResponse(body)
+
+        if operation == "getAphusBassInfoV4":
+            body = fixtures.json_body([], 1)
+            body["response"]["body"]["item"] = fixtures.complex_detail_item(p.get("kaptCode", ""))
+            return JSONResponse(body)
+
+        return JSONResponse({"error": f"unknown operation: {operation}"}, status_code=404)
+
+    async def stats(request: Request) -> Response:
+        return JSONResponse(dict(config.stats))
+
+    return Starlette(routes=[
+        Route("/_fake/stats", stats),
+        Route("/{path:path}", handle),
+    ])
+
+
+# ── 실제 응답 녹화 ───────────────────────────────────────────────────────────
+
+async def record_fixtures(out_dir: str, region_code: str, year_month: str, bjdong_cd: str) -> list[str]:
+    """실제 API를 엔드포인트마다 한 번씩 호출해 <오퍼레이션명>.xml|.json 으로 저장"""
+    import httpx
+    import _helpers
+    from tools import complex as complex_api
+
+    if not _helpers.API_KEY:
+        raise SystemExit("DATA_GO_KR_API_KEY가 필요합니다.")
+    os.makedirs(out_dir, exist_ok=True)
+
+    targets: list[tuple[str, dict, str]] = []
+    for name in dir(_helpers):
+        url = getattr(_helpers, name)
+        if not name.endswith("_URL") or not isinstance(url, str):
+            continue
+        if "RTMSDataSvc" in url:
+            targets.append((url, {"LAWD_CD": region_code, "DEAL_YMD": year_month, "numOfRows": "100"}, "xml"))
+        elif "ArchPmsHubService" in url:
+            targets.append((url, {"sigunguCd": region_code, "bjdongCd": bjdong_cd, "_type": "json",
+                                  "numOfRows": "100"}, "json"))
+        elif "OnbidService" in url:
+            targets.append((url, {"numOfRows": "100", "_type": "json"}, "json"))
+    targets.append((complex_api.LIST_URL, {"sigunguCode": region_code, "numOfRows": "100"}, "json"))
+
+    saved = []
+    async with httpx.AsyncClient(timeout=30) as client:
+        for url, params, ext in targets:
+            key = _helpers.ONBID_API_KEY if "OnbidService" in url else _helpers.API_KEY
+            resp = await client.get(_helpers._build_url(url, key, params))
+            path = os.path.join(out_dir, f"{url.rsplit('/', 1)[-1]}.{ext}")
+            with open(path, "wb") as f:
+                f.write(resp.content)
+            saved.append(path)
+    return saved
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command")
+
+    rec = sub.add_parser("record", help="실제 API 응답을 픽스처로 저장")
+    rec.add_argument("--out", default="bench/fixtures_recorded")
+    rec.add_argument("--region", default="11680")
+    rec.add_argument("--year-month", default="202501")
+    rec.add_argument("--bjdong", default="10300")
+
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=35.0)
+    parser.add_argument("--result-code", default="22")
+    parser.add_argument("--result-code-rate", type=float, default=0.0)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--complexes", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fixtures", default="")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        for path in asyncio.run(record_fixtures(args.out, args.region, args.year_month, args.bjdong)):
+            print(path)
+        return
+
+    import uvicorn
+    config = FakeConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        hang_rate=args.hang_rate, hang_seconds=args.hang_seconds, result_code=args.result_code,
+        result_code_rate=args.result_code_rate, rows=args.rows, complexes=args.complexes,
+        seed=args.seed, fixtures_dir=args.fixtures,
+    )
+    print(f"[fake data.go.kr] http://{args.host}:{args.port}  (DATA_GO_KR_BASE_URL로 지정)", flush=True)
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
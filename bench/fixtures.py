@@ -0,0 +1,289 @@
+"""
+공공데이터 API 응답 픽스처 생성기
+
+가짜 data.go.kr 서버(bench.fake_server)와 파서 벤치마크(bench.bench_parsers)가 함께 사용합니다.
+실제 응답과 같은 태그/형식의 항목을 seed 기반으로 재현 가능하게 만듭니다.
+
+  - 국토교통부 실거래 XML (매매 5종, 전월세 4종). legacy=True면 한글 태그(구 API) 변형
+  - 건축인허가 JSON (ArchPmsHubService 5종)
+  - 온비드 JSON (입찰결과, 물건정보)
+  - 공동주택 단지 목록/상세 JSON (AptListService3, AptBasisInfoServiceV4)
+"""
+
+import json
+import random
+from xml.sax.saxutils import escape
+
+_APT_NAMES = ["은마", "래미안대치팰리스", "대치아이파크", "도곡렉슬", "타워팰리스1", "개포자이프레지던스", "역삼푸르지오",
+              "래미안블레스티지", "디에이치아너힐즈", "삼성래미안"]
+_OFFI_NAMES = ["강남역센트럴푸르지오시티", "역삼아이파크", "삼성동현대아이파크", "대치SK뷰"]
+_VILLA_NAMES = ["(101-12)", "대치빌라", "한신빌라트", "도곡그린빌", "역삼하이츠"]
+_DONGS = ["대치동", "도곡동", "개포동", "역삼동", "삼성동", "청담동", "논현동"]
+_AGENTS = ["서울 강남구", "서울 서초구", "서울 송파구", ""]
+_DEAL_GBN = ["중개거래", "직거래"]
+_HOUSE_TYPES = ["단독", "다가구"]
+_USE_TYPES = ["제2종근린생활", "업무", "판매", "숙박"]
+
+
+def _amount(rnd: random.Random, low: int, high: int) -> str:
+    return f"{rnd.randrange(low, high, 50):,}"
+
+
+# 필드 종류 → 값 생성기
+_VALUES = {
+    "apt_name":   lambda r: r.choice(_APT_NAMES),
+    "offi_name":  lambda r: r.choice(_OFFI_NAMES),
+    "villa_name": lambda r: r.choice(_VILLA_NAMES),
+    "amount":     lambda r: _amount(r, 30000, 600000),
+    "deposit":    lambda r: _amount(r, 1000, 200000),
+    "monthly":    lambda r: str(r.choice([0, 0, 0, 50, 100, 150, 250, 400])),
+    "area":       lambda r: f"{r.choice([39.6, 59.96, 76.79, 84.97, 114.8, 135.1]):.2f}",
+    "land_area":  lambda r: f"{r.uniform(80, 600):.1f}",
+    "floor":      lambda r: str(r.choice([-1] + list(range(1, 36)))),
+    "floors":     lambda r: str(r.randint(2, 25)),
+    "build_year": lambda r: str(r.randint(1979, 2024)),
+    "dong":       lambda r: r.choice(_DONGS),
+    "jibun":      lambda r: f"{r.randint(1, 999)}" + (f"-{r.randint(1, 30)}" if r.random() < 0.3 else ""),
+    "year":       lambda r: "2025",
+    "month":      lambda r: str(r.randint(1, 12)),
+    "day":        lambda r: str(r.randint(1, 28)),
+    "deal_gbn":   lambda r: r.choice(_DEAL_GBN),
+    "cancel":     lambda r: "O" if r.random() < 0.03 else "",
+    "agent":      lambda r: r.choice(_AGENTS),
+    "house_type": lambda r: r.choice(_HOUSE_TYPES),
+    "use_type":   lambda r: r.choice(_USE_TYPES),
+}
+
+_DATE = [("dealYear", "년", "year"), ("dealMonth", "월", "month"), ("dealDay", "일", "day")]
+
+# 스키마 → [(영문 태그, 한글 태그(구 API), 값 종류)]
+MOLIT_SCHEMAS: dict[str, list[tuple[str, str, str]]] = {
+    "apt_trade": [
+        ("aptNm", "아파트", "apt_name"), ("dealAmount", "거래금액", "amount"),
+        ("excluUseAr", "전용면적", "area"), ("floor", "층", "floor"), ("buildYear", "건축년도", "build_year"),
+        ("umdNm", "법정동", "dong"), ("jibun", "지번", "jibun"), *_DATE,
+        ("dealingGbn", "거래유형", "deal_gbn"), ("estateAgentSggNm", "중개사소재지", "agent"),
+        ("cdealType", "해제여부", "cancel"),
+    ],
+    "offi_trade": [
+        ("offiNm", "오피스텔", "offi_name"), ("dealAmount", "거래금액", "amount"),
+        ("excluUseAr", "전용면적", "area"), ("floor", "층", "floor"), ("buildYear", "건축년도", "build_year"),
+        ("umdNm", "법정동", "dong"), ("jibun", "지번", "jibun"), *_DATE, ("cdealType", "해제여부", "cancel"),
+    ],
+    "villa_trade": [
+        ("mhouseNm", "연립다세대", "villa_name"), ("dealAmount", "거래금액", "amount"),
+        ("excluUseAr", "전용면적", "area"), ("floor", "층", "floor"), ("buildYear", "건축년도", "build_year"),
+        ("umdNm", "법정동", "dong"), ("jibun", "지번", "jibun"), *_DATE, ("dealingGbn", "거래유형", "deal_gbn"),
+        ("cdealType", "해제여부", "cancel"),
+    ],
+    "house_trade": [
+        ("houseType", "주택유형", "house_type"), ("dealAmount", "거래금액", "amount"),
+        ("totalFloorAr", "연면적", "land_area"), ("platArea", "대지면적", "land_area"),
+        ("floorCount", "층", "floors"), ("buildYear", "건축년도", "build_year"),
+        ("umdNm", "법정동", "dong"), ("jibun", "지번", "jibun"), *_DATE, ("dealingGbn", "거래유형", "deal_gbn"),
+        ("cdealType", "해제여부", "cancel"),
+    ],
+    "commercial_trade": [
+        ("useNm", "용도", "use_type"), ("dealAmount", "거래금액", "amount"),
+        ("dealArea", "건물면적", "land_area"), ("platArea", "대지면적", "land_area"),
+        ("floor", "층", "floor"), ("totalFloor", "건물층수", "floors"), ("buildYear", "건축년도", "build_year"),
+        ("umdNm", "법정동", "dong"), ("jibun", "지번", "jibun"), *_DATE, ("dealingGbn", "거래유형", "deal_gbn"),
+        ("cdealType", "해제여부", "cancel"),
+    ],
+    "apt_rent": [
+        ("aptNm", "아파트", "apt_name"), ("deposit", "보증금액", "deposit"), ("monthlyRent", "월세금액", "monthly"),
+        ("excluUseAr", "전용면적", "area"), ("floor", "층", "floor"), ("buildYear", "건축년도", "build_year"),
+        ("umdNm", "법정동", "dong"), *_DATE,
+    ],
+    "offi_rent": [
+        ("offiNm", "오피스텔", "offi_name"), ("deposit", "보증금액", "deposit"), ("monthlyRent", "월세금액", "monthly"),
+        ("excluUseAr", "전용면적", "area"), ("floor", "층", "floor"), ("buildYear", "건축년도", "build_year"),
+        ("umdNm", "법정동", "dong"), *_DATE,
+    ],
+    "villa_rent": [
+        ("mhouseNm", "연립다세대", "villa_name"), ("deposit", "보증금액", "deposit"),
+        ("monthlyRent", "월세금액", "monthly"), ("excluUseAr", "전용면적", "area"), ("floor", "층", "floor"),
+        ("buildYear", "건축년도", "build_year"), ("umdNm", "법정동", "dong"), *_DATE,
+    ],
+    "house_rent": [
+        ("houseType", "주택유형", "house_type"), ("deposit", "보증금액", "deposit"),
+        ("monthlyRent", "월세금액", "monthly"), ("totalFloorAr", "연면적", "land_area"),
+        ("umdNm", "법정동", "dong"), *_DATE,
+    ],
+}
+
+# 실거래 API 오퍼레이션명 → 스키마
+MOLIT_OPERATIONS = {
+    "getRTMSDataSvcAptTradeDev": "apt_trade",
+    "getRTMSDataSvcOffiTrade":   "offi_trade",
+    "getRTMSDataSvcRHTrade":     "villa_trade",
+    "getRTMSDataSvcSHTrade":     "house_trade",
+    "getRTMSDataSvcNrgTrade":    "commercial_trade",
+    "getRTMSDataSvcAptRent":     "apt_rent",
+    "getRTMSDataSvcOffiRent":    "offi_rent",
+    "getRTMSDataSvcRHRent":      "villa_rent",
+    "getRTMSDataSvcSHRent":      "house_rent",
+}
+
+
+def molit_item(schema: str, rnd: random.Random, legacy: bool = False) -> dict[str, str]:
+    return {(kor if legacy else eng): _VALUES[kind](rnd) for eng, kor, kind in MOLIT_SCHEMAS[schema]}
+
+
+def molit_items(schema: str, n: int, seed: int = 0, legacy: bool = False, offset: int = 0) -> list[dict[str, str]]:
+    """seed와 offset(전체 결과 중 위치)이 같으면 항상 같은 항목"""
+    return [molit_item(schema, random.Random(seed * 1_000_003 + offset + i), legacy) for i in range(n)]
+
+
+def molit_xml(items: list[dict[str, str]], total_count: int, result_code: str = "000",
+              result_msg: str = "OK", page_no: int = 1, num_of_rows: int = 10) -> str:
+    body = "".join(
+        "<item>" + "".join(f"<{tag}>{escape(value)}</{tag}>" for tag, value in item.items()) + "</item>"
+        for item in items
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f"<response><header><resultCode>{result_code}</resultCode><resultMsg>{escape(result_msg)}</resultMsg></header>"
+        f"<body><items>{body}</items><numOfRows>{num_of_rows}</numOfRows><pageNo>{page_no}</pageNo>"
+        f"<totalCount>{total_count}</totalCount></body></response>"
+    )
+
+
+def molit_item_elements(schema: str, n: int, seed: int = 0, legacy: bool = False) -> list:
+    """파서 입력과 같은 <item> Element 목록"""
+    import xml.etree.ElementTree as ET
+    root = ET.fromstring(molit_xml(molit_items(schema, n, seed, legacy), n))
+    return root.findall(".//item")
+
+
+# ── 건축인허가 (JSON) ─────────────────────────────────────────────────────────
+
+def _plat_plc(rnd: random.Random) -> str:
+    return f"서울특별시 강남구 {rnd.choice(_DONGS)} {rnd.randint(1, 999)}"
+
+
+ARCH_PMS_FIELDS = {
+    "getApBasisOulnInfo": lambda r: {
+        "bldNm": r.choice(_APT_NAMES), "platPlc": _plat_plc(r), "mainPurpsCdNm": r.choice(["공동주택", "업무시설"]),
+        "strctCdNm": "철근콘크리트구조", "roofCdNm": "평지붕", "platArea": f"{r.uniform(300, 30000):.2f}",
+        "archArea": f"{r.uniform(100, 8000):.2f}", "bcRat": f"{r.uniform(10, 60):.2f}",
+        "totArea": f"{r.uniform(1000, 200000):.2f}", "vlratFlrArea": f"{r.uniform(800, 150000):.2f}",
+        "vlRat": f"{r.uniform(100, 300):.2f}", "grndFlrCnt": r.randint(3, 50), "ugrndFlrCnt": r.randint(0, 5),
+        "hoCnt": r.randint(0, 50), "hhldCnt": r.randint(0, 30), "fmlyCnt": r.randint(0, 3000),
+        "mainBldCnt": r.randint(1, 30), "atchBldCnt": r.randint(0, 5), "archPmsDay": "20190315",
+        "stcnsDay": "20190801", "useAprDay": "20220228", "crtnDay": "20250102",
+    },
+    "getApPklotInfo": lambda r: {
+        "bldNm": r.choice(_APT_NAMES), "platPlc": _plat_plc(r), "pklotCdNm": "부설",
+        "autoPrkngCnt": r.randint(0, 3000), "mchngPrkngCnt": r.randint(0, 50),
+        "outdorPrkngCnt": r.randint(0, 100), "indrPrkngCnt": r.randint(0, 3000), "crtnDay": "20250102",
+    },
+    "getApJijiguInfo": lambda r: {
+        "bldNm": r.choice(_APT_NAMES), "platPlc": _plat_plc(r),
+        "jiyukCdNm": r.choice(["제3종일반주거지역", "제2종일반주거지역", "일반상업지역"]),
+        "jiguCdNm": r.choice(["", "아파트지구", "고도지구"]), "guyukCdNm": r.choice(["", "지구단위계획구역"]),
+        "etcJiyukCd": "", "etcJiguCd": "", "crtnDay": "20250102",
+    },
+    "getApPlatPlcInfo": lambda r: {
+        "bldNm": r.choice(_APT_NAMES), "platPlc": _plat_plc(r), "jimokCdNm": r.choice(["대", "잡종지"]),
+        "sigunguNm": "강남구", "bjdongNm": r.choice(_DONGS), "hjdongNm": r.choice(_DONGS) + "1동",
+        "newPlatPlc": f"서울특별시 강남구 테헤란로 {r.randint(1, 500)}", "bun": f"{r.randint(1, 999):04d}",
+        "ji": f"{r.randint(0, 30):04d}", "crtnDay": "20250102",
+    },
+    "getApHsTpInfo": lambda r: {
+        "bldNm": r.choice(_APT_NAMES), "platPlc": _plat_plc(r), "hsTpCdNm": r.choice(["아파트", "연립주택", "다세대주택"]),
+        "hhldCnt": r.randint(0, 30), "fmlyCnt": r.randint(0, 3000), "crtnDay": "20250102",
+    },
+}
+
+
+def json_body(items: list[dict], total_count: int, result_code: str = "00", result_msg: str = "NORMAL SERVICE.",
+              page_no: int = 1, num_of_rows: int = 10) -> dict:
+    """data.go.kr JSON 응답 공통 형식 ({response: {header, body: {items: {item: [...]}}}})"""
+    return {
+        "response": {
+            "header": {"resultCode": result_code, "resultMsg": result_msg},
+            "body": {
+                "items": {"item": items} if items else "",
+                "numOfRows": num_of_rows,
+                "pageNo": page_no,
+                "totalCount": total_count,
+            },
+        }
+    }
+
+
+def arch_pms_items(operation: str, n: int, seed: int = 0, offset: int = 0) -> list[dict]:
+    make = ARCH_PMS_FIELDS[operation]
+    return [make(random.Random(seed * 1_000_003 + offset + i)) for i in range(n)]
+
+
+# ── 온비드 (JSON) ─────────────────────────────────────────────────────────────
+
+def onbid_item(operation: str, rnd: random.Random, index: int) -> dict:
+    appraised = rnd.randrange(50_000_000, 3_000_000_000, 1_000_000)
+    minimum = int(appraised * rnd.choice([1.0, 0.9, 0.8, 0.7, 0.6, 0.5]))
+    item = {
+        "cltrMngNo": f"2025-{index:05d}-001",
+        "goodsNm": f"서울특별시 강남구 {rnd.choice(_DONGS)} {rnd.randint(1, 999)} {rnd.choice(_APT_NAMES)}",
+        "ldtlAddr": _plat_plc(rnd),
+        "useNm": rnd.choice(["아파트", "오피스텔", "근린생활시설", "대지"]),
+        "totArea": f"{rnd.uniform(20, 300):.2f}",
+        "apprAmt": str(appraised),
+        "minBidAmt": str(minimum),
+        "dspslMthdNm": rnd.choice(["매각", "임대"]),
+        "cnsgAgcyNm": rnd.choice(["한국자산관리공사", "서울특별시"]),
+    }
+    if operation == "getOnbidBidResultList":
+        item.update({
+            "sucsBidAmt": str(int(minimum * rnd.uniform(1.0, 1.3))) if rnd.random() < 0.6 else "",
+            "pbctDt": f"2025{rnd.randint(1, 12):02d}{rnd.randint(1, 28):02d}",
+            "pbctSttNm": rnd.choice(["낙찰", "유찰", "취소"]),
+        })
+    else:
+        item.update({
+            "pbctBgngDt": f"2025{rnd.randint(1, 12):02d}{rnd.randint(1, 28):02d}1000",
+            "pbctEndDt": f"2025{rnd.randint(1, 12):02d}{rnd.randint(1, 28):02d}1700",
+            "pbctCnt": str(rnd.randint(1, 8)),
+            "rmrk": "",
+        })
+    return item
+
+
+def onbid_items(operation: str, n: int, seed: int = 0, offset: int = 0) -> list[dict]:
+    return [onbid_item(operation, random.Random(seed * 1_000_003 + offset + i), offset + i) for i in range(n)]
+
+
+# ── 공동주택 단지 (JSON) ──────────────────────────────────────────────────────
+
+def complex_list_items(sigungu_code: str, n: int = 0) -> list[dict]:
+    """시군구 단지 목록. n=0이면 _APT_NAMES 전체"""
+    names = _APT_NAMES if n <= 0 else [f"{_APT_NAMES[i % len(_APT_NAMES)]}{i // len(_APT_NAMES) or ''}" for i in range(n)]
+    return [
+        {
+            "kaptCode": f"A{sigungu_code}{i:04d}",
+            "kaptName": name,
+            "bjdCode": f"{sigungu_code}10{i % 9 + 1}00",
+            "as1": "서울특별시", "as2": "강남구", "as3": _DONGS[i % len(_DONGS)],
+        }
+        for i, name in enumerate(names)
+    ]
+
+
+def complex_detail_item(kapt_code: str) -> dict:
+    rnd = random.Random(kapt_code)
+    return {
+        "kaptCode": kapt_code,
+        "hoCnt": rnd.randint(100, 5000),
+        "kaptDongCnt": rnd.randint(2, 40),
+        "ktownFlrNo": rnd.randint(5, 50),
+        "kaptBaseFloor": rnd.randint(0, 4),
+        "kaptUsedate": f"{rnd.randint(1979, 2023)}{rnd.randint(1, 12):02d}15",
+        "codeHeatNm": rnd.choice(["지역난방", "개별난방", "중앙난방"]),
+        "codeMgrNm": rnd.choice(["위탁관리", "자치관리"]),
+        "kaptBcompany": rnd.choice(["삼성물산", "현대건설", "GS건설", "대림산업"]),
+    }
+
+
+def dumps(data: dict) -> bytes:
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
@@ -235,7 +235,7 @@ REGION_CODES: dict[str, str] = {
     "화천군": "42790",
     "양구군": "42800",
     "인제군": "42810",
-    "고성군": "42820",
+    "강원 고성군": "42820",
     "양양군": "42830",
 
     # 충청북도
@@ -373,7 +373,7 @@ REGION_CODES: dict[str, str] = {
     "의령군": "48720",
     "함안군": "48730",
     "창녕군": "48740",
-    "고성군": "48820",
+    "경남 고성군": "48820",
     "남해군": "48840",
     "하동군": "48850",
     "산청군": "48860",
@@ -443,3 +443,59 @@ def search_region_code(query: str) -> dict:
         "name": best["name"],
         "candidates": candidates[:10],  # 최대 10개
     }
+
+
+def _sido_short(sido: str) -> str:
+    """시도 전체명 → 약칭 (서울특별시→서울, 경상남도→경남, 전북특별자치도→전북)"""
+    if sido.endswith("도") and len(sido) == 4 and sido[1] in "청라상":
+        return sido[0] + sido[2]
+    return sido[:2]
+
+
+def _ambiguous_names() -> frozenset[str]:
+    """여러 시도에 있는 시군구 이름 ('중구', '고성군' 등). 시도 없이 이름만으로는 코드를 정할 수 없음"""
+    codes: dict[str, set[str]] = {}
+    for key, code in REGION_CODES.items():
+        sido, _, name = key.partition(" ")
+        if name and REGION_CODES.get(sido, "").endswith("000"):
+            codes.setdefault(name, set()).add(code)
+    return frozenset(name for name, c in codes.items() if len(c) > 1)
+
+
+_AMBIGUOUS_NAMES = _ambiguous_names()
+
+
+def region_code_from_address(address: str) -> str | None:
+    """
+    지번/도로명 주소 문자열에서 시군구 5자리 코드를 추출합니다.
+
+    예: "서울특별시 강남구 역삼동 123" → "11680"
+        "경기도 수원시 장안구 정자동 1" → "41111"
+
+    시도 약칭 + 시군구명으로 찾지 못하면 시군구명만으로 찾되, 여러 시도에 같은 이름이 있거나
+    (예: "강원특별자치도 고성군" 과 "경상남도 고성군") 찾은 코드가 주소의 시도와 다르면 쓰지 않습니다.
+    시군구를 특정할 수 없으면 None을 반환합니다.
+    """
+    tokens = (address or "").split()
+    if len(tokens) < 2:
+        return None
+    short = _sido_short(tokens[0])
+
+    # "수원시 장안구"처럼 시+구 조합 우선
+    if len(tokens) >= 3:
+        code = REGION_CODES.get(f"{tokens[1]} {tokens[2]}")
+        if code:
+            return code
+    code = REGION_CODES.get(f"{short} {tokens[1]}")
+    if code is None and tokens[1] not in _AMBIGUOUS_NAMES:
+        code = REGION_CODES.get(tokens[1])
+        sido_code = REGION_CODES.get(tokens[0], "")
+        if code and sido_code.endswith("000") and code[:2] != sido_code[:2]:
+            code = None
+    if code and not code.endswith("000"):
+        return code
+    # 세종처럼 시도 자체가 시군구인 경우
+    code = REGION_CODES.get(tokens[0])
+    if code and not code.endswith("000"):
+        return code
+    return None
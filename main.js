@@ -163,20 +163,10 @@ function setComplexStatus(status, msg) {
   });
 }
 
-// ── 단지정보 정규화 ───────────────────────────────────────────────────────────
-function normalizeName(name) {
-  return (name || '').replace(/[\s\-_·]/g, '').toLowerCase();
-}
-
+// ── 단지정보 조회 ─────────────────────────────────────────────────────────────
+// 단지명 매칭은 서버(enrich=complex)에서 수행하고, 거래 단지명 그대로 조회
 function lookupComplex(name) {
-  const norm = normalizeName(name);
-  if (!norm) return null;
-  if (state.complexMap[norm]) return state.complexMap[norm];
-  // 부분 매칭
-  for (const [key, val] of Object.entries(state.complexMap)) {
-    if (norm.includes(key) || key.includes(norm)) return val;
-  }
-  return null;
+  return (name && state.complexMap[name]) || null;
 }
 
 // ── 지역코드 조회 ─────────────────────────────────────────────────────────────
@@ -317,6 +307,28 @@ function calcRentSummary(items) {
   return result;
 }
 
+// ── NDJSON 스트림 읽기 ────────────────────────────────────────────────────────
+// 서버가 페이지를 파싱하는 즉시 보내는 이벤트를 한 줄씩 onEvent로 전달
+async function readNdjson(url, onEvent) {
+  const res = await fetch(url);
+  if (!res.ok || !res.body) { onEvent(await res.json()); return; }
+  const reader  = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buf = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buf += decoder.decode(value, { stream: true });
+    let nl;
+    while ((nl = buf.indexOf('\n')) >= 0) {
+      const line = buf.slice(0, nl).trim();
+      buf = buf.slice(nl + 1);
+      if (line) onEvent(JSON.parse(line));
+    }
+  }
+  if (buf.trim()) onEvent(JSON.parse(buf));
+}
+
 // ── 조회 실행 ─────────────────────────────────────────────────────────────────
 async function doSearch() {
   if (!state.regionCode) return;
@@ -327,52 +339,49 @@ async function doSearch() {
   hideResults();
   state.complexMap = {};
   state.complexAvail = null;
+  state.allItems = [];
+  state.lastData = null;
 
   try {
     const endpoint = state.dealType === 'trade' ? '/api/trades' : '/api/rent';
-    const tradeUrl   = `${endpoint}?type=${state.activeTab}&region_code=${state.regionCode}&year_month=${yearMonth}&rows=${rows}`;
-    const complexUrl = `/api/complex?region_code=${state.regionCode}`;
-
-    // 1단계: 거래 데이터 먼저 조회
     const isApt = state.activeTab === 'apt';
-    const tradeData = await fetch(tradeUrl).then(r => r.json());
-    if (tradeData.error) { showError(tradeData.error); return; }
-
-    // 2단계: 아파트일 때 거래 결과의 단지명 추출 → 단지정보 병렬 조회
-    if (isApt) {
-      const aptNames = [...new Set(
-        (tradeData.items || []).map(i => i.apt_name).filter(Boolean)
-      )];
-      const namesParam = encodeURIComponent(aptNames.join(','));
-      const complexFullUrl = `${complexUrl}&apt_names=${namesParam}`;
-
-      setComplexStatus('loading', '단지정보 조회 중...');
-      try {
-        const complexData = await fetch(complexFullUrl).then(r => r.json());
-        if (complexData.error && complexData.matched_count === 0) {
-          setComplexStatus('pending', '⚠ ' + complexData.error);
-          state.complexAvail = false;
-        } else if (complexData.complex_map && complexData.matched_count > 0) {
-          state.complexMap = complexData.complex_map;
-          setComplexStatus('ready', `✓ 단지정보 연동 완료 (${complexData.matched_count}개 단지 매칭)`);
+    const enrich = isApt ? '&enrich=complex' : '';
+    const streamUrl = `${endpoint}/stream?type=${state.activeTab}&region_code=${state.regionCode}&year_month=${yearMonth}&rows=${rows}&page_size=100${enrich}`;
+
+    // 거래 데이터를 페이지 단위로 받아 도착하는 대로 표시.
+    // 아파트는 서버가 단지 목록을 동시에 조회해 마지막에 complex 이벤트로 매칭 결과를 보냄
+    let streamError = null;
+    await readNdjson(streamUrl, ev => {
+      if (ev.event === 'items') {
+        if (!state.lastData) { state.lastData = { total_count: 0 }; setLoading(false); }
+        if (ev.page_no === 1) state.lastData.total_count += ev.total_count;
+        state.allItems.push(...ev.items.map(item => ({ ...item, _complex: null })));
+        if (enrich && !state.complexAvail) setComplexStatus('loading', '단지정보 조회 중...');
+        rerender();
+      } else if (ev.event === 'complex') {
+        if (ev.matched_count > 0) {
+          state.complexMap = ev.by_name;
+          setComplexStatus('ready', `✓ 단지정보 연동 완료 (${ev.matched_count}개 단지 매칭)`);
           state.complexAvail = true;
         } else {
-          setComplexStatus('pending', '단지정보 매칭 결과 없음');
+          setComplexStatus('pending', ev.error ? '⚠ ' + ev.error : '단지정보 매칭 결과 없음');
           state.complexAvail = false;
         }
-      } catch {
-        setComplexStatus('error', '단지정보 조회 실패');
-        state.complexAvail = false;
+      } else if (ev.event === 'summary') {
+        if (state.lastData) state.lastData.total_count = ev.total_count;
+      } else if (ev.error) {
+        streamError = ev.error;
       }
-    }
+    });
+    if (!state.lastData) { showError(streamError || '조회 결과가 없습니다.'); return; }
+    if (streamError) showError(streamError);
 
     // 거래 items에 단지정보 조인
-    state.allItems = (tradeData.items || []).map(item => {
+    state.allItems = state.allItems.map(item => {
       const name = item.apt_name || item.offi_name || item.house_name || '';
       const cx = lookupComplex(name);
       return { ...item, _complex: cx || null };
     });
-    state.lastData = tradeData;
     rerender();
   } catch (e) {
     showError('네트워크 오류: ' + e.message);
@@ -29,10 +29,32 @@ Korea Real Estate Transaction MCP Server
   ONBID_API_KEY      - 온비드 전용 API 키 (없으면 DATA_GO_KR_API_KEY 사용)
   MCP_HOST           - HTTP 모드 호스트 (기본: 0.0.0.0)
   MCP_PORT           - HTTP 모드 포트 (기본: 8000)
+  MCP_TRANSPORT      - stdio(기본) | http | daemon (Unix 소켓 데몬, stdio_shim.py가 중계)
+  MCP_DAEMON_SOCKET  - 데몬 모드 소켓 경로 (기본: .data/mcp.sock)
+  MCP_WORKERS        - HTTP 모드 워커 프로세스 수 (기본: 1. 2 이상이면 워커 간 공유 캐시 사용(_shared.py), 공매 변경 피드 비활성)
+  MCP_SHARED_CACHE   - 워커 간 공유 캐시/호출 제한 DB 경로 (기본: .data/shared_cache.db)
+  MCP_UPSTREAM_RPS   - 외부 API 초당 호출 상한, 전체 워커 합산 (기본: 0 = 제한 없음)
+  MCP_DAILY_QUOTA    - 엔드포인트별 일일 외부 API 호출 상한 (기본: 0 = 제한 없음)
+  REALESTATE_DB_PATH - 로컬 이력 저장소 경로 (기본: .data/realestate.db)
+  REALESTATE_GEOCODE_PATH - 반경 조회용 좌표 CSV (기본: data/geocode.csv, 형식은 _geo.py)
+  MCP_JOBS_PATH      - 리포트 작업 DB 경로 (기본: .data/jobs.db)
+  MCP_JOB_WORKERS    - 동시에 실행할 리포트 작업 수 (기본: 2)
+  MCP_JOB_CONCURRENCY - 리포트 작업 하나의 동시 외부 조회 수 (기본: 4)
+  MCP_ADMIT_UI_CONCURRENCY  - 워커당 /api 동시 처리 수 (기본: 32, 0 = 제한 없음)
+  MCP_ADMIT_MCP_CONCURRENCY - 워커당 /mcp 동시 처리 수 (기본: 16, 0 = 제한 없음)
+  MCP_ADMIT_PER_CLIENT      - 클라이언트(IP 또는 MCP 세션)당 동시 요청 수 (기본: 8, 초과 시 429)
+  MCP_ADMIT_QUEUE           - 슬롯 대기열 길이 (기본: 64, 가득 차면 503)
+  MCP_ADMIT_QUEUE_TIMEOUT   - 슬롯 최대 대기 시간 초 (기본: 5, 초과 시 503)
+  MCP_COMPLEX_CACHE_TTL - 시군구 단지 목록·단지 상세 캐시 유지 시간 초 (기본: 86400)
+  MCP_REQUEST_TIMEOUT - 요청/도구 호출 기본 마감 초 (기본: 60, 0 = 없음. X-Request-Timeout 헤더·timeout_s 인자가 우선)
+  MCP_TRACE_FILE     - 요청/도구 호출 trace를 OTLP/JSON 줄 단위로 기록할 파일 (선택)
+  MCP_SERVER_TIMING  - 1이면 HTTP 응답에 단계별 Server-Timing 헤더 추가 (디버그용)
+  DATA_GO_KR_BASE_URL - 공공데이터 API 호출 대상 변경 (예: bench.fake_server 주소)
 """
 
 import os
 import sys
+from typing import Any
 
 # 프로젝트 루트를 Python 경로에 추가
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -42,8 +64,79 @@ from mcp.server.fastmcp import FastMCP
 
 load_dotenv()
 
+from _tool_manifest import load_manifest, register_all, register_module  # noqa: E402
+from _deadline import HEADER as DEADLINE_HEADER, deadline_scope, parse_timeout  # noqa: E402
+from _tracing import start_trace  # noqa: E402  (.env 로드 후 환경 변수 읽기)
+
+# 모든 도구가 받는 공통 인자: 호출별 마감 (_deadline)
+TIMEOUT_ARG = "timeout_s"
+_TIMEOUT_ARG_SCHEMA = {
+    "type": "number",
+    "title": "Timeout S",
+    "description": "이 호출의 최대 대기 시간(초). 넘기면 외부 조회를 중단하고 그때까지 모은 결과를 partial=true로 반환",
+}
+
+
+def _with_timeout_arg(tool):
+    """tools/list 응답의 inputSchema에 timeout_s 인자 추가"""
+    properties = tool.inputSchema.get("properties", {})
+    if TIMEOUT_ARG in properties:
+        return tool
+    schema = {**tool.inputSchema, "properties": {**properties, TIMEOUT_ARG: _TIMEOUT_ARG_SCHEMA}}
+    return tool.model_copy(update={"inputSchema": schema})
+
+
+class TracedFastMCP(FastMCP):
+    """
+    도구 호출마다 trace를 시작해 처리 단계 span을 기록 (_tracing, MCP_TRACE_FILE)
+
+    tools/manifest.json이 최신이면 도구 모듈을 시작 시 import하지 않고 manifest로 tools/list에
+    답한 뒤, 도구가 처음 호출될 때 그 도구의 모듈만 등록합니다 (_tool_manifest).
+
+    도구 호출마다 마감(_deadline)을 정합니다: timeout_s 인자 → X-Request-Timeout 헤더(HTTP) → MCP_REQUEST_TIMEOUT.
+    """
+
+    def use_manifest(self, manifest: dict[str, Any]) -> None:
+        from mcp.types import Tool as MCPTool
+
+        self._manifest_tools = [
+            _with_timeout_arg(MCPTool.model_validate({k: v for k, v in t.items() if k != "module"}))
+            for t in manifest["tools"]
+        ]
+        self._pending_modules = {t["name"]: t["module"] for t in manifest["tools"]}
+
+    def _load_tool_module(self, name: str) -> None:
+        module = getattr(self, "_pending_modules", {}).get(name)
+        if module is None:
+            return
+        register_module(self, module)
+        self._pending_modules = {k: v for k, v in self._pending_modules.items() if v != module}
+
+    async def list_tools(self):
+        manifest_tools = getattr(self, "_manifest_tools", None)
+        if manifest_tools is None:
+            return [_with_timeout_arg(tool) for tool in await super().list_tools()]
+        return list(manifest_tools)
+
+    def _request_timeout(self, arguments: dict[str, Any]) -> float | None:
+        if TIMEOUT_ARG in arguments:
+            return parse_timeout(arguments.pop(TIMEOUT_ARG))
+        try:
+            request = self._mcp_server.request_context.request   # HTTP 전송이면 Starlette Request
+        except LookupError:
+            return None
+        headers = getattr(request, "headers", None)
+        return parse_timeout(headers.get(DEADLINE_HEADER)) if headers is not None else None
+
+    async def call_tool(self, name: str, arguments: dict[str, Any]):
+        self._load_tool_module(name)
+        arguments = dict(arguments)
+        with deadline_scope(self._request_timeout(arguments)), start_trace(f"tool {name}", **{"mcp.tool": name}):
+            return await super().call_tool(name, arguments)
+
+
 # MCP 서버 생성
-mcp = FastMCP(
+mcp = TracedFastMCP(
     name="korea-realestate-mcp",
     instructions="""
 한국 부동산 실거래가 및 공매 정보를 조회하는 MCP 서버입니다.
@@ -56,27 +149,120 @@ mcp = FastMCP(
 ## 제공 데이터
 - 매매 실거래가: 아파트, 오피스텔, 빌라(연립/다세대), 단독/다가구, 상업용 건물
 - 전월세: 아파트, 오피스텔, 빌라, 단독/다가구
-- 공매: 온비드 물건 목록, 입찰 결과(낙찰가)
+- 공매: 온비드 물건 목록, 입찰 결과(낙찰가), 물건 변경 피드(watch_public_auction_items)
+- 교차 분석: 공매 낙찰가 vs 실거래 중앙값 (sync_* 로 로컬 적재 후 compare_auction_to_trades)
+- 전세가율: get_jeonse_ratio(기간 내 매매·전세를 단지 × 면적 구간별로 집계)
+- 전국·다년 리포트: submit_report_job → get_report_job(진행률) → get_report_job_result
 
 ## 주의사항
 - 실거래 데이터는 통상 1-2개월 후 공개됩니다
 - 지역 코드는 법정동 앞 5자리입니다 (예: 11680 = 서울 강남구)
 - API 키 없이는 조회 불가합니다 (data.go.kr에서 발급)
+- 매매/전월세 도구 결과가 크면 format="summary"(법정동 × 면적 구간 통계) 또는 format="table", fields="amount,area_m2,..."로 줄이세요
 """,
 )
 
-# 도구 등록
-from tools.trade import register_trade_tools
-from tools.rent import register_rent_tools
-from tools.onbid import register_onbid_tools
-from tools.region import register_region_tools
-from tools.building_permit import register_building_permit_tools
+# 도구 등록: manifest가 최신이면 첫 호출 시 모듈별 지연 등록, 아니면 즉시 전체 등록
+_manifest = load_manifest()
+if _manifest is not None:
+    mcp.use_manifest(_manifest)
+else:
+    register_all(mcp)
+
+
+def create_http_app():
+    """
+    HTTP 모드 앱: 웹 UI/REST API + /metrics + /mcp (streamable HTTP)
+
+    워커가 여러 개면 MCP 세션을 프로세스 메모리에 둘 수 없으므로(다음 요청이 다른 워커로 감)
+    /mcp를 stateless 모드로 엽니다. /metrics는 응답한 워커의 값입니다.
+    """
+    from contextlib import asynccontextmanager
+    from starlette.applications import Starlette
+    from starlette.middleware import Middleware
+    from starlette.responses import Response
+    from starlette.routing import Route
+    from _helpers import close_http_client
+    from _jobs import get_job_runner
+    from _metrics import CONTENT_TYPE, render as render_metrics
+    from web_api import create_web_routes
+    from web_middleware import (
+        AdmissionMiddleware,
+        CompressionMiddleware,
+        DeadlineMiddleware,
+        MetricsMiddleware,
+        TracingMiddleware,
+    )
+
+    async def metrics(request):
+        return Response(render_metrics(), media_type=CONTENT_TYPE)
+
+    from _shared import WORKERS
+    if WORKERS > 1:
+        mcp.settings.stateless_http = True
+    # /mcp 라우트를 그대로 가져오고, 세션 관리자 task group은 앱 lifespan에서 실행
+    # (하위 앱으로 Mount하면 경로가 /mcp/mcp가 되고 하위 앱 lifespan이 실행되지 않음)
+    mcp_app = mcp.streamable_http_app()
+
+    @asynccontextmanager
+    async def lifespan(app):
+        # 리포트 작업 워커는 앱 시작 시 띄워 이전 실행에서 남은 작업을 이어받음 (_jobs)
+        runner = get_job_runner()
+        runner.start()
+        try:
+            async with mcp.session_manager.run():
+                yield
+        finally:
+            await runner.stop()
+            await close_http_client()
+
+    return Starlette(
+        routes=create_web_routes() + [Route("/metrics", metrics)] + list(mcp_app.routes),
+        middleware=[
+            Middleware(MetricsMiddleware),   # 거부(429/503)도 집계되도록 admission보다 바깥
+            Middleware(DeadlineMiddleware),   # 슬롯 대기 시간도 요청 마감에 포함
+            Middleware(AdmissionMiddleware),
+            Middleware(TracingMiddleware),
+            Middleware(CompressionMiddleware),
+        ],
+        lifespan=lifespan,
+    )
+
+
+def run_daemon() -> None:
+    """
+    로컬 데몬 모드: HTTP 앱을 Unix 도메인 소켓(MCP_DAEMON_SOCKET)으로 제공
+
+    stdio_shim.py가 여러 에이전트 세션의 MCP 메시지를 이 소켓의 /mcp로 중계하므로
+    캐시, HTTP 연결, 단지 목록, 외부 API 호출 제한을 세션끼리 공유합니다.
+    소켓 파일은 소유자만 접근할 수 있습니다(0600).
+    """
+    import socket
+    import uvicorn
+    from stdio_shim import DAEMON_SOCKET, daemon_alive
+
+    path = DAEMON_SOCKET
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if daemon_alive(path):
+        raise SystemExit(f"[Korea Real Estate MCP] 이미 실행 중인 데몬이 있습니다: {path}")
+    if os.path.exists(path):
+        os.unlink(path)  # 비정상 종료로 남은 소켓 파일
+
+    # Unix 소켓 요청의 Host 헤더는 포트 없는 "localhost" (stdio_shim.UnixHTTPConnection)
+    security = mcp.settings.transport_security
+    if security is not None and "localhost" not in security.allowed_hosts:
+        security.allowed_hosts.append("localhost")
 
-register_trade_tools(mcp)
-register_rent_tools(mcp)
-register_onbid_tools(mcp)
-register_region_tools(mcp)
-register_building_permit_tools(mcp)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    os.chmod(path, 0o600)
+    print(f"[Korea Real Estate MCP] 데몬 모드로 시작: {path}", flush=True)
+    try:
+        uvicorn.run(create_http_app(), fd=sock.fileno(), log_level="warning")
+    finally:
+        sock.close()
+        if os.path.exists(path):
+            os.unlink(path)
 
 
 def main() -> None:
@@ -84,21 +270,26 @@ def main() -> None:
 
     if transport == "http":
         import uvicorn
-        from starlette.applications import Starlette
-        from starlette.routing import Mount
-        from web_api import create_web_routes
+        from _shared import SHARED_PATH, WORKERS
 
         host = os.getenv("MCP_HOST", "0.0.0.0")
         port = int(os.getenv("MCP_PORT", "8000"))
         print(f"[Korea Real Estate MCP] HTTP 모드로 시작: {host}:{port}", flush=True)
+        if WORKERS > 1:
+            print(f"  워커:   {WORKERS}개 (공유 캐시: {SHARED_PATH or '사용 안 함'})", flush=True)
+            print("  공매 변경 피드(watch): 사용 안 함 (MCP_WORKERS=1에서만 지원)", flush=True)
         print(f"  웹 UI:  http://{host}:{port}/", flush=True)
         print(f"  MCP:    http://{host}:{port}/mcp", flush=True)
+        print(f"  메트릭: http://{host}:{port}/metrics", flush=True)
 
-        mcp_app = mcp.streamable_http_app()
-        app = Starlette(
-            routes=create_web_routes() + [Mount("/mcp", app=mcp_app)]
-        )
-        uvicorn.run(app, host=host, port=port, log_level="info")
+        if WORKERS > 1:
+            # 멀티 프로세스는 import 문자열이 필요 (각 워커가 server 모듈을 다시 import해 앱 생성)
+            uvicorn.run("server:create_http_app", factory=True, workers=WORKERS,
+                        host=host, port=port, log_level="info")
+        else:
+            uvicorn.run(create_http_app(), host=host, port=port, log_level="info")
+    elif transport == "daemon":
+        run_daemon()
     else:
         mcp.run(transport="stdio")
 
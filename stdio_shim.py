@@ -0,0 +1,223 @@
+"""
+얇은 stdio MCP 진입점 (로컬 데몬 중계)
+
+stdio 방식은 에이전트 세션마다 server.py를 새로 띄우므로 매번 빈 캐시, 새 HTTP 연결,
+빈 단지 목록으로 시작하고 외부 API 호출 제한(MCP_UPSTREAM_RPS/MCP_DAILY_QUOTA)도 세션별로 따로 셉니다.
+
+이 스크립트는 표준 라이브러리만 사용하며(mcp 패키지 import 없음), stdin/stdout의 MCP 메시지를
+Unix 도메인 소켓으로 열린 로컬 데몬(server.py, MCP_TRANSPORT=daemon)의 /mcp
+(streamable HTTP)로 중계합니다. 데몬이 없으면 직접 띄우고, 동시에 시작한 여러 세션은 파일 잠금으로
+데몬 하나를 함께 씁니다. 그래서 여러 세션이 같은 캐시, 연결, 호출 제한 집계를 공유합니다.
+
+환경 변수:
+  MCP_DAEMON_SOCKET - 데몬 소켓 경로 (기본: .data/mcp.sock)
+  MCP_DAEMON_LOG    - 자동 실행한 데몬의 로그 파일 (기본: .data/mcp-daemon.log)
+
+MCP 클라이언트 설정 예:
+  {"command": "python", "args": ["/path/to/stdio_shim.py"]}
+"""
+
+import fcntl
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DAEMON_SOCKET = os.getenv("MCP_DAEMON_SOCKET", os.path.join(_BASE_DIR, ".data", "mcp.sock"))
+DAEMON_LOG = os.getenv("MCP_DAEMON_LOG", os.path.join(_BASE_DIR, ".data", "mcp-daemon.log"))
+MCP_PATH = "/mcp"
+START_TIMEOUT = 30.0
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """Unix 도메인 소켓으로 연결하는 HTTPConnection"""
+
+    def __init__(self, path: str, timeout: float | None = None) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self.unix_path = path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            sock.settimeout(self.timeout)
+        sock.connect(self.unix_path)
+        self.sock = sock
+
+
+# ── 데몬 실행 ────────────────────────────────────────────────────────────────
+
+def daemon_alive(path: str = DAEMON_SOCKET) -> bool:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def ensure_daemon(path: str = DAEMON_SOCKET) -> None:
+    """데몬이 없으면 백그라운드로 실행하고 소켓이 열릴 때까지 대기 (동시 실행은 파일 잠금으로 한 번만)"""
+    if daemon_alive(path):
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(f"{path}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if daemon_alive(path):
+            return
+        env = {**os.environ, "MCP_TRANSPORT": "daemon", "MCP_DAEMON_SOCKET": path}
+        with open(DAEMON_LOG, "ab") as log:
+            proc = subprocess.Popen(
+                [sys.executable, os.path.join(_BASE_DIR, "server.py")],
+                cwd=_BASE_DIR, env=env, stdin=subprocess.DEVNULL, stdout=log, stderr=log,
+                start_new_session=True,
+            )
+        deadline = time.monotonic() + START_TIMEOUT
+        while not daemon_alive(path):
+            if proc.poll() is not None:
+                raise RuntimeError(f"데몬 실행 실패 (exit {proc.returncode}, 로그: {DAEMON_LOG})")
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"데몬 소켓 대기 시간 초과: {path}")
+            time.sleep(0.05)
+
+
+# ── 중계 ─────────────────────────────────────────────────────────────────────
+
+def _iter_sse_data(resp):
+    """text/event-stream 응답의 data 필드를 이벤트 단위로 반환"""
+    data: list[str] = []
+    while True:
+        line = resp.readline()
+        if not line:
+            break
+        line = line.decode("utf-8").rstrip("\r\n")
+        if not line:
+            if data:
+                yield "\n".join(data)
+                data = []
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip(" "))
+    if data:
+        yield "\n".join(data)
+
+
+class Bridge:
+    """stdin 메시지 1건 = 데몬 /mcp POST 1건. 응답(JSON 또는 SSE)의 메시지를 stdout으로 전달"""
+
+    def __init__(self, path: str = DAEMON_SOCKET) -> None:
+        self.path = path
+        self.session_id: str | None = None
+        self.protocol_version: str | None = None
+        self._out = threading.Lock()
+        self._threads: list[threading.Thread] = []
+
+    def write(self, message: dict | list) -> None:
+        line = json.dumps(message, ensure_ascii=False, separators=(",", ":"))
+        with self._out:
+            sys.stdout.write(line + "\n")
+            sys.stdout.flush()
+
+    def _headers(self) -> dict[str, str]:
+        headers = {"Content-Type": "application/json", "Accept": "application/json, text/event-stream"}
+        if self.session_id:
+            headers["mcp-session-id"] = self.session_id
+        if self.protocol_version:
+            headers["mcp-protocol-version"] = self.protocol_version
+        return headers
+
+    def _post(self, message: dict) -> None:
+        conn = UnixHTTPConnection(self.path)
+        try:
+            conn.request("POST", MCP_PATH, body=json.dumps(message).encode(), headers=self._headers())
+            resp = conn.getresponse()
+            if resp.getheader("mcp-session-id"):
+                self.session_id = resp.getheader("mcp-session-id")
+            content_type = resp.getheader("content-type", "")
+            if resp.status == 202:
+                resp.read()
+            elif content_type.startswith("text/event-stream"):
+                for data in _iter_sse_data(resp):
+                    self._deliver(json.loads(data))
+            else:
+                body = resp.read()
+                if body:
+                    self._deliver(json.loads(body))
+                elif resp.status >= 400:
+                    raise RuntimeError(f"데몬 응답 HTTP {resp.status}")
+        finally:
+            conn.close()
+
+    def _deliver(self, message: dict | list) -> None:
+        if isinstance(message, dict) and isinstance(message.get("result"), dict):
+            version = message["result"].get("protocolVersion")
+            if version:
+                self.protocol_version = version
+        self.write(message)
+
+    def handle(self, message: dict) -> None:
+        try:
+            try:
+                self._post(message)
+            except (ConnectionError, FileNotFoundError):
+                # 데몬이 재시작된 경우 한 번 다시 띄우고 재시도 (세션이 사라졌으면 데몬이 오류로 응답)
+                ensure_daemon(self.path)
+                self._post(message)
+        except Exception as e:
+            if "id" in message:
+                self.write({"jsonrpc": "2.0", "id": message["id"],
+                            "error": {"code": -32603, "message": f"데몬 중계 실패: {e}"}})
+
+    def dispatch(self, message: dict) -> None:
+        """initialize(세션 ID 수신)와 알림은 순서대로, 나머지 요청은 동시에 처리"""
+        if message.get("method") == "initialize" or "id" not in message:
+            self.handle(message)
+            return
+        thread = threading.Thread(target=self.handle, args=(message,), daemon=True)
+        thread.start()
+        self._threads = [t for t in self._threads if t.is_alive()] + [thread]
+
+    def close(self) -> None:
+        for thread in self._threads:
+            thread.join()
+        if not self.session_id:
+            return
+        conn = UnixHTTPConnection(self.path, timeout=5)
+        try:
+            conn.request("DELETE", MCP_PATH, headers=self._headers())
+            conn.getresponse().read()
+        except OSError:
+            pass
+        finally:
+            conn.close()
+
+
+def main() -> None:
+    try:
+        ensure_daemon()
+    except RuntimeError as e:
+        print(f"[stdio_shim] {e}", file=sys.stderr, flush=True)
+        sys.exit(1)
+
+    bridge = Bridge()
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            message = json.loads(line)
+        except ValueError:
+            bridge.write({"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"}})
+            continue
+        for item in message if isinstance(message, list) else [message]:
+            bridge.dispatch(item)
+    bridge.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+공매 낙찰 이력 ↔ 실거래가 교차 분석 도구
+
+온비드 입찰결과와 국토교통부 매매 실거래를 로컬 저장소(_store.py)에 적재한 뒤,
+낙찰가를 같은 시군구·유형·면적대의 최근 실거래 중앙값과 비교합니다.
+비교 단계는 로컬 인덱스만 읽으므로 두 API를 다시 호출하지 않습니다.
+
+  1. sync_auction_history  : 온비드 입찰결과 전체 페이지 → auction_results
+  2. sync_trade_history    : 월별 매매 실거래 → trades
+  3. compare_auction_to_trades : 낙찰가 vs 비교 실거래 중앙값 (할인율)
+
+저장소(HistoryStore) 메서드는 동기(SQLite)이므로 asyncio.to_thread로 호출합니다.
+"""
+
+import asyncio
+import statistics
+
+from mcp.server.fastmcp import FastMCP
+
+from _helpers import API_KEY, ONBID_API_KEY, ONBID_BID_RESULT_URL, iter_molit_pages, iter_year_months
+from _store import get_store, trade_type_for_use
+from tools.onbid import _fetch_onbid_pages, _parse_onbid_bid_result, _thing_info_params
+from tools.trade import _TRADE_CONFIGS
+
+
+def _months_before(iso_date: str, months: int) -> str:
+    """ISO 날짜에서 months개월 이전 날짜 (일자는 1일 기준 근사)"""
+    y, m = int(iso_date[:4]), int(iso_date[5:7])
+    m -= months
+    while m <= 0:
+        y, m = y - 1, m + 12
+    return f"{y:04d}-{m:02d}-01"
+
+
+def _auction_discount(auction: dict, comps: list[int]) -> dict:
+    """낙찰가(원)와 비교 실거래 금액(만원) 목록으로 할인율 계산"""
+    median = statistics.median(comps)
+    winning_manwon = auction["winning_bid"] / 10000
+    return {
+        "item_no": auction["item_no"],
+        "item_name": auction["item_name"],
+        "location": auction["location"],
+        "use_type": auction["use_type"],
+        "area_m2": auction["area_m2"],
+        "bid_date": auction["bid_date"],
+        "winning_bid_만원": round(winning_manwon),
+        "appraised_value_만원": round((auction["appraised_value"] or 0) / 10000),
+        "comparable_count": len(comps),
+        "comparable_median_만원": median,
+        "discount_pct": round((1 - winning_manwon / median) * 100, 1),
+    }
+
+
+def register_auction_history_tools(mcp: FastMCP) -> None:
+    """공매 이력 저장/교차 분석 MCP 도구 등록"""
+
+    @mcp.tool()
+    async def sync_auction_history(
+        sido: str = "",
+        sigungu: str = "",
+        use_code: str = "",
+        bid_start_date: str = "",
+        bid_end_date: str = "",
+        max_pages: int = 50,
+    ) -> dict:
+        """
+        온비드 공매 입찰결과 전체 페이지를 조회해 로컬 이력 저장소에 적재합니다.
+        주소에서 시군구 코드를, 용도명에서 실거래 유형을 추출해 인덱싱합니다.
+
+        Args:
+            sido: 시도명 (예: '서울특별시')
+            sigungu: 시군구명 (예: '강남구')
+            use_code: 물건 용도 코드 (003=아파트, 004=오피스텔 등)
+            bid_start_date: 입찰 시작일 (YYYYMMDD)
+            bid_end_date: 입찰 종료일 (YYYYMMDD)
+            max_pages: 최대 페이지 수 (페이지당 100건, 기본 50)
+
+        Returns:
+            stored_count, failed_pages
+        """
+        if not ONBID_API_KEY:
+            return {"error": "ONBID_API_KEY 또는 DATA_GO_KR_API_KEY 환경변수가 설정되지 않았습니다."}
+
+        params = _thing_info_params(
+            sido=sido, sigungu=sigungu, use_code=use_code,
+            bid_start_date=bid_start_date, bid_end_date=bid_end_date,
+        )
+        store = get_store()
+        stored = 0
+        failed_pages: list[int] = []
+        async for page_no, data in _fetch_onbid_pages(
+            ONBID_BID_RESULT_URL, params, 100, max_pages=max(1, max_pages),
+        ):
+            if data is None:
+                failed_pages.append(page_no)
+                continue
+            stored += await asyncio.to_thread(store.upsert_auction_results, _parse_onbid_bid_result(data))
+
+        if stored == 0 and failed_pages:
+            return {"error": "온비드 입찰결과 API 요청 실패", "failed_pages": failed_pages}
+        return {"stored_count": stored, "failed_pages": sorted(failed_pages)}
+
+    @mcp.tool()
+    async def sync_trade_history(
+        region_code: str,
+        start_month: str,
+        end_month: str,
+        trade_type: str = "apt",
+    ) -> dict:
+        """
+        월별 매매 실거래를 조회해 로컬 이력 저장소에 적재합니다.
+        거래마다 식별 키(trade_key)가 있어, 같은 월을 다시 적재하면 늦게 신고된 거래는 추가하고
+        해제 신고(cancel_type)로 바뀐 거래는 갱신하며, 결과에서 빠진 거래는 삭제합니다.
+        한 달치를 페이지 단위로 모두 조회하며, 일부 페이지가 실패한 달은 삭제 없이 받은 거래만 반영합니다.
+
+        Args:
+            region_code: 법정동 앞 5자리 코드 (예: '11680')
+            start_month: 시작 년월 (YYYYMM)
+            end_month: 종료 년월 (YYYYMM)
+            trade_type: apt | offi | villa | house | commercial (기본 apt)
+
+        Returns:
+            months(년월별 stored/inserted/updated/deleted/unchanged/canceled), stored_count, changes(합계)
+        """
+        if not API_KEY:
+            return {"error": "DATA_GO_KR_API_KEY 환경변수가 설정되지 않았습니다."}
+        if trade_type not in _TRADE_CONFIGS:
+            return {"error": f"trade_type은 {list(_TRADE_CONFIGS.keys())} 중 하나여야 합니다."}
+        months = iter_year_months(start_month, end_month)
+        if not months:
+            return {"error": "start_month/end_month는 YYYYMM 형식이며 start ≤ end 여야 합니다."}
+
+        url, parser, label = _TRADE_CONFIGS[trade_type]
+        store = get_store()
+        summary: dict[str, dict] = {}
+        for ym in months:
+            # 한 달치 전체를 페이지로 모아야 조회 결과에서 빠진 거래(삭제 대상)를 판단할 수 있음
+            items: list[dict] = []
+            total_count, error = 0, None
+            async for page in iter_molit_pages(url, region_code, ym, parser, label):
+                if "error" in page:
+                    error = page["error"]
+                    break
+                total_count = page["total_count"]
+                items.extend(page["items"])
+            if error and not items:
+                summary[ym] = {"error": error}
+                continue
+            # 중간 페이지에서 실패하면 len(items) < total_count이므로 삭제 없이 받은 행만 반영
+            counts = await asyncio.to_thread(
+                store.upsert_trade_month, trade_type, region_code, ym, items, total_count,
+            )
+            summary[ym] = {**counts, "total_count": total_count}
+            if error:
+                summary[ym]["error"] = error
+
+        return {
+            "trade_type": trade_type,
+            "region_code": region_code,
+            "stored_count": sum(m.get("stored", 0) for m in summary.values()),
+            "changes": {
+                change: sum(m.get(change, 0) for m in summary.values())
+                for change in ("inserted", "updated", "deleted", "canceled")
+            },
+            "months": summary,
+        }
+
+    @mcp.tool()
+    async def compare_auction_to_trades(
+        region_code: str,
+        use_type: str = "",
+        trade_type: str = "",
+        months_back: int = 12,
+        area_tolerance_pct: float = 10.0,
+        min_comparables: int = 3,
+        limit: int = 50,
+    ) -> dict:
+        """
+        로컬 이력 저장소의 공매 낙찰가를 같은 시군구·유형·면적대의 최근 실거래 중앙값과 비교합니다.
+        sync_auction_history / sync_trade_history로 먼저 데이터를 적재하세요.
+
+        Args:
+            region_code: 시군구 5자리 코드 (예: '11680')
+            use_type: 온비드 용도명 필터 (예: '아파트'). 빈 값이면 전체
+            trade_type: 실거래 유형 필터 (apt/offi/villa/house/commercial). 빈 값이면 용도명으로 추론
+            months_back: 낙찰일 기준 비교 기간 (개월, 기본 12)
+            area_tolerance_pct: 면적 허용 오차 (%, 기본 ±10)
+            min_comparables: 비교 실거래 최소 건수 (기본 3)
+            limit: 분석할 최근 낙찰 건수 (기본 50)
+
+        Returns:
+            items(낙찰가/비교 중앙값/할인율), summary(평균·중앙 할인율), skipped(비교 불가 사유별 건수)
+        """
+        store = get_store()
+        auctions = await asyncio.to_thread(
+            store.auction_results, region_code, trade_type=trade_type, use_type=use_type, limit=limit,
+        )
+        if not auctions:
+            return {"error": "저장된 낙찰 이력이 없습니다. sync_auction_history를 먼저 실행하세요."}
+
+        items: list[dict] = []
+        skipped = {"no_trade_type": 0, "no_area": 0, "no_date": 0, "few_comparables": 0}
+        for auction in auctions:
+            ttype = auction["trade_type"] or trade_type_for_use(auction["use_type"])
+            if not ttype:
+                skipped["no_trade_type"] += 1
+                continue
+            if not auction["area_m2"]:
+                skipped["no_area"] += 1
+                continue
+            if not auction["bid_date"]:
+                skipped["no_date"] += 1
+                continue
+            band = auction["area_m2"] * area_tolerance_pct / 100
+            comps = await asyncio.to_thread(
+                store.comparable_amounts,
+                ttype, region_code,
+                auction["area_m2"] - band, auction["area_m2"] + band,
+                _months_before(auction["bid_date"], months_back), auction["bid_date"],
+            )
+            if len(comps) < max(1, min_comparables):
+                skipped["few_comparables"] += 1
+                continue
+            items.append(_auction_discount(auction, comps))
+
+        discounts = [i["discount_pct"] for i in items]
+        summary = {}
+        if discounts:
+            summary = {
+                "count": len(discounts),
+                "mean_discount_pct": round(statistics.mean(discounts), 1),
+                "median_discount_pct": round(statistics.median(discounts), 1),
+            }
+        return {
+            "region_code": region_code,
+            "analyzed_count": len(auctions),
+            "items": items,
+            "summary": summary,
+            "skipped": skipped,
+        }
@@ -5,19 +5,34 @@
 2) AptBasisInfoServiceV4/getAphusBassInfoV4 → 단지 상세 (hoCnt 세대수, 층수 등)
 
 사용 키: DATA_GO_KR_API_KEY (data.go.kr 동일 키, 각 API 별도 활용 신청 필요)
+
+시군구 단지 목록(COMPLEX_LIST_CACHE)과 단지 상세(COMPLEX_DETAIL_CACHE, kaptCode별)는 자주 바뀌지 않으므로
+MCP_COMPLEX_CACHE_TTL(기본 1일) 동안 보관해 데몬/HTTP 모드의 세션·요청끼리 공유합니다.
+조회에 실패한 상세(kaptCode만 있는 결과)는 캐시하지 않습니다.
 """
 
 import asyncio
+import os
 import re
-from typing import Optional
+from typing import Awaitable, Optional
 
-import httpx
+import _deadline
+from _cache import CACHE_TTL, TTLCache
+from _helpers import API_KEY, BASE_URL_OVERRIDE, _build_url, http_client
+from _metrics import UpstreamCall, register_cache
+from _shared import UPSTREAM_LIMITER
 
-from _helpers import API_KEY, _build_url
+_BASE      = BASE_URL_OVERRIDE or "https://apis.data.go.kr"
+LIST_URL   = f"{_BASE}/1613000/AptListService3/getSigunguAptList3"
+DETAIL_URL = f"{_BASE}/1613000/AptBasisInfoServiceV4/getAphusBassInfoV4"
+_TIMEOUT   = 15.0   # 외부 호출 타임아웃 상한 (초, 요청 마감이 더 가까우면 남은 시간까지)
 
-LIST_URL   = "https://apis.data.go.kr/1613000/AptListService3/getSigunguAptList3"
-DETAIL_URL = "https://apis.data.go.kr/1613000/AptBasisInfoServiceV4/getAphusBassInfoV4"
-_TIMEOUT   = httpx.Timeout(15.0)
+# MCP_CACHE_TTL=0(캐시 비활성)이면 함께 끔
+COMPLEX_CACHE_TTL = float(os.getenv("MCP_COMPLEX_CACHE_TTL", "86400")) if CACHE_TTL > 0 else 0.0
+COMPLEX_LIST_CACHE = TTLCache("complex_list", ttl=COMPLEX_CACHE_TTL)
+COMPLEX_DETAIL_CACHE = TTLCache("complex_detail", ttl=COMPLEX_CACHE_TTL, maxsize=4096)
+register_cache(COMPLEX_LIST_CACHE)
+register_cache(COMPLEX_DETAIL_CACHE)
 
 
 def _norm(name: str) -> str:
@@ -30,36 +45,55 @@ def _norm(name: str) -> str:
 async def _fetch_list_page(sigungu_code: str, page: int, rows: int) -> dict:
     params = {"sigunguCode": sigungu_code, "pageNo": str(page), "numOfRows": str(rows)}
     url = _build_url(LIST_URL, API_KEY, params)
-    async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
+    if _deadline.expired() or not await UPSTREAM_LIMITER.acquire("APT_LIST"):
+        return {}
+    with UpstreamCall("APT_LIST") as call:
         try:
-            r = await client.get(url)
+            r = await http_client().get(url, timeout=_deadline.upstream_timeout(_TIMEOUT))
+            call.response(r.status_code, len(r.content))
             r.raise_for_status()
             return r.json()
-        except Exception:
+        except Exception as e:
+            call.error(e)
             return {}
 
 
 async def fetch_complex_list(sigungu_code: str) -> list[dict]:
     """
-    시군구 코드로 전체 단지 목록 조회.
+    시군구 코드로 전체 단지 목록 조회 (COMPLEX_LIST_CACHE 경유).
     Returns: [{kaptCode, kaptName, kaptName_norm, bjdCode, as1~as3}, ...]
     """
+    cached = await COMPLEX_LIST_CACHE.get(sigungu_code)
+    if cached is not None:
+        return cached.value
+    async with COMPLEX_LIST_CACHE.single_flight(sigungu_code) as filled:
+        if filled is not None:
+            return filled.value
+        complexes, complete = await _fetch_complex_list(sigungu_code)
+        # 일부 페이지가 실패했거나 마감으로 잘린 목록은 캐시하지 않음
+        if complete and complexes:
+            await COMPLEX_LIST_CACHE.set(sigungu_code, complexes)
+    return complexes
+
+
+async def _fetch_complex_list(sigungu_code: str) -> tuple[list[dict], bool]:
+    """단지 목록 전체 페이지 조회 → (목록, 모든 페이지를 받았는지)"""
     rows = 1000
     first = await _fetch_list_page(sigungu_code, 1, rows)
     body = first.get("response", {}).get("body", {})
     items = body.get("items", []) or []
     total = int(body.get("totalCount", 0))
 
-    # 추가 페이지 병렬 조회
+    # 추가 페이지 병렬 조회 (요청 마감까지 끝난 페이지만)
     if total > rows:
         pages = range(2, (total // rows) + 2)
-        extras = await asyncio.gather(*[
+        extras = await _deadline.gather(*[
             _fetch_list_page(sigungu_code, p, rows) for p in pages
-        ])
+        ], fallback={})
         for ex in extras:
             items += ex.get("response", {}).get("body", {}).get("items", []) or []
 
-    return [
+    complexes = [
         {
             "kaptCode":      it.get("kaptCode", ""),
             "kaptName":      it.get("kaptName", ""),
@@ -70,6 +104,7 @@ async def fetch_complex_list(sigungu_code: str) -> list[dict]:
         for it in items
         if it.get("kaptCode")
     ]
+    return complexes, bool(first) and len(items) >= total
 
 
 # ── 2단계: 단지 상세 (hoCnt 세대수 등) ────────────────────────────────────────
@@ -77,9 +112,12 @@ async def fetch_complex_list(sigungu_code: str) -> list[dict]:
 async def _fetch_detail(kapt_code: str) -> dict:
     params = {"kaptCode": kapt_code}
     url = _build_url(DETAIL_URL, API_KEY, params)
-    async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
+    if _deadline.expired() or not await UPSTREAM_LIMITER.acquire("APT_DETAIL"):
+        return {"kaptCode": kapt_code}
+    with UpstreamCall("APT_DETAIL") as call:
         try:
-            r = await client.get(url)
+            r = await http_client().get(url, timeout=_deadline.upstream_timeout(_TIMEOUT))
+            call.response(r.status_code, len(r.content))
             r.raise_for_status()
             data = r.json()
             item = data.get("response", {}).get("body", {}).get("item", {}) or {}
@@ -94,19 +132,31 @@ async def _fetch_detail(kapt_code: str) -> dict:
                 "mgmt":       item.get("codeMgrNm"),      # 관리방식
                 "builder":    item.get("kaptBcompany"),   # 시공사
             }
-        except Exception:
+        except Exception as e:
+            call.error(e)
             return {"kaptCode": kapt_code}
 
 
 async def fetch_complex_details(kapt_codes: list[str]) -> dict[str, dict]:
     """
-    kaptCode 목록으로 상세정보 병렬 조회.
+    kaptCode 목록으로 상세정보 병렬 조회 (COMPLEX_DETAIL_CACHE에 없는 단지만 외부 호출).
+    요청 마감까지 끝나지 않은 단지는 kaptCode만 남깁니다.
     Returns: {kaptCode: detail_dict}
     """
     if not kapt_codes:
         return {}
-    results = await asyncio.gather(*[_fetch_detail(c) for c in kapt_codes])
-    return {r["kaptCode"]: r for r in results}
+    details: dict[str, dict] = {}
+    for code in kapt_codes:
+        cached = await COMPLEX_DETAIL_CACHE.get(code)
+        if cached is not None:
+            details[code] = cached.value
+    missing = [c for c in kapt_codes if c not in details]
+    results = await _deadline.gather(*[_fetch_detail(c) for c in missing])
+    for code, r in zip(missing, results):
+        details[code] = r or {"kaptCode": code}
+        if len(details[code]) > 1:   # 실패·중단 결과(kaptCode만)는 캐시하지 않음
+            await COMPLEX_DETAIL_CACHE.set(code, details[code])
+    return {code: details[code] for code in kapt_codes}
 
 
 # ── 통합 조회 ─────────────────────────────────────────────────────────────────
@@ -114,6 +164,7 @@ async def fetch_complex_details(kapt_codes: list[str]) -> dict[str, dict]:
 async def enrich_with_complex_info(
     sigungu_code: str,
     apt_names: list[str],
+    complex_list: Optional[Awaitable[list[dict]]] = None,
 ) -> tuple[dict[str, dict], str | None]:
     """
     아파트 이름 목록을 받아 단지 정보로 보강.
@@ -123,6 +174,8 @@ async def enrich_with_complex_info(
       2. apt_names를 정규화해 kaptCode 매칭
       3. getAphusBassInfoV4 → 매칭된 단지 상세 병렬 조회
 
+    complex_list: 미리 시작해 둔 fetch_complex_list() 태스크 (없으면 여기서 조회)
+
     Returns:
       (complex_map, error_msg)
       complex_map: {normalized_name: {kaptCode, kaptName, units, floor_max, ...}}
@@ -132,11 +185,13 @@ async def enrich_with_complex_info(
 
     # 1. 단지 목록
     try:
-        all_complexes = await fetch_complex_list(sigungu_code)
+        all_complexes = await (complex_list if complex_list is not None else fetch_complex_list(sigungu_code))
     except Exception as e:
         return {}, f"단지 목록 조회 실패: {e}"
 
     if not all_complexes:
+        if _deadline.was_cut():
+            return {}, f"단지 목록 조회 중단: {_deadline.DEADLINE_ERROR}"
         return {}, "해당 지역의 단지 목록이 없습니다."
 
     # 2. 이름 매칭 (exact → partial)
@@ -179,3 +234,77 @@ async def enrich_with_complex_info(
         }
 
     return complex_map, None
+
+
+# ── 거래 결과 조인 ────────────────────────────────────────────────────────────
+
+def start_complex_list(sigungu_code: str) -> "asyncio.Task[list[dict]] | None":
+    """
+    단지 목록 조회를 백그라운드 태스크로 시작 (거래 조회와 동시 진행용).
+    API 키가 없으면 None
+    """
+    if not API_KEY:
+        return None
+    return asyncio.create_task(fetch_complex_list(sigungu_code))
+
+
+def complex_by_name(apt_names: list[str], complex_map: dict[str, dict]) -> dict[str, dict]:
+    """거래 결과의 원래 단지명 → 단지정보 (매칭된 이름만)"""
+    return {
+        name: complex_map[_norm(name)]
+        for name in set(apt_names)
+        if name and _norm(name) in complex_map
+    }
+
+
+async def attach_complex_info(
+    sigungu_code: str,
+    data: dict,
+    complex_list: "asyncio.Task[list[dict]] | None",
+    name_field: str = "apt_name",
+) -> dict:
+    """
+    조회 결과(items)에 단지정보 조인. 원본(캐시) item은 수정하지 않습니다.
+
+    Returns:
+      data 복사본 + items[].complex, complex_matched_count, complex_error(실패 시),
+      partial(요청 마감으로 단지 조회 일부를 중단한 경우)
+    """
+    items = data.get("items", [])
+    names = [i.get(name_field, "") for i in items]
+    if complex_list is None:
+        complex_map, error = {}, "DATA_GO_KR_API_KEY 환경변수가 설정되지 않았습니다."
+    else:
+        complex_map, error = await enrich_with_complex_info(sigungu_code, names, complex_list)
+
+    by_name = complex_by_name(names, complex_map)
+    data = dict(data)
+    data["items"] = [{**item, "complex": by_name.get(item.get(name_field, ""))} for item in items]
+    data["complex_matched_count"] = len(by_name)
+    if error:
+        data["complex_error"] = error
+    return _deadline.mark_partial(data)
+
+
+async def join_complex_info(
+    sigungu_code: str,
+    result: Awaitable[dict],
+    name_field: str = "apt_name",
+) -> dict:
+    """
+    거래 조회와 단지 목록 조회를 동시에 진행한 뒤 단지정보를 조인
+
+    result: run_molit_tool(...) 등 거래 조회 코루틴 (total_count/items 반환)
+    """
+    complex_list = start_complex_list(sigungu_code)
+    try:
+        data = await result
+    except BaseException:
+        if complex_list is not None:
+            complex_list.cancel()
+        raise
+    if "error" in data:
+        if complex_list is not None:
+            complex_list.cancel()
+        return data
+    return await attach_complex_info(sigungu_code, data, complex_list, name_field)
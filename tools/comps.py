@@ -0,0 +1,89 @@
+"""
+유사 거래(comps) 검색 도구
+
+로컬 이력 저장소에 적재된 매매 실거래(sync_trade_history) 중에서
+대상 물건과 면적·건축년도·층·법정동·단지명·거래 시점이 가장 비슷한 거래 k건을 찾습니다.
+외부 API를 호출하지 않고 메모리 격자 인덱스(_comps.py)만 조회합니다.
+"""
+
+import math
+
+from mcp.server.fastmcp import FastMCP
+
+from _comps import get_comps_index
+from tools.trade import _TRADE_CONFIGS
+
+MAX_K = 100
+
+
+def find_comps(
+    region_code: str,
+    area_m2: float,
+    trade_type: str = "apt",
+    apt_name: str = "",
+    dong: str = "",
+    floor: int = 0,
+    build_year: int = 0,
+    k: int = 10,
+    months: int = 36,
+) -> dict:
+    """입력 검증 후 인덱스 검색 (MCP 도구와 GET /api/comps 공용)"""
+    if trade_type not in _TRADE_CONFIGS:
+        return {"error": f"trade_type은 {list(_TRADE_CONFIGS.keys())} 중 하나여야 합니다."}
+    if not region_code:
+        return {"error": "region_code가 필요합니다."}
+    if not area_m2 or not math.isfinite(area_m2) or area_m2 <= 0:
+        return {"error": "area_m2(전용면적 ㎡)는 0보다 큰 유한한 수여야 합니다."}
+
+    result = get_comps_index().search(
+        trade_type, region_code, float(area_m2),
+        k=max(1, min(int(k), MAX_K)),
+        floor=floor or None,
+        build_year=build_year or None,
+        dong=dong,
+        apt_name=apt_name,
+        months=max(0, int(months)),
+    )
+    if not result["indexed_count"]:
+        return {"error": f"저장된 {trade_type} 실거래가 없습니다. sync_trade_history(region_code='{region_code}', "
+                         f"trade_type='{trade_type}', ...)로 먼저 적재하세요."}
+    return {"region_code": region_code, "trade_type": trade_type, **result}
+
+
+def register_comps_tools(mcp: FastMCP) -> None:
+    """유사 거래 검색 MCP 도구 등록"""
+
+    @mcp.tool()
+    def find_comparable_trades(
+        region_code: str,
+        area_m2: float,
+        trade_type: str = "apt",
+        apt_name: str = "",
+        dong: str = "",
+        floor: int = 0,
+        build_year: int = 0,
+        k: int = 10,
+        months: int = 36,
+    ) -> dict:
+        """
+        대상 물건과 가장 비슷한 매매 실거래 k건을 로컬 이력 저장소에서 찾습니다. (외부 API 호출 없음)
+        sync_trade_history로 해당 시군구 실거래를 먼저 적재하세요.
+
+        유사도: 면적 5㎡ · 건축년도 5년 · 층 5개층 · 경과 6개월을 각각 1로 보고 합산하며,
+        법정동이 다르면 +1, 단지명이 다르면 +2 (지정한 경우)
+
+        Args:
+            region_code: 시군구 5자리 코드 (예: '11680')
+            area_m2: 대상 전용면적 (㎡, 예: 84.43)
+            trade_type: apt | offi | villa | house | commercial (기본 apt)
+            apt_name: 대상 단지명 (예: '은마'). 같은 단지 거래를 우선
+            dong: 법정동 (예: '대치동'). 같은 동 거래를 우선
+            floor: 대상 층 (0이면 고려하지 않음)
+            build_year: 건축년도 (0이면 고려하지 않음)
+            k: 반환 건수 (기본 10, 최대 100)
+            months: 최근 몇 개월 거래만 볼지 (기본 36, 0이면 전체)
+
+        Returns:
+            comps(가까운 순, distance 포함), summary_만원(중앙 거래가, ㎡당 중앙가, 추정가), indexed_count
+        """
+        return find_comps(region_code, area_m2, trade_type, apt_name, dong, floor, build_year, k, months)
@@ -0,0 +1,200 @@
+"""
+전세가율(전세 보증금 / 매매가) 분석 도구
+
+아파트 매매(APT_TRADE_URL)와 전월세(APT_RENT_URL)를 기간 내 월별로 동시에 조회한 뒤
+법정동 × 단지명(tools.complex._norm 정규화) × 전용면적 구간별로 묶어 ㎡당 중앙가로 전세가율을 계산합니다.
+해제(취소)된 거래(cancel_type 'O')는 빼고, 같은 이름의 단지가 다른 동에 있으면 따로 계산합니다.
+월 단위 조회 결과는 MOLIT_CACHE를 거치므로 같은 기간을 다시 분석하면 외부 호출이 없습니다.
+"""
+
+import asyncio
+import statistics
+
+from mcp.server.fastmcp import FastMCP
+
+import _deadline
+from _helpers import (
+    APT_RENT_URL,
+    APT_TRADE_URL,
+    API_KEY,
+    iter_year_months,
+    run_molit_tool,
+)
+from tools.complex import _norm
+from tools.rent import _parse_apt_rent
+from tools.trade import _parse_apt_trades
+
+MONTH_ROWS = 1000       # 월별 조회 행 수 (run_molit_tool 캐시 키와 같은 값이어야 캐시 공유)
+FETCH_CONCURRENCY = 8   # 동시 외부 호출 수
+MAX_MONTHS = 36
+
+
+def _area(value) -> float | None:
+    try:
+        area = float(value)
+    except (TypeError, ValueError):
+        return None
+    return area if area > 0 else None
+
+
+def _group_by_band(
+    trades: list[dict], rents: list[dict], band_m2: float,
+) -> dict[tuple[str, str, int], dict]:
+    """
+    (법정동, 정규화 단지명, 면적 구간) → {"name", "dong", "sale": [㎡당 매매가], "jeonse": [㎡당 전세 보증금]}
+
+    해제된 거래는 넣지 않습니다.
+    """
+    groups: dict[tuple[str, str, int], dict] = {}
+
+    def add(item: dict, price, column: str) -> None:
+        area = _area(item.get("area_m2"))
+        name = item.get("apt_name") or ""
+        if area is None or not isinstance(price, int) or price <= 0 or not name:
+            return
+        if item.get("cancel_type") == "O":
+            return
+        dong = item.get("dong") or ""
+        key = (dong, _norm(name), int(area // band_m2))
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {"name": name, "dong": dong, "sale": [], "jeonse": []}
+        group[column].append(price / area)
+
+    for item in trades:
+        add(item, item.get("amount"), "sale")
+    for item in rents:
+        if item.get("rent_type") == "전세":
+            add(item, item.get("deposit"), "jeonse")
+    return groups
+
+
+def jeonse_ratio_table(
+    trades: list[dict],
+    rents: list[dict],
+    *,
+    band_m2: float = 10.0,
+    min_count: int = 1,
+) -> list[dict]:
+    """단지 × 면적 구간별 전세가율 표 (전세가율 내림차순). 매매·전세가 각각 min_count건 이상인 구간만"""
+    rows = []
+    for (_, _, band), g in _group_by_band(trades, rents, band_m2).items():
+        if len(g["sale"]) < min_count or len(g["jeonse"]) < min_count:
+            continue
+        sale = statistics.median(g["sale"])
+        jeonse = statistics.median(g["jeonse"])
+        low = band * band_m2
+        rows.append({
+            "apt_name": g["name"],
+            "dong": g["dong"],
+            "area_band_m2": f"{low:g}~{low + band_m2:g}",
+            "sale_per_m2_만원": round(sale, 1),
+            "jeonse_per_m2_만원": round(jeonse, 1),
+            "jeonse_ratio_pct": round(jeonse / sale * 100, 1),
+            "sale_count": len(g["sale"]),
+            "jeonse_count": len(g["jeonse"]),
+        })
+    rows.sort(key=lambda r: (-r["jeonse_ratio_pct"], r["apt_name"], r["dong"], r["area_band_m2"]))
+    for rank, row in enumerate(rows, 1):
+        row["rank"] = rank
+    return rows
+
+
+async def fetch_trades_and_rents(region_code: str, months: list[str]) -> tuple[list[dict], list[dict], dict]:
+    """
+    기간 내 아파트 매매/전월세를 월별로 동시 조회 → (매매 items, 전월세 items, 월별 오류·잘림 정보)
+
+    요청 마감(_deadline)까지 끝나지 않은 월은 취소하고 오류 정보에 남깁니다.
+    """
+    semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+    async def fetch(url: str, ym: str, parser, label: str) -> dict:
+        async with semaphore:
+            return await run_molit_tool(url, region_code, ym, MONTH_ROWS, parser, label)
+
+    jobs = [
+        fetch(url, ym, parser, label)
+        for ym in months
+        for url, parser, label in (
+            (APT_TRADE_URL, _parse_apt_trades, "아파트 매매"),
+            (APT_RENT_URL, _parse_apt_rent, "아파트 전월세"),
+        )
+    ]
+    results = await _deadline.gather(*jobs, fallback={"error": _deadline.DEADLINE_ERROR})
+
+    trades: list[dict] = []
+    rents: list[dict] = []
+    issues: dict[str, dict] = {}
+    for i, result in enumerate(results):
+        ym, kind = months[i // 2], ("trade", "rent")[i % 2]
+        if "error" in result:
+            issues.setdefault(ym, {})[kind] = result["error"]
+            continue
+        (trades if kind == "trade" else rents).extend(result["items"])
+        if result["total_count"] > result["returned_count"]:
+            issues.setdefault(ym, {})[kind] = f"{result['total_count']}건 중 {result['returned_count']}건만 반영"
+    return trades, rents, issues
+
+
+def register_jeonse_tools(mcp: FastMCP) -> None:
+    """전세가율 MCP 도구 등록"""
+
+    @mcp.tool()
+    async def get_jeonse_ratio(
+        region_code: str,
+        start_month: str,
+        end_month: str,
+        area_band_m2: float = 10.0,
+        min_count: int = 1,
+        limit: int = 50,
+    ) -> dict:
+        """
+        기간 내 아파트 매매·전세 실거래를 함께 조회해 법정동 × 단지 × 전용면적 구간별 전세가율을 계산합니다.
+        전세가율 = 전세 보증금 ㎡당 중앙값 / 매매가 ㎡당 중앙값 × 100. 전세가율 높은 순으로 정렬합니다.
+        해제(취소)된 거래는 계산에서 뺍니다.
+
+        Args:
+            region_code: 법정동 앞 5자리 코드 (예: '11680')
+            start_month: 시작 년월 (YYYYMM)
+            end_month: 종료 년월 (YYYYMM, 최대 36개월)
+            area_band_m2: 전용면적 구간 폭 (㎡, 기본 10 → 80~90㎡)
+            min_count: 구간별 매매·전세 최소 건수 (기본 1)
+            limit: 반환할 행 수 (기본 50)
+
+        Returns:
+            items(rank, 단지명, 면적 구간, ㎡당 매매/전세 중앙가, jeonse_ratio_pct, 건수),
+            summary(구간 수, 전세가율 중앙값), months_with_issues(조회 실패/잘린 월),
+            partial(요청 마감으로 일부 월을 조회하지 못한 경우 True)
+        """
+        if not API_KEY:
+            return {"error": "DATA_GO_KR_API_KEY 환경변수가 설정되지 않았습니다."}
+        months = iter_year_months(start_month, end_month)
+        if not months:
+            return {"error": "start_month/end_month는 YYYYMM 형식이며 start ≤ end 여야 합니다."}
+        if len(months) > MAX_MONTHS:
+            return {"error": f"기간은 최대 {MAX_MONTHS}개월입니다."}
+        if area_band_m2 <= 0:
+            return {"error": "area_band_m2는 0보다 커야 합니다."}
+
+        trades, rents, issues = await fetch_trades_and_rents(region_code, months)
+        if not trades and not rents and issues:
+            return {"error": "아파트 매매/전월세 API 요청 실패", "months_with_issues": issues}
+
+        table = jeonse_ratio_table(trades, rents, band_m2=area_band_m2, min_count=max(1, min_count))
+        result = {
+            "region_code": region_code,
+            "start_month": months[0],
+            "end_month": months[-1],
+            "trade_count": len(trades),
+            "rent_count": len(rents),
+            "summary": {
+                "band_count": len(table),
+                "median_jeonse_ratio_pct": (
+                    round(statistics.median(r["jeonse_ratio_pct"] for r in table), 1) if table else None
+                ),
+            },
+            "items": table[: max(1, limit)],
+        }
+        if issues:
+            result["months_with_issues"] = issues
+        return _deadline.mark_partial(result)
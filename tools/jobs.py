@@ -0,0 +1,85 @@
+"""
+리포트 작업 도구 (전국·다년 분석)
+
+요청 한 번에 끝나지 않는 (시군구 × 월) 대량 조회를 작업으로 제출하고,
+작업 ID로 진행률과 (부분) 결과를 조회합니다. 작업 큐 구현은 _jobs.py 참고.
+"""
+
+from mcp.server.fastmcp import FastMCP
+
+from _jobs import cancel_job, get_job_runner, job_result, job_status, recent_jobs, submit_job
+
+
+def register_jobs_tools(mcp: FastMCP) -> None:
+    """리포트 작업 MCP 도구 등록"""
+
+    @mcp.tool()
+    async def submit_report_job(
+        regions: str,
+        start_month: str,
+        end_month: str,
+        kind: str = "trades",
+        deal_type: str = "apt",
+    ) -> dict:
+        """
+        여러 시군구·여러 달에 걸친 실거래 리포트를 백그라운드 작업으로 제출하고 작업 ID를 바로 반환합니다.
+        진행률은 get_report_job, 결과는 get_report_job_result로 조회하세요. 서버가 재시작돼도 이어서 실행됩니다.
+
+        Args:
+            regions: 쉼표 구분 지역 (시군구 코드 '11680', 시도명 '서울', 또는 '전국')
+            start_month: 시작 년월 (YYYYMM)
+            end_month: 종료 년월 (YYYYMM)
+            kind: trades(매매가) | rent(전세 보증금) (기본 trades)
+            deal_type: apt | offi | villa | house (+ commercial, 매매만) (기본 apt)
+
+        Returns:
+            job_id, total_units(시군구 × 월 조회 수), spec(확장된 시군구 목록 포함)
+        """
+        return await submit_job({
+            "kind": kind, "type": deal_type, "regions": regions,
+            "start_month": start_month, "end_month": end_month,
+        })
+
+    @mcp.tool()
+    async def get_report_job(job_id: str = "") -> dict:
+        """
+        리포트 작업 상태와 진행률을 조회합니다. job_id를 비우면 최근 작업 목록을 반환합니다.
+
+        Args:
+            job_id: submit_report_job이 반환한 작업 ID
+
+        Returns:
+            status(queued | running | done | failed | canceled), progress(done_units/total_units/pct)
+        """
+        get_job_runner().start()   # 이전 세션에서 남은 작업 이어받기
+        if not job_id:
+            return {"jobs": await recent_jobs(20)}
+        status = await job_status(job_id)
+        return status if status is not None else {"error": f"작업을 찾을 수 없습니다: {job_id}"}
+
+    @mcp.tool()
+    async def get_report_job_result(job_id: str) -> dict:
+        """
+        리포트 작업 결과를 조회합니다. 완료 전이면 지금까지 끝난 단위만 집계한 부분 결과(partial=True)입니다.
+
+        Args:
+            job_id: submit_report_job이 반환한 작업 ID
+
+        Returns:
+            regions(시군구별 건수·중앙값·월별 요약, 중앙값 높은 순), errors(실패 단위), partial
+        """
+        get_job_runner().start()
+        result = await job_result(job_id)
+        return result if result is not None else {"error": f"작업을 찾을 수 없습니다: {job_id}"}
+
+    @mcp.tool()
+    async def cancel_report_job(job_id: str) -> dict:
+        """
+        대기 중이거나 실행 중인 리포트 작업을 취소합니다. 이미 기록된 부분 결과는 남습니다.
+
+        Args:
+            job_id: 취소할 작업 ID
+        """
+        if not await cancel_job(job_id):
+            return {"error": f"취소할 수 있는 작업이 아닙니다: {job_id}"}
+        return {"job_id": job_id, "status": "canceled"}
@@ -0,0 +1,129 @@
+"""
+반경/범위 조회 도구 (오프라인 지오코딩)
+
+좌표 파일(REALESTATE_GEOCODE_PATH, _geo.py 참고)로 주소를 좌표로 바꾸고,
+로컬 이력 저장소의 매매 실거래·공매 입찰결과를 geohash 인덱스로 반경 조회합니다.
+외부 지오코더나 데이터 API를 호출하지 않습니다.
+"""
+
+from datetime import date, timedelta
+
+from mcp.server.fastmcp import FastMCP
+
+from _geo import get_geocoder, get_store_geo_index
+from tools.trade import _TRADE_CONFIGS
+
+MAX_RADIUS_M = 20_000
+
+
+def register_nearby_tools(mcp: FastMCP) -> None:
+    """지오코딩/반경 조회 MCP 도구 등록"""
+
+    @mcp.tool()
+    def geocode_address(address: str) -> dict:
+        """
+        지번 주소를 로컬 좌표 파일로 위경도로 바꿉니다. (외부 지오코더 호출 없음)
+        건축인허가 plat_plc, 온비드 location, '시군구 법정동 지번' 형식을 받습니다.
+
+        Args:
+            address: 지번 주소 (예: '서울특별시 강남구 대치동 316')
+
+        Returns:
+            lat, lon, precision(jibun=지번 일치 | bun=본번 일치 | dong=법정동 대표 좌표)
+        """
+        geocoder = get_geocoder()
+        if not geocoder.loaded:
+            return {"error": geocoder.error}
+        point = geocoder.locate_address(address)
+        if point is None:
+            return {"error": f"좌표를 찾을 수 없습니다: {address}"}
+        return {"address": address, "lat": point[0], "lon": point[1], "precision": point[2]}
+
+    @mcp.tool()
+    def find_nearby_transactions(
+        lat: float = 0.0,
+        lon: float = 0.0,
+        radius_m: float = 1000.0,
+        address: str = "",
+        trade_type: str = "apt",
+        region_code: str = "",
+        months: int = 12,
+        include_auctions: bool = True,
+        limit: int = 50,
+    ) -> dict:
+        """
+        중심 좌표(또는 주소)에서 반경 안의 매매 실거래와 공매 입찰결과를 가까운 순으로 찾습니다.
+        sync_trade_history / sync_auction_history로 적재한 데이터만 대상입니다. (외부 API 호출 없음)
+
+        Args:
+            lat: 중심 위도 (예: 37.4979, 역 좌표 등)
+            lon: 중심 경도 (예: 127.0276)
+            radius_m: 반경 (m, 기본 1000, 최대 20000)
+            address: lat/lon 대신 중심으로 쓸 지번 주소
+            trade_type: apt | offi | villa | house | commercial (기본 apt)
+            region_code: 시군구 5자리 코드로 한정 (빈 값이면 저장된 전체)
+            months: 최근 몇 개월 거래/입찰만 (기본 12, 0이면 전체)
+            include_auctions: 공매 입찰결과 포함 여부 (기본 True)
+            limit: 유형별 최대 반환 건수 (기본 50)
+
+        Returns:
+            trades / auctions (distance_m, geocode precision 포함), unlocated_count(좌표를 못 찾은 건수)
+        """
+        geocoder = get_geocoder()
+        if not geocoder.loaded:
+            return {"error": geocoder.error}
+        if trade_type not in _TRADE_CONFIGS:
+            return {"error": f"trade_type은 {list(_TRADE_CONFIGS.keys())} 중 하나여야 합니다."}
+        if address:
+            point = geocoder.locate_address(address)
+            if point is None:
+                return {"error": f"중심 주소의 좌표를 찾을 수 없습니다: {address}"}
+            lat, lon = point[0], point[1]
+        elif not lat or not lon:
+            return {"error": "lat/lon 또는 address가 필요합니다."}
+        if not 0 < radius_m <= MAX_RADIUS_M:
+            return {"error": f"radius_m은 0 초과 {MAX_RADIUS_M} 이하여야 합니다."}
+
+        since = (date.today() - timedelta(days=int(months * 30.44))).isoformat() if months > 0 else ""
+        index = get_store_geo_index()
+        limit = max(1, limit)
+
+        trade_index, trade_missing = index.trades(trade_type)
+        trades = []
+        for distance, (row, precision) in trade_index.within(lat, lon, radius_m):
+            if region_code and row["region_code"] != region_code:
+                continue
+            if since and (row["deal_date"] or "") < since:
+                continue
+            trades.append({
+                "name": row["name"], "dong": row["dong"], "jibun": row["jibun"], "area_m2": row["area_m2"],
+                "floor": row["floor"], "amount": row["amount"], "deal_date": row["deal_date"],
+                "distance_m": round(distance), "precision": precision,
+            })
+        result = {
+            "center": {"lat": lat, "lon": lon},
+            "radius_m": radius_m,
+            "trade_type": trade_type,
+            "trade_count": len(trades),
+            "trades": trades[:limit],
+            "unlocated_count": {"trades": trade_missing},
+        }
+
+        if include_auctions:
+            auction_index, auction_missing = index.auctions()
+            auctions = []
+            for distance, (row, precision) in auction_index.within(lat, lon, radius_m):
+                if region_code and row["sigungu_code"] != region_code:
+                    continue
+                if since and (row["bid_date"] or "") < since:
+                    continue
+                auctions.append({
+                    "item_no": row["item_no"], "item_name": row["item_name"], "location": row["location"],
+                    "use_type": row["use_type"], "area_m2": row["area_m2"], "appraised_value": row["appraised_value"],
+                    "winning_bid": row["winning_bid"], "bid_date": row["bid_date"],
+                    "distance_m": round(distance), "precision": precision,
+                })
+            result["auction_count"] = len(auctions)
+            result["auctions"] = auctions[:limit]
+            result["unlocated_count"]["auctions"] = auction_missing
+        return result
@@ -8,8 +8,9 @@
 온비드 공공데이터 API: http://apis.data.go.kr/1230000/OnbidService/
 """
 
+import asyncio
 import os
-from typing import Any
+from typing import Any, AsyncIterator
 
 from mcp.server.fastmcp import FastMCP
 
@@ -22,6 +23,7 @@ from _helpers import (
     _txt,
     _parse_amount,
 )
+from _stats import StreamingStats
 
 # 온비드 물건 용도 코드 (주요)
 ONBID_USE_CODES = {
@@ -63,6 +65,7 @@ def _parse_onbid_bid_result(data: Any) -> list[dict]:
                 "item_name": rec.get("goodsNm", "") or rec.get("cltrNm", ""),
                 "location": rec.get("ldtlAddr", "") or rec.get("rdnAddr", ""),
                 "use_type": rec.get("useNm", ""),
+                "area_m2": rec.get("totArea", "") or rec.get("exclsArea", ""),
                 "appraised_value": _parse_amount(str(rec.get("apprAmt", "0"))),
                 "minimum_bid": _parse_amount(str(rec.get("minBidAmt", "0"))),
                 "winning_bid": _parse_amount(str(rec.get("sucsBidAmt", "0") or rec.get("sellAmt", "0"))),
@@ -106,6 +109,144 @@ def _parse_onbid_thing_info(data: Any) -> list[dict]:
     return items
 
 
+def _thing_info_params(
+    *,
+    sido: str = "",
+    sigungu: str = "",
+    use_code: str = "",
+    disposal_method: str = "",
+    min_price: int = 0,
+    max_price: int = 0,
+    bid_start_date: str = "",
+    bid_end_date: str = "",
+    keyword: str = "",
+) -> dict[str, Any]:
+    """공매 물건목록 조회 파라미터 구성 (numOfRows/pageNo 제외)"""
+    params: dict[str, Any] = {"serviceKey": ONBID_API_KEY}
+    if sido:
+        params["sido"] = sido
+    if sigungu:
+        params["sigungu"] = sigungu
+    if use_code:
+        params["useCode"] = use_code
+    if disposal_method:
+        params["dspslMthd"] = disposal_method
+    if min_price > 0:
+        params["minBidAmtFrom"] = str(min_price * 10000)
+    if max_price > 0:
+        params["minBidAmtTo"] = str(max_price * 10000)
+    if bid_start_date:
+        params["pbctBgngDt"] = bid_start_date
+    if bid_end_date:
+        params["pbctEndDt"] = bid_end_date
+    if keyword:
+        params["goodsNm"] = keyword
+    return params
+
+
+def _winning_rate(item: dict) -> float | None:
+    """낙찰가율(%) = 낙찰가 / 최저입찰가 × 100. 계산 불가 시 None"""
+    if item.get("winning_bid") and item["winning_bid"] > 0 \
+            and item.get("minimum_bid") and item["minimum_bid"] > 0:
+        return round(item["winning_bid"] / item["minimum_bid"] * 100, 1)
+    return None
+
+
+def _onbid_total_count(data: dict) -> int:
+    try:
+        return int(data.get("response", {}).get("body", {}).get("totalCount", 0) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+async def _fetch_onbid_pages(
+    url: str,
+    params: dict,
+    num_of_rows: int,
+    *,
+    max_pages: int = 200,
+    concurrency: int = 5,
+) -> AsyncIterator[tuple[int, dict | None]]:
+    """
+    온비드 API 전체 페이지를 병렬 조회하며 도착 순서대로 (page_no, data) 반환
+
+    1페이지로 totalCount를 확인한 뒤 나머지 페이지를 concurrency 개씩
+    동시에 요청합니다. 실패한 페이지는 data=None으로 반환됩니다.
+    """
+    first = await _fetch_json(url, {**params, "numOfRows": str(num_of_rows), "pageNo": "1"})
+    yield 1, first
+    if first is None:
+        return
+
+    total = _onbid_total_count(first)
+    last_page = min(max_pages, -(-total // num_of_rows))
+    if last_page < 2:
+        return
+
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one(page: int) -> tuple[int, dict | None]:
+        async with sem:
+            data = await _fetch_json(url, {**params, "numOfRows": str(num_of_rows), "pageNo": str(page)})
+            return page, data
+
+    for fut in asyncio.as_completed([_one(p) for p in range(2, last_page + 1)]):
+        yield await fut
+
+
+async def _collect_bid_result_stats(
+    params: dict,
+    num_of_rows: int,
+    max_pages: int,
+    concurrency: int,
+) -> dict:
+    """입찰결과 전체 페이지를 순회하며 낙찰가율 스트리밍 통계 누적 (항목은 보관하지 않음)"""
+    overall = StreamingStats()
+    by_use_type: dict[str, StreamingStats] = {}
+    total_count = 0
+    scanned = 0
+    failed_pages: list[int] = []
+    pages_fetched = 0
+
+    async for page_no, data in _fetch_onbid_pages(
+        ONBID_BID_RESULT_URL, params, num_of_rows,
+        max_pages=max_pages, concurrency=concurrency,
+    ):
+        if data is None:
+            failed_pages.append(page_no)
+            continue
+        pages_fetched += 1
+        if page_no == 1:
+            total_count = _onbid_total_count(data)
+        for item in _parse_onbid_bid_result(data):
+            scanned += 1
+            rate = _winning_rate(item)
+            if rate is None:
+                continue
+            overall.add(rate)
+            use_type = item.get("use_type") or "미분류"
+            by_use_type.setdefault(use_type, StreamingStats()).add(rate)
+
+    if pages_fetched == 0:
+        return {"error": "온비드 입찰결과 API 요청 실패"}
+
+    name_to_code = {v: k for k, v in ONBID_USE_CODES.items()}
+    return {
+        "total_count": total_count,
+        "scanned_count": scanned,
+        "pages_fetched": pages_fetched,
+        "failed_pages": sorted(failed_pages),
+        "truncated": total_count > max_pages * num_of_rows,
+        "statistics": {
+            "winning_rate_pct": overall.summary(),
+            "by_use_type": {
+                use_type: {"use_code": name_to_code.get(use_type, ""), **stats.summary()}
+                for use_type, stats in sorted(by_use_type.items(), key=lambda kv: -kv[1].count)
+            },
+        },
+    }
+
+
 def register_onbid_tools(mcp: FastMCP) -> None:
     """공매 관련 MCP 도구 등록"""
 
@@ -148,30 +289,13 @@ def register_onbid_tools(mcp: FastMCP) -> None:
                 "tip": "data.go.kr에서 온비드 공매정보 API 활용신청 후 키를 발급받으세요.",
             }
 
-        params: dict[str, Any] = {
-            "serviceKey": ONBID_API_KEY,
-            "numOfRows": str(num_of_rows),
-            "pageNo": str(page_no),
-        }
-
-        if sido:
-            params["sido"] = sido
-        if sigungu:
-            params["sigungu"] = sigungu
-        if use_code:
-            params["useCode"] = use_code
-        if disposal_method:
-            params["dspslMthd"] = disposal_method
-        if min_price > 0:
-            params["minBidAmtFrom"] = str(min_price * 10000)
-        if max_price > 0:
-            params["minBidAmtTo"] = str(max_price * 10000)
-        if bid_start_date:
-            params["pbctBgngDt"] = bid_start_date
-        if bid_end_date:
-            params["pbctEndDt"] = bid_end_date
-        if keyword:
-            params["goodsNm"] = keyword
+        params = _thing_info_params(
+            sido=sido, sigungu=sigungu, use_code=use_code, disposal_method=disposal_method,
+            min_price=min_price, max_price=max_price,
+            bid_start_date=bid_start_date, bid_end_date=bid_end_date, keyword=keyword,
+        )
+        params["numOfRows"] = str(num_of_rows)
+        params["pageNo"] = str(page_no)
 
         data = await _fetch_json(ONBID_THING_INFO_URL, params)
         if data is None:
@@ -200,6 +324,9 @@ def register_onbid_tools(mcp: FastMCP) -> None:
         keyword: str = "",
         num_of_rows: int = 50,
         page_no: int = 1,
+        all_pages: bool = False,
+        max_pages: int = 200,
+        concurrency: int = 5,
     ) -> dict:
         """
         온비드(Onbid) 공매 입찰 결과(낙찰가 포함)를 조회합니다.
@@ -211,11 +338,16 @@ def register_onbid_tools(mcp: FastMCP) -> None:
             bid_start_date: 입찰 시작일 (YYYYMMDD)
             bid_end_date: 입찰 종료일 (YYYYMMDD)
             keyword: 물건명 키워드
-            num_of_rows: 최대 조회 건수 (기본 50)
+            num_of_rows: 최대 조회 건수 (기본 50). all_pages=True이면 페이지당 건수
             page_no: 페이지 번호
+            all_pages: True이면 전체 페이지를 병렬 조회해 지역 전체 낙찰가율 통계만 반환
+                       (items 미포함, 평균/최댓값/분위수/용도별 분포)
+            max_pages: all_pages 모드 최대 페이지 수 (기본 200)
+            concurrency: all_pages 모드 동시 요청 수 (기본 5)
 
         Returns:
             total_count, items(물건번호/명/위치/감정가/최저입찰가/낙찰가/입찰일/상태/기관)
+            all_pages=True: total_count, scanned_count, statistics(winning_rate_pct, by_use_type)
         """
         if not ONBID_API_KEY:
             return {
@@ -241,6 +373,13 @@ def register_onbid_tools(mcp: FastMCP) -> None:
         if keyword:
             params["goodsNm"] = keyword
 
+        if all_pages:
+            params.pop("numOfRows")
+            params.pop("pageNo")
+            return await _collect_bid_result_stats(
+                params, num_of_rows, max(1, max_pages), max(1, concurrency),
+            )
+
         data = await _fetch_json(ONBID_BID_RESULT_URL, params)
         if data is None:
             return {"error": "온비드 입찰결과 API 요청 실패"}
@@ -251,19 +390,17 @@ def register_onbid_tools(mcp: FastMCP) -> None:
         )
 
         # 낙찰률 계산
-        winning_bids = [i for i in items if i.get("winning_bid") and i["winning_bid"] > 0]
         stats = {}
-        if winning_bids:
-            rates = []
-            for i in winning_bids:
-                if i.get("minimum_bid") and i["minimum_bid"] > 0:
-                    rate = round(i["winning_bid"] / i["minimum_bid"] * 100, 1)
-                    rates.append(rate)
-                    i["winning_rate_pct"] = rate
-            if rates:
-                import statistics as stat
-                stats["avg_winning_rate_pct"] = round(stat.mean(rates), 1)
-                stats["max_winning_rate_pct"] = max(rates)
+        rates = []
+        for i in items:
+            rate = _winning_rate(i)
+            if rate is not None:
+                rates.append(rate)
+                i["winning_rate_pct"] = rate
+        if rates:
+            import statistics as stat
+            stats["avg_winning_rate_pct"] = round(stat.mean(rates), 1)
+            stats["max_winning_rate_pct"] = max(rates)
 
         return {
             "total_count": total_count,
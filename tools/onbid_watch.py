@@ -0,0 +1,363 @@
+"""
+온비드 공매 물건 변경 피드 (watchlist 폴러)
+
+시도/용도 등 필터 조합(watch)별로 공매 물건 전체 목록을 주기적으로 조회해
+물건관리번호(cltrMngNo) 기준 스냅샷과 비교하고, 변경분만 이벤트로 쌓습니다.
+
+  - added:   새로 등록된 물건
+  - removed: 목록에서 사라진 물건
+  - changed: 최저입찰가(minBidAmt) 또는 입찰 시작/종료일 변경
+
+소비자는 마지막으로 받은 seq 이후의 이벤트만 가져가면 되므로
+전체 목록을 다시 내려받고 파싱할 필요가 없습니다.
+  - MCP 도구: watch_public_auction_items / get_public_auction_changes
+  - HTTP SSE: GET /api/onbid/changes (web_api.py)
+
+watch는 최대 ONBID_WATCH_MAX개까지 등록합니다. SSE 요청의 필터로 자동 등록된 watch는 연결된 SSE
+클라이언트가 없고 ONBID_WATCH_IDLE초 동안 조회(SSE/get_public_auction_changes)가 없으면 해제합니다.
+MCP 도구로 등록한 watch는 unwatch_public_auction_items로 해제할 때까지 유지합니다.
+
+watch와 이벤트 로그는 프로세스 메모리에만 있으므로 MCP_WORKERS=1에서만 사용할 수 있습니다.
+여러 워커로 실행하면 (server.py, stateless HTTP) 요청마다 다른 워커로 가서 등록한 watch를 찾지 못하므로
+MCP 도구와 SSE 모두 WATCH_UNAVAILABLE 오류를 반환합니다.
+
+환경 변수:
+  ONBID_WATCH_INTERVAL - 재조회 주기 기본값 (초, 기본 300)
+  ONBID_WATCH_MAX      - 최대 watch 수 (기본 50)
+  ONBID_WATCH_IDLE     - 자동 등록 watch 유휴 해제 시간 (초, 기본 1800)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import deque
+from typing import Any
+
+from mcp.server.fastmcp import FastMCP
+
+from _deadline import unbounded
+from _helpers import ONBID_API_KEY, ONBID_THING_INFO_URL
+from _shared import WORKERS
+from tools.onbid import _fetch_onbid_pages, _parse_onbid_thing_info, _thing_info_params
+
+# 변경 감지 대상 필드 (파싱 결과 키)
+TRACKED_FIELDS = ("minimum_bid", "bid_start_date", "bid_end_date")
+
+WATCH_INTERVAL_SEC = int(os.getenv("ONBID_WATCH_INTERVAL", "300"))
+WATCH_MAX = int(os.getenv("ONBID_WATCH_MAX", "50"))
+WATCH_IDLE_SEC = float(os.getenv("ONBID_WATCH_IDLE", "1800"))
+_EVENT_LOG_SIZE = 5000
+
+# 여러 워커로 실행 중이면 사용 불가 사유 (비어 있으면 사용 가능)
+WATCH_UNAVAILABLE = (
+    f"공매 물건 변경 피드는 단일 워커(MCP_WORKERS=1)에서만 사용할 수 있습니다 (현재 {WORKERS}개). "
+    "watch가 워커 프로세스 메모리에 있어 다른 워커로 간 요청에서는 찾을 수 없습니다."
+    if WORKERS > 1 else ""
+)
+_PAGE_ROWS = 100
+
+
+def _diff_snapshot(old: dict[str, dict], new: dict[str, dict]) -> list[dict]:
+    """두 스냅샷({item_no: item})을 비교해 added/removed/changed 이벤트 목록 생성"""
+    events: list[dict] = []
+    for item_no, item in new.items():
+        prev = old.get(item_no)
+        if prev is None:
+            events.append({"type": "added", "item_no": item_no, "item": item})
+            continue
+        changes = {
+            f: {"old": prev.get(f), "new": item.get(f)}
+            for f in TRACKED_FIELDS
+            if prev.get(f) != item.get(f)
+        }
+        if changes:
+            events.append({"type": "changed", "item_no": item_no, "changes": changes, "item": item})
+    for item_no, item in old.items():
+        if item_no not in new:
+            events.append({"type": "removed", "item_no": item_no, "item": item})
+    return events
+
+
+class AuctionWatch:
+    """필터 조합 하나에 대한 스냅샷과 변경 이벤트 로그"""
+
+    def __init__(self, filters: dict[str, Any], interval_sec: int, auto: bool = False) -> None:
+        self.filters = filters
+        self.watch_id = hashlib.sha1(
+            json.dumps(filters, sort_keys=True, ensure_ascii=False).encode()
+        ).hexdigest()[:12]
+        self.interval_sec = interval_sec
+        self.snapshot: dict[str, dict] = {}
+        self.events: deque[dict] = deque(maxlen=_EVENT_LOG_SIZE)
+        self.seq = 0
+        self.baseline_ready = False
+        self.last_polled: float | None = None
+        self.last_error: str | None = None
+        self.auto = auto                      # SSE 필터로 자동 등록 (유휴 시 해제 대상)
+        self.clients = 0                      # 연결 중인 SSE 스트림 수
+        self.last_seen = time.monotonic()     # 마지막 조회 시각
+        self._changed = asyncio.Event()
+        self._lock = asyncio.Lock()
+
+    async def poll(self) -> list[dict]:
+        """전체 목록 재조회 후 스냅샷 비교. 새로 생긴 이벤트 목록 반환"""
+        async with self._lock:
+            params = _thing_info_params(**self.filters)
+            current: dict[str, dict] = {}
+            failed = False
+            async for _, data in _fetch_onbid_pages(ONBID_THING_INFO_URL, params, _PAGE_ROWS):
+                if data is None:
+                    failed = True
+                    continue
+                for item in _parse_onbid_thing_info(data):
+                    if item.get("item_no"):
+                        current[item["item_no"]] = item
+
+            self.last_polled = time.time()
+            if failed:
+                # 일부 페이지 실패 시 removed 오탐을 막기 위해 스냅샷을 갱신하지 않음
+                self.last_error = "일부 페이지 조회 실패 - 이번 주기 변경분 계산을 건너뜁니다."
+                return []
+            self.last_error = None
+
+            if not self.baseline_ready:
+                self.snapshot = current
+                self.baseline_ready = True
+                return []
+
+            new_events = _diff_snapshot(self.snapshot, current)
+            self.snapshot = current
+            now = time.strftime("%Y-%m-%dT%H:%M:%S")
+            for ev in new_events:
+                self.seq += 1
+                ev["seq"] = self.seq
+                ev["detected_at"] = now
+                self.events.append(ev)
+            if new_events:
+                self._changed.set()
+                self._changed = asyncio.Event()
+            return new_events
+
+    def touch(self) -> None:
+        self.last_seen = time.monotonic()
+
+    def idle(self, now: float) -> bool:
+        """자동 등록 watch가 클라이언트 없이 WATCH_IDLE_SEC 넘게 조회되지 않았는지"""
+        return self.auto and self.clients == 0 and now - self.last_seen > WATCH_IDLE_SEC
+
+    def events_since(self, since_seq: int, limit: int = 500) -> list[dict]:
+        return [ev for ev in self.events if ev["seq"] > since_seq][:limit]
+
+    @property
+    def changed(self) -> asyncio.Event:
+        """다음 변경 때 set될 Event. events_since() 전에 잡아 두고 wait_for_change()에 넘김"""
+        return self._changed
+
+    async def wait_for_change(self, timeout: float, changed: asyncio.Event | None = None) -> bool:
+        """
+        새 이벤트가 생길 때까지 대기 (SSE용). 타임아웃 시 False
+
+        changed에 events_since() 전에 잡아 둔 self.changed를 넘기면 그 사이에 생긴 변경도 놓치지 않습니다.
+        """
+        try:
+            await asyncio.wait_for((changed or self._changed).wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def status(self) -> dict:
+        oldest = self.events[0]["seq"] if self.events else self.seq + 1
+        return {
+            "watch_id": self.watch_id,
+            "filters": self.filters,
+            "interval_sec": self.interval_sec,
+            "snapshot_size": len(self.snapshot),
+            "baseline_ready": self.baseline_ready,
+            "latest_seq": self.seq,
+            "oldest_available_seq": oldest,
+            "last_polled": (
+                time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.last_polled))
+                if self.last_polled else None
+            ),
+            "last_error": self.last_error,
+        }
+
+
+class AuctionWatchlist:
+    """watch 목록과 백그라운드 폴링 루프"""
+
+    def __init__(self) -> None:
+        self.watches: dict[str, AuctionWatch] = {}
+        self._task: asyncio.Task | None = None
+
+    def add(
+        self, filters: dict[str, Any], interval_sec: int = WATCH_INTERVAL_SEC, auto: bool = False,
+    ) -> AuctionWatch | None:
+        """
+        watch 등록 (같은 필터면 기존 watch). WATCH_MAX개가 차 있으면 유휴 watch를 정리한 뒤에도
+        자리가 없을 때 None
+
+        auto=False(MCP 도구 등록)로 다시 등록하면 자동 등록 watch도 유휴 해제 대상에서 빠집니다.
+        """
+        watch = AuctionWatch(filters, max(30, interval_sec), auto)
+        existing = self.watches.get(watch.watch_id)
+        if existing is not None:
+            existing.auto = existing.auto and auto
+            existing.touch()
+            return existing
+        if len(self.watches) >= WATCH_MAX:
+            self.expire_idle()
+            if len(self.watches) >= WATCH_MAX:
+                return None
+        self.watches[watch.watch_id] = watch
+        self._ensure_poller()
+        return watch
+
+    def expire_idle(self) -> list[str]:
+        """유휴 상태인 자동 등록 watch 해제 → 해제한 watch_id 목록"""
+        now = time.monotonic()
+        expired = [watch_id for watch_id, w in self.watches.items() if w.idle(now)]
+        for watch_id in expired:
+            del self.watches[watch_id]
+        return expired
+
+    def remove(self, watch_id: str) -> bool:
+        return self.watches.pop(watch_id, None) is not None
+
+    def get(self, watch_id: str) -> AuctionWatch | None:
+        return self.watches.get(watch_id)
+
+    def _ensure_poller(self) -> None:
+        if self._task is None or self._task.done():
+            with unbounded():   # 폴러는 처음 감시를 등록한 요청의 마감과 무관하게 계속 실행
+                self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while self.watches:
+            self.expire_idle()
+            now = time.time()
+            due = [
+                w for w in list(self.watches.values())
+                if w.last_polled is None or now - w.last_polled >= w.interval_sec
+            ]
+            for watch in due:
+                try:
+                    await watch.poll()
+                except Exception as e:
+                    watch.last_error = f"폴링 오류: {e}"
+                    watch.last_polled = time.time()
+            await asyncio.sleep(5)
+
+
+watchlist = AuctionWatchlist()
+
+
+def _watch_filters(
+    sido: str,
+    sigungu: str,
+    use_code: str,
+    disposal_method: str,
+    keyword: str,
+) -> dict[str, str]:
+    return {
+        k: v for k, v in {
+            "sido": sido,
+            "sigungu": sigungu,
+            "use_code": use_code,
+            "disposal_method": disposal_method,
+            "keyword": keyword,
+        }.items() if v
+    }
+
+
+def register_onbid_watch_tools(mcp: FastMCP) -> None:
+    """공매 물건 변경 피드 MCP 도구 등록"""
+
+    @mcp.tool()
+    async def watch_public_auction_items(
+        sido: str = "",
+        sigungu: str = "",
+        use_code: str = "",
+        disposal_method: str = "",
+        keyword: str = "",
+        interval_sec: int = WATCH_INTERVAL_SEC,
+    ) -> dict:
+        """
+        온비드 공매 물건 목록 감시를 등록합니다.
+        등록 즉시 기준 스냅샷을 만들고, 이후 interval_sec마다 전체 목록을 다시 조회해
+        신규/삭제/최저입찰가·입찰일 변경을 이벤트로 기록합니다.
+        같은 필터로 다시 호출하면 기존 watch를 반환합니다.
+
+        Args:
+            sido: 시도명 (예: '서울특별시')
+            sigungu: 시군구명 (예: '강남구')
+            use_code: 물건 용도 코드 (003=아파트, 004=오피스텔, 005=상가 등)
+            disposal_method: 처분방법 (01=매각, 02=임대)
+            keyword: 물건명 키워드
+            interval_sec: 재조회 주기 (초, 최소 30, 기본 300)
+
+        Returns:
+            watch_id, latest_seq, snapshot_size 등 watch 상태
+        """
+        if WATCH_UNAVAILABLE:
+            return {"error": WATCH_UNAVAILABLE}
+        if not ONBID_API_KEY:
+            return {"error": "ONBID_API_KEY 또는 DATA_GO_KR_API_KEY 환경변수가 설정되지 않았습니다."}
+
+        filters = _watch_filters(sido, sigungu, use_code, disposal_method, keyword)
+        watch = watchlist.add(filters, interval_sec)
+        if watch is None:
+            return {"error": f"watch는 최대 {WATCH_MAX}개까지 등록할 수 있습니다. 사용하지 않는 watch를 해제하세요.",
+                    "watches": list(watchlist.watches)}
+        if not watch.baseline_ready:
+            await watch.poll()
+        return watch.status()
+
+    @mcp.tool()
+    async def get_public_auction_changes(
+        watch_id: str,
+        since_seq: int = 0,
+        poll_now: bool = False,
+        limit: int = 500,
+    ) -> dict:
+        """
+        등록된 watch의 변경 이벤트(added/removed/changed)를 since_seq 이후부터 반환합니다.
+        응답의 latest_seq를 다음 호출의 since_seq로 넘기면 증분만 받을 수 있습니다.
+
+        Args:
+            watch_id: watch_public_auction_items가 반환한 ID
+            since_seq: 이 번호 이후의 이벤트만 반환 (기본 0 = 보관 중인 전체)
+            poll_now: True이면 주기를 기다리지 않고 즉시 재조회 후 반환
+            limit: 최대 이벤트 수 (기본 500)
+
+        Returns:
+            events(seq/type/item_no/changes/item), latest_seq, watch 상태
+        """
+        if WATCH_UNAVAILABLE:
+            return {"error": WATCH_UNAVAILABLE}
+        watch = watchlist.get(watch_id)
+        if watch is None:
+            return {"error": f"watch_id '{watch_id}'를 찾을 수 없습니다.", "watches": list(watchlist.watches)}
+        watch.touch()
+        if poll_now:
+            await watch.poll()
+        events = watch.events_since(since_seq, limit)
+        return {
+            **watch.status(),
+            "returned_count": len(events),
+            "events": events,
+        }
+
+    @mcp.tool()
+    async def unwatch_public_auction_items(watch_id: str) -> dict:
+        """
+        공매 물건 감시를 해제합니다.
+
+        Args:
+            watch_id: 해제할 watch ID
+        """
+        if WATCH_UNAVAILABLE:
+            return {"error": WATCH_UNAVAILABLE}
+        return {"watch_id": watch_id, "removed": watchlist.remove(watch_id)}
@@ -9,6 +9,7 @@
 
 from mcp.server.fastmcp import FastMCP
 
+from _compact import compact_result, format_error
 from _helpers import (
     APT_RENT_URL,
     OFFICETEL_RENT_URL,
@@ -20,6 +21,7 @@ from _helpers import (
     run_molit_tool,
     _summarize_prices,
 )
+from _stats import StreamingStats
 
 
 def _rent_summary(items: list[dict]) -> dict:
@@ -38,6 +40,37 @@ def _rent_summary(items: list[dict]) -> dict:
     return summary
 
 
+class RentSummaryStream:
+    """_rent_summary의 스트리밍 버전: 페이지 단위로 누적하고 항목은 보관하지 않음"""
+
+    def __init__(self) -> None:
+        self.jeonse = StreamingStats()
+        self.monthly_deposits = StreamingStats()
+        self.monthly_rents = StreamingStats()
+
+    def add_items(self, items: list[dict]) -> None:
+        for i in items:
+            deposit = i.get("deposit")
+            if isinstance(deposit, int):
+                if i.get("rent_type") == "전세":
+                    self.jeonse.add(deposit)
+                elif i.get("rent_type") == "월세":
+                    self.monthly_deposits.add(deposit)
+            monthly = i.get("monthly_rent")
+            if isinstance(monthly, int) and monthly > 0:
+                self.monthly_rents.add(monthly)
+
+    def summary(self) -> dict:
+        summary = {}
+        if self.jeonse.count:
+            summary["전세_보증금_만원"] = self.jeonse.price_summary()
+        if self.monthly_deposits.count:
+            summary["월세_보증금_만원"] = self.monthly_deposits.price_summary()
+        if self.monthly_rents.count:
+            summary["월세_월임대료_만원"] = self.monthly_rents.price_summary()
+        return summary
+
+
 def _parse_apt_rent(items_el) -> list[dict]:
     result = []
     for item in items_el:
@@ -148,6 +181,15 @@ def _parse_single_house_rent(items_el) -> list[dict]:
     return result
 
 
+# 유형 키 → (URL, 파서, 레이블). web_api 등에서 공용으로 사용
+_RENT_CONFIGS = {
+    "apt":   (APT_RENT_URL,          _parse_apt_rent,          "아파트 전월세"),
+    "offi":  (OFFICETEL_RENT_URL,    _parse_officetel_rent,    "오피스텔 전월세"),
+    "villa": (VILLA_RENT_URL,        _parse_villa_rent,        "빌라 전월세"),
+    "house": (SINGLE_HOUSE_RENT_URL, _parse_single_house_rent, "단독주택 전월세"),
+}
+
+
 def register_rent_tools(mcp: FastMCP) -> None:
     """전월세 실거래 MCP 도구 등록"""
 
@@ -156,6 +198,8 @@ def register_rent_tools(mcp: FastMCP) -> None:
         region_code: str,
         year_month: str,
         num_of_rows: int = 100,
+        format: str = "full",
+        fields: str = "",
     ) -> dict:
         """
         아파트 전세/월세 실거래 정보를 조회합니다.
@@ -164,10 +208,18 @@ def register_rent_tools(mcp: FastMCP) -> None:
             region_code: 법정동 앞 5자리 코드 (예: '11680' = 강남구)
             year_month: 거래년월 (YYYYMM, 예: '202501')
             num_of_rows: 최대 조회 건수 (기본 100)
+            format: 결과 형식 (기본 full)
+                    full=항목별 dict, table=columns + rows 표 형식(*_raw 열 제외),
+                    summary=항목 없이 법정동 × 전용면적 구간 × 전세/월세별 건수·보증금·월세 통계만
+            fields: full/table에서 남길 필드 (쉼표 구분, 예: 'rent_type,deposit,monthly_rent,area_m2')
 
         Returns:
             total_count, items(아파트명/전세월세구분/보증금/월세/면적/층/날짜), 가격요약
+            (format=table이면 items 대신 columns/rows, summary면 groups/canceled_count)
         """
+        error = format_error(format, fields)
+        if error:
+            return {"error": error}
         result = await run_molit_tool(
             APT_RENT_URL, region_code, year_month, num_of_rows,
             _parse_apt_rent, "아파트 전월세"
@@ -175,13 +227,15 @@ def register_rent_tools(mcp: FastMCP) -> None:
         if "items" in result:
             result.pop("price_summary_만원", None)
             result["rent_summary"] = _rent_summary(result["items"])
-        return result
+        return compact_result(result, format, fields, price_field="deposit")
 
     @mcp.tool()
     async def get_officetel_rent(
         region_code: str,
         year_month: str,
         num_of_rows: int = 100,
+        format: str = "full",
+        fields: str = "",
     ) -> dict:
         """
         오피스텔 전세/월세 실거래 정보를 조회합니다.
@@ -190,10 +244,18 @@ def register_rent_tools(mcp: FastMCP) -> None:
             region_code: 법정동 앞 5자리 코드
             year_month: 거래년월 (YYYYMM)
             num_of_rows: 최대 조회 건수
+            format: 결과 형식 (기본 full)
+                    full=항목별 dict, table=columns + rows 표 형식(*_raw 열 제외),
+                    summary=항목 없이 법정동 × 전용면적 구간 × 전세/월세별 건수·보증금·월세 통계만
+            fields: full/table에서 남길 필드 (쉼표 구분, 예: 'rent_type,deposit,monthly_rent,area_m2')
 
         Returns:
             total_count, items(오피스텔명/전세월세구분/보증금/월세/면적/층/날짜), 가격요약
+            (format=table이면 items 대신 columns/rows, summary면 groups/canceled_count)
         """
+        error = format_error(format, fields)
+        if error:
+            return {"error": error}
         result = await run_molit_tool(
             OFFICETEL_RENT_URL, region_code, year_month, num_of_rows,
             _parse_officetel_rent, "오피스텔 전월세"
@@ -201,13 +263,15 @@ def register_rent_tools(mcp: FastMCP) -> None:
         if "items" in result:
             result.pop("price_summary_만원", None)
             result["rent_summary"] = _rent_summary(result["items"])
-        return result
+        return compact_result(result, format, fields, price_field="deposit")
 
     @mcp.tool()
     async def get_villa_rent(
         region_code: str,
         year_month: str,
         num_of_rows: int = 100,
+        format: str = "full",
+        fields: str = "",
     ) -> dict:
         """
         연립주택/다세대주택(빌라) 전세/월세 실거래 정보를 조회합니다.
@@ -216,10 +280,18 @@ def register_rent_tools(mcp: FastMCP) -> None:
             region_code: 법정동 앞 5자리 코드
             year_month: 거래년월 (YYYYMM)
             num_of_rows: 최대 조회 건수
+            format: 결과 형식 (기본 full)
+                    full=항목별 dict, table=columns + rows 표 형식(*_raw 열 제외),
+                    summary=항목 없이 법정동 × 전용면적 구간 × 전세/월세별 건수·보증금·월세 통계만
+            fields: full/table에서 남길 필드 (쉼표 구분, 예: 'rent_type,deposit,monthly_rent,area_m2')
 
         Returns:
             total_count, items(건물명/전세월세구분/보증금/월세/면적/층/날짜), 가격요약
+            (format=table이면 items 대신 columns/rows, summary면 groups/canceled_count)
         """
+        error = format_error(format, fields)
+        if error:
+            return {"error": error}
         result = await run_molit_tool(
             VILLA_RENT_URL, region_code, year_month, num_of_rows,
             _parse_villa_rent, "연립/다세대 전월세"
@@ -227,13 +299,15 @@ def register_rent_tools(mcp: FastMCP) -> None:
         if "items" in result:
             result.pop("price_summary_만원", None)
             result["rent_summary"] = _rent_summary(result["items"])
-        return result
+        return compact_result(result, format, fields, price_field="deposit")
 
     @mcp.tool()
     async def get_single_house_rent(
         region_code: str,
         year_month: str,
         num_of_rows: int = 100,
+        format: str = "full",
+        fields: str = "",
     ) -> dict:
         """
         단독주택/다가구주택 전세/월세 실거래 정보를 조회합니다.
@@ -242,10 +316,18 @@ def register_rent_tools(mcp: FastMCP) -> None:
             region_code: 법정동 앞 5자리 코드
             year_month: 거래년월 (YYYYMM)
             num_of_rows: 최대 조회 건수
+            format: 결과 형식 (기본 full)
+                    full=항목별 dict, table=columns + rows 표 형식(*_raw 열 제외),
+                    summary=항목 없이 법정동 × 전용면적 구간 × 전세/월세별 건수·보증금·월세 통계만
+            fields: full/table에서 남길 필드 (쉼표 구분, 예: 'rent_type,deposit,monthly_rent,area_m2')
 
         Returns:
             total_count, items(주택유형/전세월세구분/보증금/월세/연면적/동/날짜), 가격요약
+            (format=table이면 items 대신 columns/rows, summary면 groups/canceled_count)
         """
+        error = format_error(format, fields)
+        if error:
+            return {"error": error}
         result = await run_molit_tool(
             SINGLE_HOUSE_RENT_URL, region_code, year_month, num_of_rows,
             _parse_single_house_rent, "단독/다가구 전월세"
@@ -253,4 +335,4 @@ def register_rent_tools(mcp: FastMCP) -> None:
         if "items" in result:
             result.pop("price_summary_만원", None)
             result["rent_summary"] = _rent_summary(result["items"])
-        return result
+        return compact_result(result, format, fields, price_field="deposit")
@@ -10,6 +10,7 @@
 
 from mcp.server.fastmcp import FastMCP
 
+from _compact import compact_result, format_error
 from _helpers import (
     APT_TRADE_URL,
     COMMERCIAL_TRADE_URL,
@@ -21,6 +22,17 @@ from _helpers import (
     _make_date,
     run_molit_tool,
 )
+from tools.complex import join_complex_info
+
+
+def _cancel_date(raw: str) -> str:
+    """해제사유발생일 '24.05.13' / '20240513' → '2024-05-13' (없으면 빈 문자열)"""
+    digits = "".join(ch for ch in raw if ch.isdigit())
+    if len(digits) == 6:
+        digits = "20" + digits
+    if len(digits) != 8:
+        return ""
+    return f"{digits[:4]}-{digits[4:6]}-{digits[6:]}"
 
 
 def _parse_apt_trades(items_el) -> list[dict]:
@@ -41,6 +53,8 @@ def _parse_apt_trades(items_el) -> list[dict]:
                 _txt(item, "dealMonth") or _txt(item, "월"),
                 _txt(item, "dealDay") or _txt(item, "일"),
             ),
+            "cancel_type": _txt(item, "cdealType") or _txt(item, "해제여부"),
+            "cancel_date": _cancel_date(_txt(item, "cdealDay") or _txt(item, "해제사유발생일")),
             "deal_type": _txt(item, "dealingGbn") or _txt(item, "거래유형"),
             "agent_location": _txt(item, "estateAgentSggNm") or _txt(item, "중개사소재지"),
         })
@@ -65,6 +79,8 @@ def _parse_officetel_trades(items_el) -> list[dict]:
                 _txt(item, "dealMonth") or _txt(item, "월"),
                 _txt(item, "dealDay") or _txt(item, "일"),
             ),
+            "cancel_type": _txt(item, "cdealType") or _txt(item, "해제여부"),
+            "cancel_date": _cancel_date(_txt(item, "cdealDay") or _txt(item, "해제사유발생일")),
         })
     return result
 
@@ -87,6 +103,8 @@ def _parse_villa_trades(items_el) -> list[dict]:
                 _txt(item, "dealMonth") or _txt(item, "월"),
                 _txt(item, "dealDay") or _txt(item, "일"),
             ),
+            "cancel_type": _txt(item, "cdealType") or _txt(item, "해제여부"),
+            "cancel_date": _cancel_date(_txt(item, "cdealDay") or _txt(item, "해제사유발생일")),
             "deal_type": _txt(item, "dealingGbn") or _txt(item, "거래유형"),
         })
     return result
@@ -111,6 +129,8 @@ def _parse_single_house_trades(items_el) -> list[dict]:
                 _txt(item, "dealMonth") or _txt(item, "월"),
                 _txt(item, "dealDay") or _txt(item, "일"),
             ),
+            "cancel_type": _txt(item, "cdealType") or _txt(item, "해제여부"),
+            "cancel_date": _cancel_date(_txt(item, "cdealDay") or _txt(item, "해제사유발생일")),
             "deal_type": _txt(item, "dealingGbn") or _txt(item, "거래유형"),
         })
     return result
@@ -136,11 +156,23 @@ def _parse_commercial_trades(items_el) -> list[dict]:
                 _txt(item, "dealMonth") or _txt(item, "월"),
                 _txt(item, "dealDay") or _txt(item, "일"),
             ),
+            "cancel_type": _txt(item, "cdealType") or _txt(item, "해제여부"),
+            "cancel_date": _cancel_date(_txt(item, "cdealDay") or _txt(item, "해제사유발생일")),
             "deal_type": _txt(item, "dealingGbn") or _txt(item, "거래유형"),
         })
     return result
 
 
+# 유형 키 → (URL, 파서, 레이블). web_api, 이력 저장소 등에서 공용으로 사용
+_TRADE_CONFIGS = {
+    "apt":        (APT_TRADE_URL,          _parse_apt_trades,          "아파트 매매"),
+    "offi":       (OFFICETEL_TRADE_URL,    _parse_officetel_trades,    "오피스텔 매매"),
+    "villa":      (VILLA_TRADE_URL,        _parse_villa_trades,        "빌라 매매"),
+    "house":      (SINGLE_HOUSE_TRADE_URL, _parse_single_house_trades, "단독주택 매매"),
+    "commercial": (COMMERCIAL_TRADE_URL,   _parse_commercial_trades,   "상업용 매매"),
+}
+
+
 def register_trade_tools(mcp: FastMCP) -> None:
     """매매 실거래가 관련 MCP 도구 등록"""
 
@@ -149,6 +181,9 @@ def register_trade_tools(mcp: FastMCP) -> None:
         region_code: str,
         year_month: str,
         num_of_rows: int = 100,
+        enrich: str = "",
+        format: str = "full",
+        fields: str = "",
     ) -> dict:
         """
         아파트 매매 실거래가를 조회합니다.
@@ -159,20 +194,37 @@ def register_trade_tools(mcp: FastMCP) -> None:
             year_month: 거래년월 (YYYYMM, 예: '202501').
                         현재 월은 get_current_year_month() 도구로 확인하세요.
             num_of_rows: 최대 조회 건수 (기본 100, 최대 1000)
+            enrich: 'complex'면 단지정보(세대수/최고층/사용승인일 등)를 items[].complex로 조인.
+                    단지 목록 조회는 거래 조회와 동시에 진행됩니다.
+            format: 결과 형식 (기본 full)
+                    full=항목별 dict, table=columns + rows 표 형식(*_raw 열 제외),
+                    summary=항목 없이 법정동 × 전용면적 구간별 건수·가격 통계만
+            fields: full/table에서 남길 필드 (쉼표 구분, 예: 'amount,area_m2,floor,deal_date')
 
         Returns:
             total_count, items(아파트명/금액/면적/층/건축년도/동/날짜), price_summary_만원
+            (enrich='complex'면 complex_matched_count 추가)
+            (format=table이면 items 대신 columns/rows, summary면 groups/canceled_count)
         """
-        return await run_molit_tool(
+        error = format_error(format, fields)
+        if error:
+            return {"error": error}
+        fetch = run_molit_tool(
             APT_TRADE_URL, region_code, year_month, num_of_rows,
             _parse_apt_trades, "아파트 매매"
         )
+        # summary는 항목을 돌려주지 않으므로 단지정보 조인 생략
+        if enrich.strip().lower() == "complex" and format.strip().lower() != "summary":
+            return compact_result(await join_complex_info(region_code, fetch), format, fields)
+        return compact_result(await fetch, format, fields)
 
     @mcp.tool()
     async def get_officetel_trades(
         region_code: str,
         year_month: str,
         num_of_rows: int = 100,
+        format: str = "full",
+        fields: str = "",
     ) -> dict:
         """
         오피스텔 매매 실거래가를 조회합니다.
@@ -181,20 +233,31 @@ def register_trade_tools(mcp: FastMCP) -> None:
             region_code: 법정동 앞 5자리 코드 (예: '11680' = 강남구)
             year_month: 거래년월 (YYYYMM)
             num_of_rows: 최대 조회 건수
+            format: 결과 형식 (기본 full)
+                    full=항목별 dict, table=columns + rows 표 형식(*_raw 열 제외),
+                    summary=항목 없이 법정동 × 전용면적 구간별 건수·가격 통계만
+            fields: full/table에서 남길 필드 (쉼표 구분, 예: 'amount,area_m2,floor,deal_date')
 
         Returns:
             total_count, items(오피스텔명/금액/면적/층/건축년도/동/날짜), price_summary_만원
+            (format=table이면 items 대신 columns/rows, summary면 groups/canceled_count)
         """
-        return await run_molit_tool(
+        error = format_error(format, fields)
+        if error:
+            return {"error": error}
+        result = await run_molit_tool(
             OFFICETEL_TRADE_URL, region_code, year_month, num_of_rows,
             _parse_officetel_trades, "오피스텔 매매"
         )
+        return compact_result(result, format, fields)
 
     @mcp.tool()
     async def get_villa_trades(
         region_code: str,
         year_month: str,
         num_of_rows: int = 100,
+        format: str = "full",
+        fields: str = "",
     ) -> dict:
         """
         연립주택/다세대주택(빌라) 매매 실거래가를 조회합니다.
@@ -203,20 +266,31 @@ def register_trade_tools(mcp: FastMCP) -> None:
             region_code: 법정동 앞 5자리 코드
             year_month: 거래년월 (YYYYMM)
             num_of_rows: 최대 조회 건수
+            format: 결과 형식 (기본 full)
+                    full=항목별 dict, table=columns + rows 표 형식(*_raw 열 제외),
+                    summary=항목 없이 법정동 × 전용면적 구간별 건수·가격 통계만
+            fields: full/table에서 남길 필드 (쉼표 구분, 예: 'amount,area_m2,floor,deal_date')
 
         Returns:
             total_count, items(건물명/금액/면적/층/건축년도/동/날짜), price_summary_만원
+            (format=table이면 items 대신 columns/rows, summary면 groups/canceled_count)
         """
-        return await run_molit_tool(
+        error = format_error(format, fields)
+        if error:
+            return {"error": error}
+        result = await run_molit_tool(
             VILLA_TRADE_URL, region_code, year_month, num_of_rows,
             _parse_villa_trades, "연립/다세대 매매"
         )
+        return compact_result(result, format, fields)
 
     @mcp.tool()
     async def get_single_house_trades(
         region_code: str,
         year_month: str,
         num_of_rows: int = 100,
+        format: str = "full",
+        fields: str = "",
     ) -> dict:
         """
         단독주택/다가구주택 매매 실거래가를 조회합니다.
@@ -225,20 +299,31 @@ def register_trade_tools(mcp: FastMCP) -> None:
             region_code: 법정동 앞 5자리 코드
             year_month: 거래년월 (YYYYMM)
             num_of_rows: 최대 조회 건수
+            format: 결과 형식 (기본 full)
+                    full=항목별 dict, table=columns + rows 표 형식(*_raw 열 제외),
+                    summary=항목 없이 법정동 × 전용면적 구간별 건수·가격 통계만
+            fields: full/table에서 남길 필드 (쉼표 구분, 예: 'amount,area_m2,floor,deal_date')
 
         Returns:
             total_count, items(주택유형/금액/연면적/대지면적/층수/건축년도/동/날짜), price_summary_만원
+            (format=table이면 items 대신 columns/rows, summary면 groups/canceled_count)
         """
-        return await run_molit_tool(
+        error = format_error(format, fields)
+        if error:
+            return {"error": error}
+        result = await run_molit_tool(
             SINGLE_HOUSE_TRADE_URL, region_code, year_month, num_of_rows,
             _parse_single_house_trades, "단독/다가구 매매"
         )
+        return compact_result(result, format, fields)
 
     @mcp.tool()
     async def get_commercial_trades(
         region_code: str,
         year_month: str,
         num_of_rows: int = 100,
+        format: str = "full",
+        fields: str = "",
     ) -> dict:
         """
         상업용/업무용 건물 매매 실거래가를 조회합니다.
@@ -248,11 +333,20 @@ def register_trade_tools(mcp: FastMCP) -> None:
             region_code: 법정동 앞 5자리 코드
             year_month: 거래년월 (YYYYMM)
             num_of_rows: 최대 조회 건수
+            format: 결과 형식 (기본 full)
+                    full=항목별 dict, table=columns + rows 표 형식(*_raw 열 제외),
+                    summary=항목 없이 법정동 × 전용면적 구간별 건수·가격 통계만
+            fields: full/table에서 남길 필드 (쉼표 구분, 예: 'amount,area_m2,floor,deal_date')
 
         Returns:
             total_count, items(용도/금액/건물면적/대지면적/층/건축년도/동/날짜), price_summary_만원
+            (format=table이면 items 대신 columns/rows, summary면 groups/canceled_count)
         """
-        return await run_molit_tool(
+        error = format_error(format, fields)
+        if error:
+            return {"error": error}
+        result = await run_molit_tool(
             COMMERCIAL_TRADE_URL, region_code, year_month, num_of_rows,
             _parse_commercial_trades, "상업/업무용 매매"
         )
+        return compact_result(result, format, fields)
@@ -8,31 +8,55 @@
   GET /api/region     → 지역코드 검색
   GET /api/trades     → 매매 실거래가 조회
   GET /api/rent       → 전월세 조회
+  GET /api/trades/stream → 매매 실거래가 스트리밍 (NDJSON / SSE)
+  GET /api/rent/stream   → 전월세 스트리밍 (NDJSON / SSE)
   GET /api/complex    → 단지정보 조회
   GET /api/building   → 건축인허가 조회
+  GET /api/onbid/changes → 공매 물건 변경 피드 (SSE)
+  POST /api/batch     → 매매/전월세/건축인허가 다건 동시 조회 (NDJSON)
+  GET /api/export     → 매매/전월세 기간 내보내기 (CSV / Parquet)
+  GET /api/comps      → 유사 매매 거래 검색 (로컬 이력 저장소)
+  POST /api/jobs      → 다지역·다기간 리포트 작업 제출 (_jobs.py)
+  GET /api/jobs       → 최근 작업 목록
+  GET /api/jobs/{id}  → 작업 상태/진행률
+  GET /api/jobs/{id}/result → 작업 (부분) 결과
+  DELETE /api/jobs/{id}     → 작업 취소
+
+요청 마감: X-Request-Timeout 헤더(초, 없으면 MCP_REQUEST_TIMEOUT)까지 끝나지 않은 외부 조회는 중단하고
+모은 결과에 partial: true를 붙입니다 (_deadline.py, web_middleware.DeadlineMiddleware).
 """
 
+import asyncio
+import hashlib
+import json
+import logging
 import os
 import sys
+from typing import Any, Awaitable, Callable
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from starlette.requests import Request
-from starlette.responses import FileResponse, JSONResponse
+from starlette.responses import JSONResponse, Response, StreamingResponse
 from starlette.routing import Route
 
+import _deadline
+from _export import EXPORT_FORMATS, export_columns, make_writer
+from _jobs import cancel_job, job_result, job_status, recent_jobs, submit_job
+from _query import has_query, parse_item_query, run_item_query
+from _serialize import dumps
+from _stats import StreamingStats
+from _tracing import span
 from data.region_codes import search_region_code
 from _helpers import (
-    APT_TRADE_URL,
-    OFFICETEL_TRADE_URL,
-    VILLA_TRADE_URL,
-    SINGLE_HOUSE_TRADE_URL,
-    COMMERCIAL_TRADE_URL,
-    APT_RENT_URL,
-    OFFICETEL_RENT_URL,
-    VILLA_RENT_URL,
-    SINGLE_HOUSE_RENT_URL,
     run_molit_tool,
+    _summarize_prices,
+    iter_molit_pages,
+    iter_year_months,
+    MOLIT_CACHE,
+    molit_cache_key,
+    ARCH_PMS_CACHE,
+    arch_pms_cache_key,
     ARCH_PMS_BASIS_URL,
     ARCH_PMS_PKLOT_URL,
     ARCH_PMS_JIJIGU_URL,
@@ -40,14 +64,15 @@ from _helpers import (
     ARCH_PMS_HSTP_URL,
     run_arch_pms_tool,
 )
-from tools.trade import (
-    _parse_apt_trades,
-    _parse_officetel_trades,
-    _parse_villa_trades,
-    _parse_single_house_trades,
-    _parse_commercial_trades,
+from tools.comps import find_comps
+from tools.trade import _TRADE_CONFIGS
+from tools.complex import (
+    attach_complex_info,
+    complex_by_name,
+    enrich_with_complex_info,
+    join_complex_info,
+    start_complex_list,
 )
-from tools.complex import enrich_with_complex_info
 from tools.building_permit import (
     _parse_basis,
     _parse_pklot,
@@ -55,60 +80,240 @@ from tools.building_permit import (
     _parse_platplc,
     _parse_hstp,
 )
-from tools.rent import (
-    _parse_apt_rent,
-    _parse_officetel_rent,
-    _parse_villa_rent,
-    _parse_single_house_rent,
-    _rent_summary,
-)
+from tools.rent import _RENT_CONFIGS, RentSummaryStream, _rent_summary
+from tools.onbid_watch import WATCH_UNAVAILABLE, watchlist
+
+logger = logging.getLogger(__name__)
 
 _BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 
+_NO_CACHE = "no-cache"
+_IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+# ── JSON 응답 ─────────────────────────────────────────────────────────────────
+
+class FastJSONResponse(JSONResponse):
+    """
+    _serialize.dumps(orjson 우선)로 렌더링하는 JSON 응답
+
+    bytes를 넘기면 이미 직렬화된 본문으로 보고 그대로 전송합니다.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content)
+        with span("serialize"):
+            return dumps(content)
+
+
+# ── 조건부 응답 (ETag / 304) ──────────────────────────────────────────────────
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    inm = request.headers.get("if-none-match")
+    if not inm:
+        return False
+    return inm.strip() == "*" or etag in [t.strip() for t in inm.split(",")]
+
+
+def _not_modified(etag: str, cache_control: str = _NO_CACHE) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def _request_etag(request: Request, cache_tag: str) -> str:
+    """캐시 항목 태그(캐시 키 + data version) + 경로/쿼리로 강한 ETag 생성"""
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    raw = f"{cache_tag}|{request.url.path}?{query}"
+    return '"' + hashlib.sha1(raw.encode()).hexdigest()[:24] + '"'
+
+
+async def _cached_json(
+    request: Request,
+    cache,
+    cache_key,
+    variant: str,
+    fetch: Callable[[], Awaitable[dict]],
+) -> Response:
+    """
+    캐시 항목 기반 JSON 응답
+
+    1. 캐시 항목이 있으면 ETag(캐시 키 + data version)를 비교해 304 응답
+    2. 같은 항목에서 이미 직렬화한 본문(entry.extras[variant])이 있으면 인코딩 없이 전송
+    3. 없으면 fetch()로 결과를 만들고 직렬화 본문을 항목에 보관
+    """
+    entry = await cache.peek(cache_key)
+    if entry is not None:
+        etag = _request_etag(request, entry.tag)
+        if _etag_matches(request, etag):
+            return _not_modified(etag)
+        body = entry.extras.get(variant)
+        if body is not None:
+            cache.hits += 1
+            return FastJSONResponse(body, headers={"ETag": etag, "Cache-Control": _NO_CACHE})
+
+    result = await fetch()
+    entry = cache.peek_local(cache_key)
+    if "error" in result or entry is None:
+        return FastJSONResponse(result)
+
+    with span("serialize"):
+        body = dumps(result)
+    entry.extras[variant] = body
+    etag = _request_etag(request, entry.tag)
+    return FastJSONResponse(body, headers={"ETag": etag, "Cache-Control": _NO_CACHE})
+
+
 # ── 정적 파일 ─────────────────────────────────────────────────────────────────
 
-async def index(request: Request) -> FileResponse:
-    return FileResponse(os.path.join(_BASE_DIR, "index.html"))
+class _StaticAsset:
+    """
+    메모리에 올린 정적 파일 + 내용 해시
+
+    파일이 바뀌면(mtime 변경) 다시 읽습니다. index.html은 CSS/JS 참조에
+    ?v=<해시>를 붙여 렌더링하므로, 해시가 일치하는 요청은 1년 immutable 캐시로 응답합니다.
+    """
+
+    def __init__(self, filename: str, media_type: str) -> None:
+        self.path = os.path.join(_BASE_DIR, filename)
+        self.media_type = media_type
+        self._mtime = None
+        self.body = b""
+        self.hash = ""
+
+    def load(self) -> "_StaticAsset":
+        mtime = os.path.getmtime(self.path)
+        if mtime != self._mtime:
+            with open(self.path, "rb") as f:
+                self.body = f.read()
+            self.hash = hashlib.sha256(self.body).hexdigest()[:12]
+            self._mtime = mtime
+        return self
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.hash}"'
+
+    def response(self, request: Request, body: bytes | None = None, etag: str | None = None) -> Response:
+        body = self.body if body is None else body
+        etag = etag or self.etag
+        versioned = request.query_params.get("v") == self.hash
+        cache_control = _IMMUTABLE if versioned else _NO_CACHE
+        if _etag_matches(request, etag):
+            return _not_modified(etag, cache_control)
+        return Response(body, media_type=self.media_type, headers={"ETag": etag, "Cache-Control": cache_control})
 
 
-async def serve_css(request: Request) -> FileResponse:
-    return FileResponse(os.path.join(_BASE_DIR, "style.css"), media_type="text/css")
+_INDEX = _StaticAsset("index.html", "text/html; charset=utf-8")
+_CSS = _StaticAsset("style.css", "text/css; charset=utf-8")
+_JS = _StaticAsset("main.js", "application/javascript; charset=utf-8")
 
 
-async def serve_js(request: Request) -> FileResponse:
-    return FileResponse(os.path.join(_BASE_DIR, "main.js"), media_type="application/javascript")
+async def index(request: Request) -> Response:
+    html, css, js = _INDEX.load(), _CSS.load(), _JS.load()
+    body = (
+        html.body
+        .replace(b'href="/style.css"', f'href="/style.css?v={css.hash}"'.encode())
+        .replace(b'src="/main.js"', f'src="/main.js?v={js.hash}"'.encode())
+    )
+    # index.html 자체는 항상 재검증 (참조 해시가 바뀌면 ETag도 바뀜)
+    etag = '"' + hashlib.sha256(body).hexdigest()[:12] + '"'
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    return Response(body, media_type=html.media_type, headers={"ETag": etag, "Cache-Control": _NO_CACHE})
+
+
+async def serve_css(request: Request) -> Response:
+    return _CSS.load().response(request)
+
+
+async def serve_js(request: Request) -> Response:
+    return _JS.load().response(request)
 
 
 # ── API 엔드포인트 ────────────────────────────────────────────────────────────
 
-async def api_region(request: Request) -> JSONResponse:
+async def api_region(request: Request) -> Response:
     """GET /api/region?q={지역명} → 지역코드 검색"""
     q = request.query_params.get("q", "").strip()
     if not q:
-        return JSONResponse({"error": "q 파라미터가 필요합니다."}, status_code=400)
+        return FastJSONResponse({"error": "q 파라미터가 필요합니다."}, status_code=400)
     result = search_region_code(q)
-    return JSONResponse(result)
+    return FastJSONResponse(result)
 
 
-_TRADE_CONFIGS = {
-    "apt":        (APT_TRADE_URL,          _parse_apt_trades,          "아파트 매매"),
-    "offi":       (OFFICETEL_TRADE_URL,    _parse_officetel_trades,    "오피스텔 매매"),
-    "villa":      (VILLA_TRADE_URL,        _parse_villa_trades,        "빌라 매매"),
-    "house":      (SINGLE_HOUSE_TRADE_URL, _parse_single_house_trades, "단독주택 매매"),
-    "commercial": (COMMERCIAL_TRADE_URL,   _parse_commercial_trades,   "상업용 매매"),
-}
+async def _query_molit(
+    request: Request,
+    url: str,
+    region_code: str,
+    year_month: str,
+    rows: int,
+    parser,
+    label: str,
+    is_rent: bool,
+    enrich: bool = False,
+) -> Response:
+    """
+    필터/정렬/cursor 페이지 쿼리 (_query.py)
 
-_RENT_CONFIGS = {
-    "apt":   (APT_RENT_URL,         _parse_apt_rent,          "아파트 전월세"),
-    "offi":  (OFFICETEL_RENT_URL,   _parse_officetel_rent,    "오피스텔 전월세"),
-    "villa": (VILLA_RENT_URL,       _parse_villa_rent,        "빌라 전월세"),
-    "house": (SINGLE_HOUSE_RENT_URL, _parse_single_house_rent, "단독주택 전월세"),
-}
+    캐시된 파싱 결과에 조건을 적용해 요청한 페이지만 반환합니다.
+    가격 요약은 조건에 맞는 전체 항목 기준입니다.
+    enrich=True면 반환할 페이지의 item에만 단지정보를 조인합니다.
+    """
+    query, error = parse_item_query(request.query_params)
+    if error:
+        return FastJSONResponse({"error": error}, status_code=400)
 
+    cache_key = molit_cache_key(url, region_code, year_month, rows)
+    entry = await MOLIT_CACHE.peek(cache_key)
+    if entry is not None and not enrich:
+        etag = _request_etag(request, entry.tag)
+        if _etag_matches(request, etag):
+            return _not_modified(etag)
+
+    complex_list = start_complex_list(region_code) if enrich else None
+    result = await run_molit_tool(url, region_code, year_month, rows, parser, label)
+    if "error" in result:
+        if complex_list is not None:
+            complex_list.cancel()
+        return FastJSONResponse(result)
 
-async def api_trades(request: Request) -> JSONResponse:
-    """GET /api/trades?type=apt&region_code=11680&year_month=202412&rows=100"""
+    entry = MOLIT_CACHE.peek_local(cache_key)
+    price_field = "deposit" if is_rent else "amount"
+    page, matched, error = run_item_query(result, query, price_field, entry)
+    if error:
+        if complex_list is not None:
+            complex_list.cancel()
+        return FastJSONResponse({"error": error}, status_code=410 if "만료" in error else 400)
+
+    if is_rent:
+        page["rent_summary"] = _rent_summary(matched)
+    else:
+        amounts = [i["amount"] for i in matched if isinstance(i.get("amount"), int)]
+        if amounts:
+            page["price_summary_만원"] = _summarize_prices(amounts)
+
+    headers = {"Cache-Control": _NO_CACHE}
+    if enrich:
+        page = await attach_complex_info(region_code, page, complex_list)
+    elif entry is not None:
+        headers["ETag"] = _request_etag(request, entry.tag)
+    return FastJSONResponse(page, headers=headers)
+
+
+async def api_trades(request: Request) -> Response:
+    """
+    GET /api/trades?type=apt&region_code=11680&year_month=202412&rows=100
+
+    필터/정렬/페이지 (선택, 하나라도 있으면 쿼리 모드):
+      dong, area_min, area_max, price_min, price_max(만원), floor_min, floor_max,
+      year_min, year_max, sort(amount|area|floor|build_year|deal_date, '-'=내림차순),
+      limit(기본 50), cursor(응답의 next_cursor),
+      lat, lon, radius_m(m) — 반경 필터 (오프라인 좌표 파일, _geo.py)
+
+    enrich=complex (type=apt): 단지 목록 조회를 거래 조회와 동시에 시작하고
+      서버에서 단지명을 매칭해 items[].complex(세대수 등)를 붙여 한 번에 반환
+    """
     p = request.query_params
     trade_type = p.get("type", "apt").lower()
     region_code = p.get("region_code", "").strip()
@@ -116,18 +321,38 @@ async def api_trades(request: Request) -> JSONResponse:
     rows = int(p.get("rows", "100"))
 
     if not region_code or not year_month:
-        return JSONResponse({"error": "region_code와 year_month가 필요합니다."}, status_code=400)
+        return FastJSONResponse({"error": "region_code와 year_month가 필요합니다."}, status_code=400)
 
     if trade_type not in _TRADE_CONFIGS:
-        return JSONResponse({"error": f"type은 {list(_TRADE_CONFIGS.keys())} 중 하나여야 합니다."}, status_code=400)
+        return FastJSONResponse({"error": f"type은 {list(_TRADE_CONFIGS.keys())} 중 하나여야 합니다."}, status_code=400)
+
+    enrich = p.get("enrich", "").strip().lower()
+    if enrich and (enrich != "complex" or trade_type != "apt"):
+        return FastJSONResponse({"error": "enrich=complex는 type=apt에서만 지원합니다."}, status_code=400)
 
     url, parser, label = _TRADE_CONFIGS[trade_type]
-    result = await run_molit_tool(url, region_code, year_month, rows, parser, label)
-    return JSONResponse(result)
+    if has_query(p):
+        return await _query_molit(
+            request, url, region_code, year_month, rows, parser, label, is_rent=False, enrich=bool(enrich),
+        )
+    if enrich:
+        # 단지정보는 별도 캐시 버전이 없으므로 ETag 없이 매번 조인
+        result = await join_complex_info(
+            region_code, run_molit_tool(url, region_code, year_month, rows, parser, label),
+        )
+        return FastJSONResponse(result, headers={"Cache-Control": _NO_CACHE})
+    return await _cached_json(
+        request, MOLIT_CACHE, molit_cache_key(url, region_code, year_month, rows), "api_trades",
+        lambda: run_molit_tool(url, region_code, year_month, rows, parser, label),
+    )
+
 
+async def api_rent(request: Request) -> Response:
+    """
+    GET /api/rent?type=apt&region_code=11680&year_month=202412&rows=100
 
-async def api_rent(request: Request) -> JSONResponse:
-    """GET /api/rent?type=apt&region_code=11680&year_month=202412&rows=100"""
+    /api/trades와 같은 필터/정렬/페이지 파라미터 지원 (price_*는 보증금 기준)
+    """
     p = request.query_params
     rent_type = p.get("type", "apt").lower()
     region_code = p.get("region_code", "").strip()
@@ -135,20 +360,158 @@ async def api_rent(request: Request) -> JSONResponse:
     rows = int(p.get("rows", "100"))
 
     if not region_code or not year_month:
-        return JSONResponse({"error": "region_code와 year_month가 필요합니다."}, status_code=400)
+        return FastJSONResponse({"error": "region_code와 year_month가 필요합니다."}, status_code=400)
 
     if rent_type not in _RENT_CONFIGS:
-        return JSONResponse({"error": f"type은 {list(_RENT_CONFIGS.keys())} 중 하나여야 합니다."}, status_code=400)
+        return FastJSONResponse({"error": f"type은 {list(_RENT_CONFIGS.keys())} 중 하나여야 합니다."}, status_code=400)
 
     url, parser, label = _RENT_CONFIGS[rent_type]
+    if has_query(p):
+        return await _query_molit(request, url, region_code, year_month, rows, parser, label, is_rent=True)
+
+    return await _cached_json(
+        request, MOLIT_CACHE, molit_cache_key(url, region_code, year_month, rows), "api_rent",
+        lambda: _fetch_rent(url, region_code, year_month, rows, parser, label),
+    )
+
+
+async def _fetch_rent(url: str, region_code: str, year_month: str, rows: int, parser, label: str) -> dict:
+    """전월세 조회 결과의 price_summary_만원을 rent_summary(전세/월세 분리)로 교체"""
     result = await run_molit_tool(url, region_code, year_month, rows, parser, label)
     if "items" in result:
         result.pop("price_summary_만원", None)
-        result["rent_summary"] = _rent_summary(result["items"])
-    return JSONResponse(result)
+        with span("summarize", rows=len(result["items"])):
+            result["rent_summary"] = _rent_summary(result["items"])
+    return result
+
+
+# ── 스트리밍 (NDJSON / SSE) ──────────────────────────────────────────────────
 
+def _stream_event(fmt: str, event: str, data: dict) -> bytes:
+    if fmt == "sse":
+        return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+    return dumps({"event": event, **data}) + b"\n"
 
-async def api_complex(request: Request) -> JSONResponse:
+
+async def _stream_molit(request: Request, configs: dict, is_rent: bool) -> Response:
+    """
+    매매/전월세 스트리밍 공통 처리
+
+    페이지를 파싱하는 즉시 items 이벤트로 내보내고, 가격 요약은 t-digest로
+    누적해 마지막 summary 이벤트로 보냅니다. 응답 전체를 메모리에 만들지 않습니다.
+    """
+    p = request.query_params
+    kind = p.get("type", "apt").lower()
+    region_code = p.get("region_code", "").strip()
+    year_month = p.get("year_month", "").strip()
+    start = p.get("start", "").strip() or year_month
+    end = p.get("end", "").strip() or year_month
+    fmt = p.get("format", "ndjson").lower()
+    max_rows = int(p.get("rows", "0"))
+    page_size = max(1, min(int(p.get("page_size", "1000")), 1000))
+
+    if not region_code or not start:
+        return FastJSONResponse({"error": "region_code와 year_month(또는 start/end)가 필요합니다."}, status_code=400)
+    if kind not in configs:
+        return FastJSONResponse({"error": f"type은 {list(configs.keys())} 중 하나여야 합니다."}, status_code=400)
+    if fmt not in ("ndjson", "sse"):
+        return FastJSONResponse({"error": "format은 ndjson 또는 sse여야 합니다."}, status_code=400)
+    months = iter_year_months(start, end)
+    if not months:
+        return FastJSONResponse({"error": "start/end는 YYYYMM 형식이며 start ≤ end 여야 합니다."}, status_code=400)
+
+    enrich = p.get("enrich", "").strip().lower()
+    if enrich and (enrich != "complex" or kind != "apt"):
+        return FastJSONResponse({"error": "enrich=complex는 type=apt에서만 지원합니다."}, status_code=400)
+
+    url, parser, label = configs[kind]
+
+    async def generate():
+        yield _stream_event(fmt, "meta", {"type": kind, "region_code": region_code, "months": months})
+        # 단지 목록은 거래 페이지 조회와 동시에 가져오고, 마지막에 complex 이벤트로 조인 결과 전송
+        complex_list = start_complex_list(region_code) if enrich else None
+        try:
+            async for event in generate_pages(complex_list):
+                yield event
+        finally:
+            if complex_list is not None and not complex_list.done():
+                complex_list.cancel()
+
+    async def generate_pages(complex_list):
+        stats = RentSummaryStream() if is_rent else StreamingStats()
+        total_count = 0
+        returned = 0
+        apt_names: set[str] = set()
+        for ym in months:
+            remaining = max_rows - returned if max_rows > 0 else 0
+            if max_rows > 0 and remaining <= 0:
+                break
+            async for page in iter_molit_pages(
+                url, region_code, ym, parser, label, page_size=page_size, max_rows=remaining,
+            ):
+                if "error" in page:
+                    yield _stream_event(fmt, "error", {"year_month": ym, "error": page["error"]})
+                    break
+                if page["page_no"] == 1:
+                    total_count += page["total_count"]
+                items = page["items"]
+                returned += len(items)
+                if is_rent:
+                    stats.add_items(items)
+                else:
+                    stats.update(i["amount"] for i in items if isinstance(i.get("amount"), int))
+                if enrich:
+                    apt_names.update(i["apt_name"] for i in items if i.get("apt_name"))
+                yield _stream_event(fmt, "items", {
+                    "year_month": ym,
+                    "page_no": page["page_no"],
+                    "total_count": page["total_count"],
+                    "items": items,
+                })
+                if await request.is_disconnected():
+                    return
+        if enrich:
+            if complex_list is None:
+                complex_map, error = {}, "DATA_GO_KR_API_KEY 환경변수가 설정되지 않았습니다."
+            else:
+                complex_map, error = await enrich_with_complex_info(region_code, list(apt_names), complex_list)
+            by_name = complex_by_name(list(apt_names), complex_map)
+            yield _stream_event(fmt, "complex", {
+                "by_name": dict(sorted(by_name.items())),   # {거래 단지명: {kaptCode, units, ...}}
+                "matched_count": len(by_name),
+                "error": error,
+            })
+        summary: dict[str, Any] = {"total_count": total_count, "returned_count": returned}
+        if is_rent:
+            summary["rent_summary"] = stats.summary()
+        elif stats.count:
+            summary["price_summary_만원"] = stats.price_summary()
+        yield _stream_event(fmt, "summary", summary)
+
+    media_type = "text/event-stream" if fmt == "sse" else "application/x-ndjson"
+    return StreamingResponse(generate(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+
+async def api_trades_stream(request: Request) -> Response:
+    """
+    GET /api/trades/stream?type=apt&region_code=11680&start=202401&end=202412&format=ndjson|sse&rows=0
+
+    enrich=complex (type=apt): summary 직전에 complex 이벤트({by_name, matched_count, error})로
+      거래 단지명별 단지정보를 함께 전송
+    """
+    return await _stream_molit(request, _TRADE_CONFIGS, is_rent=False)
+
+
+async def api_rent_stream(request: Request) -> Response:
+    """
+    GET /api/rent/stream?type=apt&region_code=11680&year_month=202412&format=ndjson|sse&rows=0
+
+    enrich=complex: /api/trades/stream과 동일
+    """
+    return await _stream_molit(request, _RENT_CONFIGS, is_rent=True)
+
+
+async def api_complex(request: Request) -> Response:
     """
     GET /api/complex?region_code=11680&apt_names=은마,대림역삼,...
 
@@ -157,7 +520,7 @@ async def api_complex(request: Request) -> JSONResponse:
     """
     region_code = request.query_params.get("region_code", "").strip()
     if not region_code:
-        return JSONResponse({"error": "region_code가 필요합니다."}, status_code=400)
+        return FastJSONResponse({"error": "region_code가 필요합니다."}, status_code=400)
 
     raw_names = request.query_params.get("apt_names", "")
     apt_names = [n.strip() for n in raw_names.split(",") if n.strip()] if raw_names else []
@@ -165,13 +528,43 @@ async def api_complex(request: Request) -> JSONResponse:
     complex_map, error = await enrich_with_complex_info(region_code, apt_names)
 
     if error and not complex_map:
-        return JSONResponse({"error": error, "complex_map": {}})
+        return FastJSONResponse({"error": error, "complex_map": {}})
 
-    return JSONResponse({
-        "complex_map": complex_map,   # {normalized_name: {kaptCode, units, ...}}
+    payload = {
+        "complex_map": dict(sorted(complex_map.items())),   # {normalized_name: {kaptCode, units, ...}}
         "matched_count": len(complex_map),
         "error": error,
-    })
+    }
+    payload = _deadline.mark_partial(payload)
+    # 단지정보는 캐시 버전이 없으므로 본문 해시로 ETag 계산
+    body = dumps(payload)
+    etag = '"' + hashlib.sha1(body).hexdigest()[:24] + '"'
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    return FastJSONResponse(body, headers={"ETag": etag, "Cache-Control": _NO_CACHE})
+
+
+async def api_comps(request: Request) -> Response:
+    """
+    GET /api/comps?type=apt&region_code=11680&area=84.9&floor=10&build_year=2005&dong=대치동&apt_name=은마&k=10&months=36
+
+    sync_trade_history로 적재한 매매 실거래 중 대상과 가장 비슷한 k건 (외부 API 호출 없음)
+    """
+    p = request.query_params
+    try:
+        area = float(p.get("area", "0"))
+        floor = int(p.get("floor") or 0)
+        build_year = int(p.get("build_year") or 0)
+        k = int(p.get("k", "10"))
+        months = int(p.get("months", "36"))
+    except ValueError:
+        return FastJSONResponse({"error": "area는 숫자, floor/build_year/k/months는 정수여야 합니다."}, status_code=400)
+
+    result = find_comps(
+        p.get("region_code", "").strip(), area, p.get("type", "apt").lower(),
+        p.get("apt_name", "").strip(), p.get("dong", "").strip(), floor, build_year, k, months,
+    )
+    return FastJSONResponse(result, status_code=400 if "error" in result else 200)
 
 
 _BUILDING_CONFIGS = {
@@ -183,7 +576,7 @@ _BUILDING_CONFIGS = {
 }
 
 
-async def api_building(request: Request) -> JSONResponse:
+async def api_building(request: Request) -> Response:
     """
     GET /api/building?type=basis&sigungu_cd=11680&bjdong_cd=10300&start_date=20240101&end_date=20241231&rows=100
 
@@ -206,24 +599,419 @@ async def api_building(request: Request) -> JSONResponse:
     rows = int(p.get("rows", "100"))
 
     if not sigungu_cd or not bjdong_cd:
-        return JSONResponse(
+        return FastJSONResponse(
             {"error": "sigungu_cd와 bjdong_cd가 모두 필요합니다. "
                       "bjdong_cd는 /api/complex 응답의 bjdCode 필드를 사용하세요."},
             status_code=400,
         )
 
     if building_type not in _BUILDING_CONFIGS:
-        return JSONResponse(
+        return FastJSONResponse(
             {"error": f"type은 {list(_BUILDING_CONFIGS.keys())} 중 하나여야 합니다."},
             status_code=400,
         )
 
     url, parser, label = _BUILDING_CONFIGS[building_type]
-    result = await run_arch_pms_tool(
-        url, sigungu_cd, bjdong_cd, parser, label,
-        bun=bun, ji=ji, start_date=start_date, end_date=end_date, num_of_rows=rows,
+    cache_key = arch_pms_cache_key(
+        url, sigungu_cd, bjdong_cd, bun=bun, ji=ji, start_date=start_date,
+        end_date=end_date, num_of_rows=rows, page_no=1,
+    )
+    return await _cached_json(
+        request, ARCH_PMS_CACHE, cache_key, "api_building",
+        lambda: run_arch_pms_tool(
+            url, sigungu_cd, bjdong_cd, parser, label,
+            bun=bun, ji=ji, start_date=start_date, end_date=end_date, num_of_rows=rows,
+        ),
+    )
+
+
+async def api_onbid_changes(request: Request):
+    """
+    GET /api/onbid/changes?watch_id=...&since=0
+    GET /api/onbid/changes?sido=서울특별시&use_code=003   (watch 자동 등록)
+
+    공매 물건 변경 이벤트를 Server-Sent Events로 스트리밍합니다.
+    이벤트 id는 seq이며, 재연결 시 Last-Event-ID 헤더로 이어받을 수 있습니다.
+    자동 등록한 watch는 연결이 모두 끊기고 ONBID_WATCH_IDLE초가 지나면 해제되고(tools/onbid_watch.py),
+    watch 수가 ONBID_WATCH_MAX에 도달하면 새 필터는 503으로 거절합니다.
+    watch는 워커 프로세스 메모리에 있으므로 MCP_WORKERS > 1이면 501을 반환합니다.
+    """
+    if WATCH_UNAVAILABLE:
+        return FastJSONResponse({"error": WATCH_UNAVAILABLE}, status_code=501)
+    p = request.query_params
+    try:
+        interval = int(p.get("interval", "300"))
+        since = int(request.headers.get("last-event-id") or p.get("since", "0"))
+    except ValueError:
+        return FastJSONResponse({"error": "interval, since(Last-Event-ID)는 정수여야 합니다."}, status_code=400)
+    watch_id = p.get("watch_id", "").strip()
+    if watch_id:
+        watch = watchlist.get(watch_id)
+        if watch is None:
+            return FastJSONResponse({"error": f"watch_id '{watch_id}'를 찾을 수 없습니다."}, status_code=404)
+    else:
+        filters = {
+            k: p.get(k, "").strip()
+            for k in ("sido", "sigungu", "use_code", "disposal_method", "keyword")
+            if p.get(k, "").strip()
+        }
+        if not filters:
+            return FastJSONResponse({"error": "watch_id 또는 필터(sido/use_code 등)가 필요합니다."}, status_code=400)
+        watch = watchlist.add(filters, interval, auto=True)
+        if watch is None:
+            return FastJSONResponse(
+                {"error": "등록할 수 있는 watch 수를 넘었습니다. 잠시 후 다시 시도하세요."},
+                status_code=503, headers={"Retry-After": "60"},
+            )
+    watch.touch()
+
+    async def event_stream():
+        nonlocal since
+        watch.clients += 1
+        try:
+            if not watch.baseline_ready:
+                await watch.poll()
+            yield f"event: status\ndata: {dumps(watch.status()).decode()}\n\n"
+            while not await request.is_disconnected():
+                # 이벤트를 읽기 전에 Event를 잡아 두어야 읽은 직후 생긴 변경에도 바로 깨어남
+                changed = watch.changed
+                for ev in watch.events_since(since):
+                    since = ev["seq"]
+                    yield f"id: {ev['seq']}\nevent: {ev['type']}\ndata: {dumps(ev).decode()}\n\n"
+                watch.touch()
+                if not await watch.wait_for_change(15.0, changed):
+                    yield ": keepalive\n\n"
+        finally:
+            watch.clients -= 1
+            watch.touch()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ── 내보내기 (CSV / Parquet) ─────────────────────────────────────────────────
+
+# 요청 마감이 적용되지 않는 라우트라 기간으로 외부 조회 수를 제한
+EXPORT_MAX_MONTHS = int(os.getenv("MCP_EXPORT_MAX_MONTHS", "60"))
+
+
+async def _export_month_pages(url: str, region_code: str, year_month: str, parser, label: str):
+    """
+    한 달치 item 페이지 (async generator)
+
+    같은 달을 최대 건수(1000)로 조회한 캐시 항목이 전체 건을 담고 있으면 재사용하고,
+    없으면 API 페이지를 순차 조회합니다.
+    """
+    entry = await MOLIT_CACHE.peek(molit_cache_key(url, region_code, year_month, 1000))
+    if entry is not None and entry.value.get("returned_count") == entry.value.get("total_count"):
+        yield {"page_no": 1, "total_count": entry.value["total_count"], "items": entry.value["items"]}
+        return
+    async for page in iter_molit_pages(url, region_code, year_month, parser, label):
+        yield page
+
+
+async def api_export(request: Request) -> Response:
+    """
+    GET /api/export?deal=trade&type=apt&region_code=11680&start=202401&end=202412&format=csv
+
+    deal: trade(기본) | rent
+    format: csv | parquet (pyarrow 설치 시)
+
+    월별 페이지를 파싱하는 즉시 CSV/Parquet 청크로 인코딩해 전송합니다.
+    amount/deposit/floor/build_year는 정수, area_m2는 실수, deal_date는 날짜 타입으로 기록합니다.
+    기간은 최대 MCP_EXPORT_MAX_MONTHS개월입니다.
+
+    첫 페이지는 응답 헤더를 보내기 전에 조회해 실패하면 502로 응답합니다. 이후 월 조회가 실패하면
+    로그를 남기고 그 시점에서 전송을 끝냅니다. 이때 writer.close()를 보내지 않으므로 Parquet은
+    footer가 없는 파일이 되고, CSV는 실패한 월 이전까지의 행만 담습니다.
+    """
+    p = request.query_params
+    deal = p.get("deal", "trade").lower()
+    kind = p.get("type", "apt").lower()
+    region_code = p.get("region_code", "").strip()
+    start = p.get("start", "").strip() or p.get("year_month", "").strip()
+    end = p.get("end", "").strip() or start
+    fmt = p.get("format", "csv").lower()
+
+    configs = {"trade": _TRADE_CONFIGS, "rent": _RENT_CONFIGS}.get(deal)
+    if configs is None:
+        return FastJSONResponse({"error": "deal은 trade 또는 rent여야 합니다."}, status_code=400)
+    if kind not in configs:
+        return FastJSONResponse({"error": f"type은 {list(configs.keys())} 중 하나여야 합니다."}, status_code=400)
+    if fmt not in EXPORT_FORMATS:
+        return FastJSONResponse({"error": f"format은 {list(EXPORT_FORMATS.keys())} 중 하나여야 합니다."}, status_code=400)
+    if not region_code or not start:
+        return FastJSONResponse({"error": "region_code와 start(또는 year_month)가 필요합니다."}, status_code=400)
+    months = iter_year_months(start, end)
+    if not months:
+        return FastJSONResponse({"error": "start/end는 YYYYMM 형식이며 start ≤ end 여야 합니다."}, status_code=400)
+    if len(months) > EXPORT_MAX_MONTHS:
+        return FastJSONResponse({"error": f"기간은 최대 {EXPORT_MAX_MONTHS}개월입니다."}, status_code=400)
+
+    url, parser, label = configs[kind]
+    media_type, extension = EXPORT_FORMATS[fmt]
+    filename = f"{deal}_{kind}_{region_code}_{months[0]}_{months[-1]}.{extension}"
+
+    async def month_pages():
+        for ym in months:
+            async for page in _export_month_pages(url, region_code, ym, parser, label):
+                yield ym, page
+
+    pages = month_pages()
+    first = await anext(pages, None)
+    if first is not None and "error" in first[1]:
+        await pages.aclose()
+        return FastJSONResponse({"error": f"{first[0]} {first[1]['error']}"}, status_code=502)
+
+    async def generate():
+        writer = None
+        item = first
+        try:
+            while item is not None:
+                ym, page = item
+                if "error" in page:
+                    logger.warning("export %s/%s %s 전송 중단 (%s): %s", deal, kind, region_code, ym, page["error"])
+                    return
+                if page["items"]:
+                    if writer is None:
+                        writer = make_writer(fmt, export_columns(page["items"]))
+                    chunk = writer.write(page["items"])
+                    if chunk:
+                        yield chunk
+                if await request.is_disconnected():
+                    return
+                item = await anext(pages, None)
+        finally:
+            await pages.aclose()
+        if writer is None:
+            writer = make_writer(fmt, [])
+        yield writer.close()
+
+    return StreamingResponse(
+        generate(),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-cache",
+        },
     )
-    return JSONResponse(result)
+
+
+# ── 배치 조회 ────────────────────────────────────────────────────────────────
+
+BATCH_MAX_QUERIES = int(os.getenv("MCP_BATCH_MAX_QUERIES", "200"))
+BATCH_CONCURRENCY = int(os.getenv("MCP_BATCH_CONCURRENCY", "8"))
+
+
+def _batch_job(spec: Any) -> tuple[tuple | None, Callable[[], Awaitable[bytes]] | None, str | None]:
+    """
+    배치 쿼리 spec → (중복 제거 키, 결과 본문 코루틴 팩토리, 오류)
+
+    spec 예:
+      {"kind": "trade", "type": "apt", "region_code": "11680", "year_month": "202501", "rows": 100}
+      {"kind": "rent", "type": "villa", "region_code": "11680", "year_month": "202501"}
+      {"kind": "building", "type": "basis", "sigungu_cd": "11680", "bjdong_cd": "10300",
+       "bun": "", "ji": "", "start_date": "", "end_date": "", "rows": 100}
+    """
+    if not isinstance(spec, dict):
+        return None, None, "쿼리는 객체여야 합니다."
+    kind = str(spec.get("kind", "trade")).lower()
+    sub_type = str(spec.get("type", "apt" if kind != "building" else "basis")).lower()
+    try:
+        rows = int(spec.get("rows", 100))
+    except (TypeError, ValueError):
+        return None, None, "rows는 정수여야 합니다."
+
+    if kind in ("trade", "rent"):
+        configs, variant = (_TRADE_CONFIGS, "api_trades") if kind == "trade" else (_RENT_CONFIGS, "api_rent")
+        if sub_type not in configs:
+            return None, None, f"type은 {list(configs.keys())} 중 하나여야 합니다."
+        region_code = str(spec.get("region_code", "")).strip()
+        year_month = str(spec.get("year_month", "")).strip()
+        if not region_code or not year_month:
+            return None, None, "region_code와 year_month가 필요합니다."
+        url, parser, label = configs[sub_type]
+        fetch = run_molit_tool if kind == "trade" else _fetch_rent
+        cache_key = molit_cache_key(url, region_code, year_month, rows)
+        return (
+            (kind, cache_key),
+            lambda: _batch_body(
+                MOLIT_CACHE, cache_key, variant,
+                lambda: fetch(url, region_code, year_month, rows, parser, label),
+            ),
+            None,
+        )
+
+    if kind == "building":
+        if sub_type not in _BUILDING_CONFIGS:
+            return None, None, f"type은 {list(_BUILDING_CONFIGS.keys())} 중 하나여야 합니다."
+        sigungu_cd = str(spec.get("sigungu_cd", "")).strip()
+        bjdong_cd = str(spec.get("bjdong_cd", "")).strip()
+        if not sigungu_cd or not bjdong_cd:
+            return None, None, "sigungu_cd와 bjdong_cd가 모두 필요합니다."
+        params = {k: str(spec.get(k, "")).strip() for k in ("bun", "ji", "start_date", "end_date")}
+        url, parser, label = _BUILDING_CONFIGS[sub_type]
+        cache_key = arch_pms_cache_key(url, sigungu_cd, bjdong_cd, **params, num_of_rows=rows, page_no=1)
+        return (
+            (kind, cache_key),
+            lambda: _batch_body(
+                ARCH_PMS_CACHE, cache_key, "api_building",
+                lambda: run_arch_pms_tool(url, sigungu_cd, bjdong_cd, parser, label, **params, num_of_rows=rows),
+            ),
+            None,
+        )
+
+    return None, None, "kind는 trade, rent, building 중 하나여야 합니다."
+
+
+async def _batch_body(cache, cache_key, variant: str, fetch: Callable[[], Awaitable[dict]]) -> bytes:
+    """단건 API와 같은 결과 본문. 캐시 항목에 직렬화 본문이 있으면 그대로 재사용"""
+    entry = await cache.peek(cache_key)
+    if entry is not None and variant in entry.extras:
+        cache.hits += 1
+        return entry.extras[variant]
+    result = await fetch()
+    body = dumps(result)
+    entry = cache.peek_local(cache_key)
+    if entry is not None and "error" not in result:
+        entry.extras[variant] = body
+    return body
+
+
+async def api_batch(request: Request) -> Response:
+    """
+    POST /api/batch
+    body: {"queries": [spec, ...], "concurrency": 8}  (또는 spec 배열)
+
+    여러 쿼리를 한 요청으로 동시 실행하고, 완료되는 순서대로 NDJSON으로 전송합니다.
+      {"event": "result", "indices": [0, 3], "result": {...}}   ← 같은 spec은 한 번만 실행
+      {"event": "error", "indices": [1], "error": "..."}        ← spec 검증 실패
+      {"event": "done", "count": 4, "unique": 3, "errors": 1}    ← 요청 마감으로 중단된 쿼리가 있으면 partial: true
+
+    spec 형식은 _batch_job 참고. result는 /api/trades, /api/rent, /api/building 단건 응답과 같습니다.
+    concurrency: 동시 실행 수 (최대 MCP_BATCH_CONCURRENCY)
+    """
+    try:
+        body = json.loads(await request.body() or b"null")
+    except ValueError:
+        return FastJSONResponse({"error": "요청 본문은 JSON이어야 합니다."}, status_code=400)
+    if isinstance(body, list):
+        body = {"queries": body}
+    if not isinstance(body, dict) or not isinstance(body.get("queries"), list):
+        return FastJSONResponse({"error": "queries 배열이 필요합니다."}, status_code=400)
+    queries = body["queries"]
+    if not queries or len(queries) > BATCH_MAX_QUERIES:
+        return FastJSONResponse(
+            {"error": f"queries는 1~{BATCH_MAX_QUERIES}개여야 합니다."}, status_code=400,
+        )
+    try:
+        concurrency = max(1, min(int(body.get("concurrency", BATCH_CONCURRENCY)), BATCH_CONCURRENCY))
+    except (TypeError, ValueError):
+        return FastJSONResponse({"error": "concurrency는 정수여야 합니다."}, status_code=400)
+
+    invalid: list[tuple[int, str]] = []
+    jobs: dict[tuple, tuple[list[int], Callable[[], Awaitable[bytes]]]] = {}
+    for index, spec in enumerate(queries):
+        key, factory, error = _batch_job(spec)
+        if error:
+            invalid.append((index, error))
+        elif key in jobs:
+            jobs[key][0].append(index)
+        else:
+            jobs[key] = ([index], factory)
+
+    async def generate():
+        for index, error in invalid:
+            yield _stream_event("ndjson", "error", {"indices": [index], "error": error})
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(indices: list[int], factory) -> tuple[list[int], bytes | None, str | None]:
+            async def call() -> bytes:
+                async with semaphore:
+                    return await factory()
+            try:
+                # 요청 마감(_deadline)까지 끝나지 않은 쿼리는 취소하고 오류로 알림
+                return indices, await asyncio.wait_for(call(), _deadline.remaining()), None
+            except asyncio.TimeoutError:
+                _deadline.expired()
+                return indices, None, _deadline.DEADLINE_ERROR
+            except Exception as e:
+                return indices, None, f"조회 실패: {e}"
+
+        tasks = [asyncio.ensure_future(run(indices, factory)) for indices, factory in jobs.values()]
+        errors = len(invalid)
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                indices, result_body, error = await next_done
+                if error:
+                    errors += 1
+                    yield _stream_event("ndjson", "error", {"indices": indices, "error": error})
+                else:
+                    # 결과 본문은 이미 직렬화된 bytes이므로 다시 인코딩하지 않고 이어 붙임
+                    yield b'{"event":"result","indices":' + dumps(indices) + b',"result":' + result_body + b"}\n"
+                if await request.is_disconnected():
+                    return
+            done = {"count": len(queries), "unique": len(jobs), "errors": errors}
+            yield _stream_event("ndjson", "done", _deadline.mark_partial(done))
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson", headers={"Cache-Control": "no-cache"})
+
+
+# ── 리포트 작업 ──────────────────────────────────────────────────────────────
+
+async def api_jobs_submit(request: Request) -> Response:
+    """
+    POST /api/jobs
+    body: {"kind": "trades", "type": "apt", "regions": ["서울"], "start_month": "202301", "end_month": "202412"}
+
+    작업 ID를 바로 반환(202)하고 서버 백그라운드 워커가 실행합니다. spec 형식은 _jobs.py 참고.
+    """
+    try:
+        spec = json.loads(await request.body() or b"null")
+    except ValueError:
+        return FastJSONResponse({"error": "요청 본문은 JSON이어야 합니다."}, status_code=400)
+    result = await submit_job(spec)
+    if "error" in result:
+        return FastJSONResponse(result, status_code=400)
+    return FastJSONResponse(result, status_code=202, headers={"Location": f"/api/jobs/{result['job_id']}"})
+
+
+async def api_jobs_list(request: Request) -> Response:
+    """GET /api/jobs?limit=20 → 최근 작업 상태 목록"""
+    try:
+        limit = max(1, min(int(request.query_params.get("limit", "20")), 200))
+    except ValueError:
+        return FastJSONResponse({"error": "limit은 정수여야 합니다."}, status_code=400)
+    return FastJSONResponse({"jobs": await recent_jobs(limit)})
+
+
+async def api_job(request: Request) -> Response:
+    """GET /api/jobs/{job_id} → 상태/진행률, DELETE → 취소"""
+    job_id = request.path_params["job_id"]
+    if request.method == "DELETE":
+        if not await cancel_job(job_id):
+            return FastJSONResponse({"error": f"취소할 수 있는 작업이 아닙니다: {job_id}"}, status_code=409)
+        return FastJSONResponse({"job_id": job_id, "status": "canceled"})
+    status = await job_status(job_id)
+    if status is None:
+        return FastJSONResponse({"error": f"작업을 찾을 수 없습니다: {job_id}"}, status_code=404)
+    return FastJSONResponse(status, headers={"Cache-Control": _NO_CACHE})
+
+
+async def api_job_result(request: Request) -> Response:
+    """GET /api/jobs/{job_id}/result → 결과 (완료 전이면 partial=true 부분 결과)"""
+    job_id = request.path_params["job_id"]
+    result = await job_result(job_id)
+    if result is None:
+        return FastJSONResponse({"error": f"작업을 찾을 수 없습니다: {job_id}"}, status_code=404)
+    return FastJSONResponse(result, headers={"Cache-Control": _NO_CACHE})
 
 
 # ── 라우트 목록 ───────────────────────────────────────────────────────────────
@@ -236,6 +1024,16 @@ def create_web_routes() -> list:
         Route("/api/region", api_region),
         Route("/api/trades", api_trades),
         Route("/api/rent", api_rent),
+        Route("/api/trades/stream", api_trades_stream),
+        Route("/api/rent/stream", api_rent_stream),
         Route("/api/complex", api_complex),
         Route("/api/building", api_building),
+        Route("/api/onbid/changes", api_onbid_changes),
+        Route("/api/batch", api_batch, methods=["POST"]),
+        Route("/api/export", api_export),
+        Route("/api/comps", api_comps),
+        Route("/api/jobs", api_jobs_submit, methods=["POST"]),
+        Route("/api/jobs", api_jobs_list),
+        Route("/api/jobs/{job_id}", api_job, methods=["GET", "DELETE"]),
+        Route("/api/jobs/{job_id}/result", api_job_result),
     ]
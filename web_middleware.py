@@ -0,0 +1,525 @@
+"""
+HTTP 앱 공용 ASGI 미들웨어
+
+  - CompressionMiddleware: Accept-Encoding에 따라 br(brotli 설치 시) / gzip 응답 압축
+  - MetricsMiddleware: HTTP 요청 수/처리 중 요청 수 (_metrics)
+  - TracingMiddleware: 요청 단위 trace 시작 + Server-Timing 헤더 (_tracing)
+  - AdmissionMiddleware: UI(/api)·MCP(/mcp) 트래픽별 동시 처리 제한 + 대기열, 포화 시 429/503
+  - DeadlineMiddleware: /api 요청의 마감 시각 설정 (X-Request-Timeout 헤더, _deadline)
+"""
+
+import asyncio
+import json
+import math
+import os
+import time
+import zlib
+from collections import deque
+
+import _deadline
+from _metrics import ADMISSION_QUEUED, ADMISSION_REJECTED, HTTP_IN_FLIGHT, HTTP_REQUESTS
+import _tracing
+
+try:
+    import brotli  # 선택 의존성: pip install brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+# 압축 대상 Content-Type 접두사 (SSE는 즉시 전달해야 하므로 제외)
+_COMPRESSIBLE = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "text/html",
+    "text/css",
+    "text/csv",
+    "text/plain",
+)
+_ENCODING_SUFFIXES = ("-br", "-gzip")
+
+
+def _accepted_encoding(accept_encoding: str) -> str | None:
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip().lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def _strip_etag_suffix(value: str) -> str:
+    """If-None-Match의 '"abc-gzip"' → '"abc"' (압축 시 ETag에 붙인 인코딩 접미사 제거)"""
+    tags = []
+    for tag in value.split(","):
+        tag = tag.strip()
+        for suffix in _ENCODING_SUFFIXES:
+            if tag.endswith(suffix + '"'):
+                tag = tag[: -len(suffix) - 1] + '"'
+        tags.append(tag)
+    return ", ".join(tags)
+
+
+def _varies(start: dict) -> bool:
+    """압축 대상 응답인지 (인코딩에 따라 표현이 달라지므로 Vary: Accept-Encoding 필요)"""
+    resp_headers = {k.lower(): v for k, v in start["headers"]}
+    if b"content-encoding" in resp_headers:
+        return False
+    return start["status"] == 304 or resp_headers.get(b"content-type", b"").decode("latin-1").startswith(_COMPRESSIBLE)
+
+
+def _with_vary(headers: list) -> list:
+    """기존 Vary 값에 Accept-Encoding을 더한 헤더 목록 (이미 있으면 그대로)"""
+    out, vary = [], []
+    for k, v in headers:
+        if k.lower() == b"vary":
+            vary.append(v)
+        else:
+            out.append((k, v))
+    value = b", ".join(vary)
+    if b"accept-encoding" not in value.lower():
+        value = value + b", Accept-Encoding" if value else b"Accept-Encoding"
+    out.append((b"vary", value))
+    return out
+
+
+def _suffixed_etag(etag: bytes, client_tags: set[str], encoding: str) -> bytes:
+    """
+    304 응답의 ETag에 클라이언트가 가진 표현의 인코딩 접미사를 붙임
+
+    If-None-Match에 접미사 붙은 태그가 있으면 그 접미사를, 없으면(원래 태그 또는 *) 현재 인코딩
+    접미사를 붙입니다. 약한 ETag는 그대로 둡니다.
+    """
+    if not etag.endswith(b'"') or etag.startswith(b"W/"):
+        return etag
+    if etag.decode("latin-1") in client_tags:
+        return etag
+    for suffix in _ENCODING_SUFFIXES:
+        candidate = etag[:-1] + suffix.encode() + b'"'
+        if candidate.decode("latin-1") in client_tags:
+            return candidate
+    return etag[:-1] + f"-{encoding}".encode() + b'"'
+
+
+class _Compressor:
+    def __init__(self, encoding: str, level: int) -> None:
+        self.encoding = encoding
+        if encoding == "br":
+            self._obj = brotli.Compressor(quality=min(level, 11))
+        else:
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._obj.process(data) + self._obj.flush()
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.finish() if self.encoding == "br" else self._obj.flush()
+
+
+class CompressionMiddleware:
+    """
+    응답 본문 압축 미들웨어
+
+    - minimum_size 미만의 단일 본문, 이미 인코딩된 응답, SSE 스트림은 그대로 통과
+    - 스트리밍 응답은 청크마다 flush하며 점진 압축
+    - 강한 ETag는 표현(인코딩)별로 달라야 하므로 '"tag-gzip"'처럼 접미사를 붙이고,
+      요청의 If-None-Match에서는 접미사를 제거해 앱이 원래 태그로 비교하게 함.
+      304 응답의 ETag에도 클라이언트가 가진 표현의 접미사를 다시 붙임
+    - 압축 대상 Content-Type 응답과 304에는 압축 여부와 관계없이 Vary: Accept-Encoding을 붙임
+      (작은 본문이나 Accept-Encoding 없는 요청의 비압축 응답을 공유 캐시가 압축 응답 대신 내주지 않게)
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, br_quality: int = 5) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.br_quality = br_quality
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        encoding = _accepted_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            async def send_vary(message) -> None:
+                if message["type"] == "http.response.start" and _varies(message):
+                    message = {**message, "headers": _with_vary(message["headers"])}
+                await send(message)
+
+            await self.app(scope, receive, send_vary)
+            return
+
+        inm = headers.get(b"if-none-match")
+        client_tags: set[str] = set()
+        if inm is not None:
+            client_tags = {t.strip() for t in inm.decode("latin-1").split(",")}
+            scope = dict(scope)
+            scope["headers"] = [
+                (k, _strip_etag_suffix(v.decode("latin-1")).encode("latin-1") if k == b"if-none-match" else v)
+                for k, v in scope["headers"]
+            ]
+
+        level = self.br_quality if encoding == "br" else self.gzip_level
+        state: dict = {"start": None, "compressor": None, "passthrough": False}
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                state["start"] = message
+                return
+
+            if message["type"] != "http.response.body" or state["passthrough"]:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if state["compressor"] is None:
+                start = state["start"]
+                resp_headers = {k.lower(): v for k, v in start["headers"]}
+                content_type = resp_headers.get(b"content-type", b"").decode("latin-1")
+                if (
+                    b"content-encoding" in resp_headers
+                    or start["status"] in (204, 304)
+                    or not content_type.startswith(_COMPRESSIBLE)
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    state["passthrough"] = True
+                    if _varies(start):
+                        start_headers = _with_vary(start["headers"])
+                        if start["status"] == 304:
+                            start_headers = [
+                                (k, _suffixed_etag(v, client_tags, encoding) if k.lower() == b"etag" else v)
+                                for k, v in start_headers
+                            ]
+                        start = {**start, "headers": start_headers}
+                    await send(start)
+                    await send(message)
+                    return
+
+                state["compressor"] = _Compressor(encoding, level)
+                new_headers = []
+                for k, v in _with_vary(start["headers"]):
+                    lk = k.lower()
+                    if lk == b"content-length":
+                        continue
+                    if lk == b"etag" and v.endswith(b'"') and not v.startswith(b"W/"):
+                        v = v[:-1] + f"-{encoding}".encode() + b'"'
+                    new_headers.append((k, v))
+                new_headers.append((b"content-encoding", encoding.encode()))
+                if not more_body:
+                    compressed = state["compressor"].compress(body) + state["compressor"].finish()
+                    new_headers.append((b"content-length", str(len(compressed)).encode()))
+                    await send({**start, "headers": new_headers})
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                await send({**start, "headers": new_headers})
+
+            compressor = state["compressor"]
+            chunk = compressor.compress(body) if body else b""
+            if not more_body:
+                chunk += compressor.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class MetricsMiddleware:
+    """
+    HTTP 요청 메트릭 미들웨어
+
+    path 라벨은 요청이 매칭된 라우트의 경로 템플릿(/api/jobs/{job_id} 등, Router가 scope["route"]에 기록)이고,
+    매칭된 라우트가 없으면 "other"입니다. 작업 ID 같은 경로 값마다 시계열이 늘어나지 않게 합니다.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            HTTP_REQUESTS.inc(path=getattr(route, "path", None) or "other", status=status["code"])
+
+
+class TracingMiddleware:
+    """
+    요청마다 trace를 시작해 처리 단계(fetch/parse/summarize/serialize) span을 모음
+
+    MCP_SERVER_TIMING=1이면 응답 시작 시점까지의 단계별 소요 시간을 Server-Timing 헤더로 붙입니다.
+    스트리밍 응답은 헤더가 먼저 나가므로 이후 단계는 trace 파일(MCP_TRACE_FILE)에만 기록됩니다.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not _tracing.ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        name = f"{scope.get('method', 'GET')} {scope.get('path', '')}"
+        with _tracing.start_trace(name, **{"http.method": scope.get("method", ""), "http.target": scope.get("path", "")}) as trace:
+            async def send_wrapper(message) -> None:
+                if message["type"] == "http.response.start":
+                    trace.root.attributes["http.status_code"] = message["status"]
+                    if _tracing.SERVER_TIMING:
+                        headers = list(message.get("headers", []))
+                        headers.append((b"server-timing", _tracing.server_timing(trace).encode("latin-1")))
+                        message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+
+# ── 동시 처리 제한 (admission control) ──
+
+# 트래픽별 동시 처리 수 (워커 프로세스당, 0이면 제한 없음)
+ADMIT_UI_CONCURRENCY = int(os.getenv("MCP_ADMIT_UI_CONCURRENCY", "32") or 0)
+ADMIT_MCP_CONCURRENCY = int(os.getenv("MCP_ADMIT_MCP_CONCURRENCY", "16") or 0)
+# 클라이언트 하나가 동시에 처리·대기할 수 있는 요청 수 (0이면 제한 없음)
+ADMIT_PER_CLIENT = int(os.getenv("MCP_ADMIT_PER_CLIENT", "8") or 0)
+# 슬롯을 기다릴 수 있는 요청 수와 최대 대기 시간 (초)
+ADMIT_QUEUE = max(0, int(os.getenv("MCP_ADMIT_QUEUE", "64") or 0))
+ADMIT_QUEUE_TIMEOUT = float(os.getenv("MCP_ADMIT_QUEUE_TIMEOUT", "5") or 0)
+
+# 슬롯을 잡지 않는 요청: 오래 열려 있는 SSE 구독 (처리 중 슬롯을 영구히 차지함)
+_ADMIT_EXEMPT = ("/api/onbid/changes",)
+
+
+class _Budget:
+    """
+    트래픽 종류 하나의 동시 처리 슬롯 + FIFO 대기열
+
+    슬롯이 비면 release()가 대기 중인 첫 요청에 슬롯을 그대로 넘겨주므로
+    새로 온 요청이 대기열을 앞지르지 않습니다. 클라이언트별 카운트는 대기 중인 요청도 포함해
+    한 클라이언트가 대기열을 혼자 채우지 못하게 합니다.
+    """
+
+    def __init__(self, traffic: str, limit: int, per_client: int, queue_size: int, queue_timeout: float) -> None:
+        self.traffic = traffic
+        self.limit = limit
+        self.per_client = per_client
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.clients: dict[str, int] = {}
+        self.waiters: deque[asyncio.Future] = deque()
+        self.service_time = 0.5   # 요청 처리 시간 지수이동평균 (Retry-After 추정용)
+
+    def retry_after(self) -> int:
+        """지금 대기열이 빠지는 데 걸릴 시간 추정 (초, 최소 1)"""
+        return max(1, math.ceil(self.service_time * (len(self.waiters) + 1) / max(1, self.limit)))
+
+    def observe(self, seconds: float) -> None:
+        self.service_time += 0.2 * (seconds - self.service_time)
+
+    def _leave(self, client: str) -> None:
+        count = self.clients.get(client, 0) - 1
+        if count > 0:
+            self.clients[client] = count
+        else:
+            self.clients.pop(client, None)
+
+    async def acquire(self, client: str, timeout: float | None = None) -> str | None:
+        """
+        슬롯 확보. 거부되면 사유(client_limit | queue_full | queue_timeout), 확보하면 None
+
+        timeout: 최대 대기 시간 (기본 queue_timeout, 요청 마감이 더 가까우면 그 시간)
+        """
+        timeout = self.queue_timeout if timeout is None else min(timeout, self.queue_timeout)
+        if self.per_client and self.clients.get(client, 0) >= self.per_client:
+            return "client_limit"
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            self.clients[client] = self.clients.get(client, 0) + 1
+            return None
+        if len(self.waiters) >= self.queue_size or timeout <= 0:
+            return "queue_full"
+
+        self.clients[client] = self.clients.get(client, 0) + 1
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        ADMISSION_QUEUED.inc(traffic=self.traffic)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return None
+        except asyncio.TimeoutError:
+            self._leave(client)
+            return "queue_timeout"
+        except asyncio.CancelledError:
+            # 연결이 끊겨 취소됐는데 슬롯을 이미 넘겨받았다면 다음 대기자에게 돌려줌
+            if waiter.done() and not waiter.cancelled():
+                self.release(client)
+            else:
+                self._leave(client)
+            raise
+        finally:
+            ADMISSION_QUEUED.dec(traffic=self.traffic)
+            try:
+                self.waiters.remove(waiter)
+            except ValueError:
+                pass
+
+    def release(self, client: str) -> None:
+        self._leave(client)
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)   # 슬롯을 그대로 넘김 (active 유지)
+                return
+        self.active -= 1
+
+
+def _client_key(scope) -> str:
+    """클라이언트 식별: MCP 세션 ID가 있으면 세션 단위, 없으면 접속 주소 (Unix 소켓 데몬은 'local')"""
+    for name, value in scope.get("headers") or ():
+        if name == b"mcp-session-id":
+            return "session:" + value.decode("latin-1")
+    client = scope.get("client")
+    return client[0] if client else "local"
+
+
+class AdmissionMiddleware:
+    """
+    동시 처리 제한 + 부하 차단 미들웨어
+
+    /api(웹 UI)와 /mcp(에이전트) 트래픽을 별도 예산으로 나눠 한쪽 폭주가 다른 쪽을 막지 않게 합니다.
+    예산마다 동시 처리 슬롯과 대기열이 있고, 클라이언트별 동시 요청 수도 제한합니다.
+
+      - 클라이언트별 한도 초과 → 429 + Retry-After
+      - 대기열이 가득 참 / 대기 시간(MCP_ADMIT_QUEUE_TIMEOUT) 초과 → 503 + Retry-After
+
+    정적 파일, /metrics, SSE 구독(/api/onbid/changes)과 MCP GET 스트림은 제한하지 않습니다.
+    대기 시간은 요청 마감(DeadlineMiddleware)을 넘지 않습니다.
+    제한은 워커 프로세스 단위입니다 (MCP_WORKERS개면 전체 한도는 워커 수 배).
+    """
+
+    def __init__(self, app, ui_concurrency: int | None = None, mcp_concurrency: int | None = None,
+                 per_client: int | None = None, queue_size: int | None = None,
+                 queue_timeout: float | None = None) -> None:
+        self.app = app
+        per_client = ADMIT_PER_CLIENT if per_client is None else per_client
+        queue_size = ADMIT_QUEUE if queue_size is None else queue_size
+        queue_timeout = ADMIT_QUEUE_TIMEOUT if queue_timeout is None else queue_timeout
+        self.budgets: dict[str, _Budget] = {}
+        for traffic, limit in (
+            ("ui", ADMIT_UI_CONCURRENCY if ui_concurrency is None else ui_concurrency),
+            ("mcp", ADMIT_MCP_CONCURRENCY if mcp_concurrency is None else mcp_concurrency),
+        ):
+            if limit > 0:
+                self.budgets[traffic] = _Budget(traffic, limit, per_client, queue_size, queue_timeout)
+
+    def _traffic(self, scope) -> str | None:
+        path = scope.get("path", "")
+        if path.startswith("/mcp"):
+            # GET은 서버→클라이언트 알림 스트림, DELETE는 세션 종료라 슬롯을 잡지 않음
+            return "mcp" if scope.get("method") == "POST" else None
+        if path.startswith("/api/") and not path.startswith(_ADMIT_EXEMPT):
+            return "ui"
+        return None
+
+    async def __call__(self, scope, receive, send) -> None:
+        budget = self.budgets.get(self._traffic(scope)) if scope["type"] == "http" else None
+        if budget is None:
+            await self.app(scope, receive, send)
+            return
+
+        client = _client_key(scope)
+        reason = await budget.acquire(client, _deadline.remaining())
+        if reason is not None:
+            ADMISSION_REJECTED.inc(traffic=budget.traffic, reason=reason)
+            await _reject(send, 429 if reason == "client_limit" else 503, reason, budget.retry_after())
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            budget.observe(time.perf_counter() - started)
+            budget.release(client)
+
+
+_REJECT_MESSAGES = {
+    "client_limit": "동시 요청이 너무 많습니다. 잠시 후 다시 시도하세요.",
+    "queue_full": "서버가 혼잡합니다. 잠시 후 다시 시도하세요.",
+    "queue_timeout": "서버가 혼잡해 대기 시간 안에 처리하지 못했습니다. 잠시 후 다시 시도하세요.",
+}
+
+
+async def _reject(send, status: int, reason: str, retry_after: int) -> None:
+    body = json.dumps({"error": _REJECT_MESSAGES[reason], "reason": reason}, ensure_ascii=False).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json; charset=utf-8"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(retry_after).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+# ── 요청 마감 (deadline) ──
+
+# 헤더가 없을 때 기본 마감을 두지 않는 경로: 오래 이어지는 스트리밍/내보내기/SSE 구독
+_DEADLINE_DEFAULT_EXEMPT = ("/api/trades/stream", "/api/rent/stream", "/api/export", "/api/onbid/changes")
+
+
+class DeadlineMiddleware:
+    """
+    /api 요청마다 마감 시각을 정해 외부 조회까지 전달 (_deadline)
+
+    X-Request-Timeout 헤더(초)가 있으면 그 값, 없으면 MCP_REQUEST_TIMEOUT을 씁니다.
+    스트리밍·내보내기 경로는 헤더가 있을 때만 마감을 둡니다.
+    /mcp 도구 호출은 세션 태스크에서 실행되므로 server.TracedFastMCP.call_tool에서 따로 설정합니다.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        path = scope.get("path", "") if scope["type"] == "http" else ""
+        if not path.startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+
+        header = _deadline.HEADER.encode()
+        timeout = None
+        for name, value in scope.get("headers") or ():
+            if name == header:
+                timeout = _deadline.parse_timeout(value.decode("latin-1"))
+                break
+        if timeout is None and path.startswith(_DEADLINE_DEFAULT_EXEMPT):
+            await self.app(scope, receive, send)
+            return
+        with _deadline.deadline_scope(timeout):
+            await self.app(scope, receive, send)